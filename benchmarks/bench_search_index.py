@@ -0,0 +1,87 @@
+# 검색 색인 벤치마크: 빌드 시간/메모리, 검색 지연(정확/fuzzy) vs str.contains 전체 스캔, 동기화 증분 갱신 vs 재빌드
+# 덱은 study_list.xlsx의 어절을 무작위로 섞어 만든 카드 (같은 문장이 반복되지 않게)
+# 실행: python benchmarks/bench_search_index.py [--sizes 10000,100000] [--queries 200]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from card_identity import card_ids, diff_decks
+from fake_sheets import synthetic_deck
+from search_index import SearchIndex, frame_texts
+
+
+def word_deck(rows, rng):
+    seed = synthetic_deck()
+    words = np.array(" ".join(frame_texts(seed)).split())
+    def sentences(lo, hi):
+        lengths = rng.integers(lo, hi, rows)
+        picked = words[rng.integers(0, len(words), lengths.sum())]
+        return [" ".join(s) for s in np.split(picked, np.cumsum(lengths)[:-1])]
+    return pd.DataFrame({"질문": sentences(6, 16), "정답": sentences(2, 8), "정답횟수": 0}), words
+
+
+def timed_us(fn, items):
+    out = []
+    for item in items:
+        t = time.perf_counter(); fn(item); out.append((time.perf_counter() - t) * 1e6)
+    return np.percentile(out, [50, 99])
+
+
+def nbytes(index):
+    return index._keys.nbytes + index._starts.nbytes + index._rows.nbytes
+
+
+def bench(rows, n_queries, rng):
+    df, words = word_deck(rows, rng)
+    t = time.perf_counter(); index = SearchIndex.from_frame(df); build = time.perf_counter() - t
+    print(f"[{rows} cards]")
+    print(f"  build             : {build * 1000:8.1f} ms   postings {len(index._rows):,}  arrays {nbytes(index) / 2**20:.1f} MB")
+
+    # 검색어: 어절 전체/앞 두 글자/두 어절 조합, fuzzy는 어절 중간 글자를 바꿈
+    picks = words[rng.integers(0, len(words), n_queries)]
+    queries = [w if i % 3 == 0 else w[:2] if i % 3 == 1 else f"{w} {picks[(i + 7) % n_queries]}" for i, w in enumerate(picks)]
+    typos = [w[:len(w) // 2] + "ㅋ" + w[len(w) // 2 + 1:] if len(w) > 2 else w for w in picks]
+    texts = pd.Series(frame_texts(df)).str.replace(r"\s+", "", regex=True).str.lower()
+    def naive(q):
+        mask = np.ones(len(texts), dtype=bool)
+        for term in q.lower().split(): mask &= texts.str.contains(term, regex=False).to_numpy()
+        return np.flatnonzero(mask)
+    hits = np.mean([len(index.search(q)) for q in queries])
+    assert all(np.array_equal(index.search(q), naive(q)) for q in queries[:20])
+    for label, fn, items in (("exact", index.search, queries), ("fuzzy", lambda q: index.search(q, fuzzy=True), typos),
+                             ("str.contains", naive, queries[:max(5, n_queries // 10)])):
+        p50, p99 = timed_us(fn, items)
+        print(f"  {label:<18}: p50 {p50 / 1000:8.3f}  p99 {p99 / 1000:8.3f} ms" + (f"   (평균 {hits:.0f}건)" if label == "exact" else ""))
+
+    # 동기화: 100행 수정 + 50행 삭제 + 50행 추가 -> diff로 증분 갱신 vs 전체 재빌드
+    new = df.copy()
+    edited = rng.choice(rows, 100, replace=False)
+    new.loc[edited, "질문"] = [s + " 개정" for s in new.loc[edited, "질문"]]
+    new = new.drop(index=rng.choice(rows, 50, replace=False)).reset_index(drop=True)
+    new = pd.concat([new, word_deck(50, rng)[0]], ignore_index=True)
+    diff = diff_decks(df, card_ids(df), new, card_ids(new))
+    t = time.perf_counter(); updated = index.updated(diff, frame_texts(new)); inc = time.perf_counter() - t
+    t = time.perf_counter(); SearchIndex.from_frame(new); full = time.perf_counter() - t
+    assert all(np.array_equal(updated.search(q), SearchIndex.from_frame(new).search(q)) for q in queries[:5])
+    print(f"  sync update       : {inc * 1000:8.1f} ms   (full rebuild {full * 1000:.1f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+    for rows in map(int, args.sizes.split(",")): bench(rows, args.queries, rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# 시트 탭 목록 추출 벤치마크: pd.ExcelFile 전체 파싱 vs xl/workbook.xml만 읽기
+# 경우: 원본 / 구글 내보내기 순서로 미디어 추가 (workbook.xml이 뒤라 거의 전부 받음) / 미디어를 맨 뒤에 (최선) / 데이터 디스크립터 (스캔 불가)
+# 실행: python benchmarks/bench_sheet_tabs.py [xlsx 경로] [반복 횟수]
+import io
+import os
+import sys
+import time
+import zipfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from sheet_source import WORKBOOK_XML, parse_workbook_xml, scan_for_workbook_xml, workbook_sheet_names
+
+
+def with_media(data, media_mb, before=WORKBOOK_XML):
+    # 이미지가 많은 통합문서 흉내: 무압축 더미 미디어 항목을 before 항목 앞에 끼움 (None이면 맨 뒤)
+    # 구글 내보내기는 워크시트 뒤, workbook.xml 앞에 항목을 둠 (study_list.xlsx: workbook.xml이 11077바이트 중 9571)
+    out = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as src, zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            if info.filename == before: dst.writestr(zipfile.ZipInfo("xl/media/image1.png"), os.urandom(media_mb * 1024 * 1024), zipfile.ZIP_STORED)
+            dst.writestr(info, src.read(info.filename))
+        if before is None: dst.writestr(zipfile.ZipInfo("xl/media/image1.png"), os.urandom(media_mb * 1024 * 1024), zipfile.ZIP_STORED)
+    return out.getvalue()
+
+
+class _Unseekable(io.RawIOBase):
+    def __init__(self): self.out = io.BytesIO()
+    def writable(self): return True
+    def write(self, b): return self.out.write(b)
+
+
+def with_data_descriptors(data):
+    # 스트리밍으로 만든 zip 흉내: 탐색 불가 출력에 쓰면 크기를 로컬 헤더 대신 데이터 디스크립터에 둠 (스캔 불가 -> 전체 다운로드)
+    sink = _Unseekable()
+    with zipfile.ZipFile(io.BytesIO(data)) as src, zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist(): dst.writestr(info.filename, src.read(info.filename))
+    return sink.out.getvalue()
+
+
+def stream_sheet_names(data):
+    # WorkbookCache.sheet_names와 같은 순서: 스캔 실패면 전체 바이트에서 읽음
+    found = scan_for_workbook_xml(data)
+    return parse_workbook_xml(found) if found else workbook_sheet_names(data)
+
+
+def bytes_until_workbook(data, chunk=64 * 1024):
+    # 스트리밍 다운로드 시 workbook.xml을 얻기까지 받아야 하는 바이트 수
+    for end in range(chunk, len(data) + chunk, chunk):
+        if scan_for_workbook_xml(memoryview(data)[:end].tobytes()): return min(end, len(data))
+    return len(data)
+
+
+MBIT_PER_SEC = 20  # 시작 시간 추정용 회선 속도
+
+
+def download_ms(nbytes):
+    return nbytes * 8 / (MBIT_PER_SEC * 1_000_000) * 1000
+
+
+def timeit(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat): result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "..", "study_list.xlsx")
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    with open(path, "rb") as f: base = f.read()
+
+    cases = [("study_list.xlsx", base), ("+20MB media, export order", with_media(base, 20)),
+             ("+20MB media, appended (best case)", with_media(base, 20, before=None)), ("data descriptors (fallback)", with_data_descriptors(base))]
+    for label, data in cases:
+        full_ms, names_full = timeit(lambda: pd.ExcelFile(io.BytesIO(data)).sheet_names, repeat)
+        zip_ms, names_zip = timeit(lambda: workbook_sheet_names(data), repeat)
+        scan_ms, names_scan = timeit(lambda: stream_sheet_names(data), repeat)
+        assert names_full == names_zip == names_scan, (names_full, names_zip, names_scan)
+        needed = bytes_until_workbook(data)
+        print(f"[{label}] {len(data) / 1024:.0f} KB, tabs={names_full}, stream scan={'ok' if scan_for_workbook_xml(data) else 'fallback'}")
+        print(f"  pd.ExcelFile(...).sheet_names : {full_ms:8.3f} ms")
+        print(f"  workbook_sheet_names (zip)    : {zip_ms:8.3f} ms  ({full_ms / zip_ms:.0f}x)")
+        print(f"  local-header scan (stream)    : {scan_ms:8.3f} ms, download {needed / 1024:.0f} KB of {len(data) / 1024:.0f} KB")
+        print(f"  est. startup @ {MBIT_PER_SEC} Mbit/s     : before {download_ms(len(data)) + full_ms:8.1f} ms -> after {download_ms(needed) + scan_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
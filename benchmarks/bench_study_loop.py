@@ -0,0 +1,104 @@
+# 학습 루프 부하 테스트: 로컬 구글 시트 대역 위에서 AppTest로 앱을 실제 클릭하며 측정
+# - 클릭당 지연 p50/p90/p99, 세션당 메모리, 시트 요청 수
+# 실행: python benchmarks/bench_study_loop.py [--apps civil,study] [--sizes 1000,10000,100000] [--clicks 200] [--sessions 3]
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+import streamlit as st
+import streamlit_gsheets
+from streamlit.testing.v1 import AppTest
+
+from fake_sheets import REQUESTS, FakeGSheetsConnection, FakeSheets, LocalSheetsServer, synthetic_deck
+
+APPS = {"civil": "civil_law_app.py", "study": "study_web_app.py"}
+GRADES = [("어려움", 0.2), ("정상", 0.7), ("쉬움", 0.1)]
+
+
+def click(at, text):
+    for b in at.button:
+        if text in str(b.label) and not b.disabled:
+            b.click()
+            t = time.perf_counter(); at.run(); elapsed = time.perf_counter() - t
+            if at.exception: raise RuntimeError(at.exception[0].value)
+            return elapsed
+    return None
+
+
+def run_session(app, sheet_id, clicks, rng):
+    at = AppTest.from_file(os.path.join(ROOT, APPS[app]), default_timeout=600)
+    at.secrets["gsheets_url"] = f"https://docs.google.com/spreadsheets/d/{sheet_id}/edit"
+    at.secrets["client_flip"] = False  # 버튼 채점 경로를 측정 (빠른 넘기기는 브라우저 쪽 컴포넌트라 AppTest로 클릭 불가)
+    t = time.perf_counter(); at.run(); load = time.perf_counter() - t
+    if at.exception: raise RuntimeError(at.exception[0].value)
+    if at.error: raise RuntimeError(at.error[0].value)
+    click(at, "시작")
+    latencies = []
+    for _ in range(clicks):
+        if at.session_state.state == "QUESTION": elapsed = click(at, "확인")
+        else: elapsed = click(at, rng.choices([g for g, _ in GRADES], [w for _, w in GRADES])[0])
+        if elapsed is None: break  # 모든 문항 정복 등
+        latencies.append(elapsed)
+    return at, load, latencies
+
+
+def fmt_ms(values):
+    if not values: return "-"
+    p50, p90, p99 = np.percentile(np.array(values) * 1000, [50, 90, 99])
+    return f"p50 {p50:7.1f}  p90 {p90:7.1f}  p99 {p99:7.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--apps", default="civil,study")
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--clicks", type=int, default=200)
+    parser.add_argument("--sessions", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    streamlit_gsheets.GSheetsConnection = FakeGSheetsConnection
+    with LocalSheetsServer() as base_url, tempfile.TemporaryDirectory() as workdir:
+        os.environ["GSHEETS_BASE_URL"] = base_url  # sheet_source가 처음 import되기 전에 설정
+        decks = [("study_list", None)] + [(f"synthetic-{n}", n) for n in map(int, args.sizes.split(","))]
+        for app in args.apps.split(","):
+            for label, rows in decks:
+                sheet_id = f"{app}-{label}"
+                # 덱마다 프로세스 캐시와 .study_cache를 새로 시작 (콜드 로드부터 측정)
+                st.cache_data.clear(); st.cache_resource.clear()
+                os.makedirs(os.path.join(workdir, sheet_id)); os.chdir(os.path.join(workdir, sheet_id))
+                deck = synthetic_deck(rows)
+                FakeSheets.seed(sheet_id, {"시트1": deck})
+                REQUESTS.clear()
+                rng = random.Random(args.seed)
+                sessions, loads, latencies = [], [], []
+                for _ in range(args.sessions):
+                    at, load, lat = run_session(app, sheet_id, args.clicks, rng)
+                    sessions.append(at); loads.append(load); latencies += lat
+                requests = dict(REQUESTS)
+                # 메모리는 지연 측정과 분리해 추가 세션 하나로 측정 (tracemalloc은 실행을 크게 느리게 함)
+                tracemalloc.start()
+                before = tracemalloc.get_traced_memory()[0]
+                sessions.append(run_session(app, sheet_id, args.clicks, rng)[0])
+                mem = tracemalloc.get_traced_memory()[0] - before
+                tracemalloc.stop()
+                print(f"[{app} / {label} ({len(deck)} cards)]")
+                print(f"  first load        : {loads[0] * 1000:8.1f} ms (later sessions {np.mean(loads[1:]) * 1000 if len(loads) > 1 else 0:.1f} ms)")
+                print(f"  per click         : {fmt_ms(latencies)}  (n={len(latencies)})")
+                print(f"  memory / session  : {mem / 2**20:6.1f} MB (retained by one more session)")
+                print(f"  sheet requests    : {requests} for {args.sessions} sessions")
+                del sessions
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# 내보내기/가져오기 벤치마크: 복습 기록 전체를 한 번에 to_csv vs 조각 단위 generator (최대 메모리, 시간)
+# 가져오기: pd.read_excel 전체 로드 vs openpyxl read-only 조각 읽기 + 검증/중복 제거
+# 메모리: tracemalloc 최대치 (Python 객체, pandas/NumPy 버퍼) + pyarrow 메모리 풀 최대치
+# 시간은 tracemalloc을 켠 채 잰 값이라 실제보다 몇 배 느림 (방식 간 비교용)
+# 실행: python benchmarks/bench_transfer.py [--reviews 1000000] [--cards 20000] [--import-rows 50000]
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from card_identity import card_ids
+from deck_transfer import CardImporter, csv_chunks, history_frames, parquet_chunks, write_chunks
+from review_store import ReviewStore
+
+
+def fill_log(path, deck, ids, n, rng):
+    # 복습 기록 n건을 직접 넣음 (record()는 응답마다 커밋하므로 준비용으로는 느림)
+    db = sqlite3.connect(path)
+    t0 = 1.7e9
+    for start in range(0, n, 100000):
+        m = min(100000, n - start)
+        cards = rng.integers(0, len(ids), m)
+        rows = zip((deck,) * m, (ids[c] for c in cards.tolist()), (t0 + np.arange(start, start + m) * 30.0).tolist(),
+                   rng.integers(0, 3, m).tolist(), rng.integers(0, 8, m).tolist(), rng.integers(0, 4, m).tolist(),
+                   (t0 + rng.integers(0, 30, m) * 86400.0).tolist())
+        db.executemany("INSERT INTO review_log (deck, card, ts, grade, level, wrong_level, due_at) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        db.commit()
+    db.close()
+
+
+def measured(label, fn):
+    pool = pa.default_memory_pool()
+    base_pool = pool.max_memory() or 0
+    tracemalloc.start()
+    t = time.perf_counter(); size = fn(); elapsed = time.perf_counter() - t
+    _, peak = tracemalloc.get_traced_memory(); tracemalloc.stop()
+    arrow = max(0, (pool.max_memory() or 0) - base_pool)
+    print(f"  {label:<26}: {elapsed:7.2f} s   peak {peak / 2**20:8.1f} MB (+arrow {arrow / 2**20:.1f} MB)   {size / 2**20:8.1f} MB")
+
+
+def naive_export(store, deck):
+    # 기존 오답노트 방식: 전체를 DataFrame으로 읽어 한 번에 CSV 바이트로
+    with store._lock: rows = store._db.execute("SELECT card, ts, grade, level, wrong_level, due_at FROM review_log WHERE deck = ?", (deck,)).fetchall()
+    data = pd.DataFrame(rows, columns=["ID", "시각", "등급", "레벨", "오답레벨", "복습예정"]).to_csv(index=False).encode("utf-8-sig")
+    return len(data)
+
+
+def bench_export(tmp, n_reviews, n_cards, rng):
+    deck = pd.DataFrame({"질문": [f"질문 {i}" for i in range(n_cards)], "정답": [f"정답 {i}" for i in range(n_cards)], "정답횟수": 0})
+    ids = card_ids(deck)
+    path = os.path.join(tmp, "review.sqlite3")
+    store = ReviewStore(path)
+    t = time.perf_counter(); fill_log(path, "bench", ids, n_reviews, rng)
+    print(f"[export: {n_reviews:,} reviews over {n_cards:,} cards]  (fill {time.perf_counter() - t:.1f} s)")
+    measured("naive to_csv (in memory)", lambda: naive_export(store, "bench"))
+    measured("stream csv -> file", lambda: write_chunks(csv_chunks(history_frames(store, "bench", deck, ids)), os.path.join(tmp, "log.csv")))
+    measured("stream parquet -> file", lambda: write_chunks(parquet_chunks(history_frames(store, "bench", deck, ids)), os.path.join(tmp, "log.parquet")))
+    exported = pd.read_csv(os.path.join(tmp, "log.csv"), usecols=["ID"], encoding="utf-8-sig")
+    assert len(exported) == n_reviews and len(pd.read_parquet(os.path.join(tmp, "log.parquet"), columns=["ID"])) == n_reviews
+
+
+def bench_import(tmp, n_rows, rng):
+    import openpyxl
+    path = os.path.join(tmp, "big.xlsx")
+    wb = openpyxl.Workbook(write_only=True); ws = wb.create_sheet("시트1")
+    ws.append(["질문", "정답", "정답횟수", "오답횟수"])
+    dup = rng.integers(0, n_rows, n_rows // 20)
+    for i in range(n_rows): ws.append([f"질문 {i} " + "가나다라" * 8, f"정답 {i}", int(i % 7), 0])
+    for i in dup.tolist(): ws.append([f"질문 {i} " + "가나다라" * 8, f"정답 {i}", 0, 0])  # 파일 안 중복
+    wb.save(path)
+    existing = card_ids(pd.DataFrame({"질문": [f"질문 {i} " + "가나다라" * 8 for i in range(n_rows // 2)],
+                                      "정답": [f"정답 {i}" for i in range(n_rows // 2)]}))
+    print(f"[import: {n_rows + len(dup):,} xlsx rows, {len(existing):,} already in deck]  ({os.path.getsize(path) / 2**20:.1f} MB)")
+    measured("pd.read_excel (whole)", lambda: int(pd.read_excel(path).memory_usage(deep=True).sum()))
+    importer = CardImporter(existing)
+    measured("CardImporter -> parquet", lambda: importer.to_file(path, os.path.join(tmp, "new.parquet")))
+    print(f"  {importer.summary()}")
+    assert importer.added == n_rows - len(existing) and importer.duplicate == len(existing) + len(dup)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reviews", type=int, default=1000000)
+    parser.add_argument("--cards", type=int, default=20000)
+    parser.add_argument("--import-rows", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_export(tmp, args.reviews, args.cards, rng)
+        if args.import_rows: bench_import(tmp, args.import_rows, rng)
+
+
+if __name__ == "__main__":
+    main()
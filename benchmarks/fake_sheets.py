@@ -0,0 +1,132 @@
+# 벤치마크용 구글 시트 대역: GSheetsConnection 가짜 객체 + gviz CSV / xlsx export 로컬 HTTP 서버
+import io
+import os
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+import pandas as pd
+from streamlit.connections import BaseConnection
+
+STUDY_LIST = os.path.join(os.path.dirname(__file__), "..", "study_list.xlsx")
+DECK_COLUMNS = ['질문', '정답', '정답횟수', '오답횟수', '어려움횟수', '정상횟수', '쉬움횟수']
+
+# 요청 종류별 횟수 (read / update / gviz / export)
+REQUESTS = Counter()
+
+
+def synthetic_deck(rows=None, seed_path=STUDY_LIST):
+    # study_list.xlsx 문항을 반복해 rows개 카드 덱 생성 (문항마다 번호를 붙여 카드 ID가 겹치지 않게)
+    # rows=None이면 study_list.xlsx 그대로의 문항 수
+    seed = pd.read_excel(seed_path).iloc[:, :2]
+    seed.columns = ['질문', '정답']
+    rows = rows or len(seed)
+    reps = -(-rows // len(seed))
+    df = pd.concat([seed] * reps, ignore_index=True).iloc[:rows]
+    df['질문'] = [f"[{i}] {q}" for i, q in enumerate(df['질문'])]
+    for col in DECK_COLUMNS[2:]: df[col] = 0
+    return df
+
+
+class FakeSheets:
+    # 시트 ID -> {탭 이름: DataFrame}, 응답 바이트는 미리 만들어 두고 update 시에만 다시 생성
+    decks = {}
+    _rendered = {}
+
+    @classmethod
+    def seed(cls, sheet_id, tabs):
+        cls.decks[sheet_id] = {name: df.copy() for name, df in tabs.items()}
+        cls._rendered.pop(sheet_id, None)
+        cls.rendered(sheet_id)
+
+    @classmethod
+    def tab(cls, sheet_id, worksheet):
+        tabs = cls.decks[sheet_id]
+        if isinstance(worksheet, int) or worksheet is None: return list(tabs.values())[worksheet or 0]
+        return tabs[worksheet]
+
+    @classmethod
+    def rendered(cls, sheet_id):
+        # 반환: ({탭 이름: CSV 바이트}, xlsx 바이트)
+        if sheet_id not in cls._rendered:
+            tabs = cls.decks[sheet_id]
+            out = io.BytesIO()
+            with pd.ExcelWriter(out, engine="openpyxl") as writer:
+                for name, df in tabs.items(): df.to_excel(writer, sheet_name=name, index=False)
+            csvs = {name: df.to_csv(index=False).encode("utf-8") for name, df in tabs.items()}
+            cls._rendered[sheet_id] = (csvs, out.getvalue())
+        return cls._rendered[sheet_id]
+
+
+def _sheet_id(url):
+    parts = urlparse(url).path.split("/")
+    return parts[parts.index("d") + 1] if "d" in parts else url
+
+
+class FakeGSheetsConnection(BaseConnection):
+    # st.connection("gsheets", type=...)에 그대로 넣을 수 있는 가짜 연결
+    def _connect(self, **kwargs):
+        return FakeSheets
+
+    def read(self, spreadsheet=None, worksheet=None, ttl=None, **kwargs):
+        REQUESTS["read"] += 1
+        return FakeSheets.tab(_sheet_id(spreadsheet), worksheet).copy()
+
+    def update(self, spreadsheet=None, worksheet=None, data=None, **kwargs):
+        REQUESTS["update"] += 1
+        tabs = FakeSheets.decks[_sheet_id(spreadsheet)]
+        name = list(tabs)[worksheet or 0] if isinstance(worksheet, int) or worksheet is None else worksheet
+        tabs[name] = data.copy()
+        FakeSheets._rendered.pop(_sheet_id(spreadsheet), None)
+        return data
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = url.path.split("/")
+        try:
+            csvs, xlsx = FakeSheets.rendered(parts[parts.index("d") + 1])
+        except (ValueError, IndexError, KeyError):
+            return self.send_error(404)
+        if url.path.endswith("/gviz/tq"):
+            REQUESTS["gviz"] += 1
+            name = unquote(parse_qs(url.query).get("sheet", [next(iter(csvs))])[0])
+            if name not in csvs: return self.send_error(404)
+            body, ctype = csvs[name], "text/csv; charset=utf-8"
+        elif url.path.endswith("/export"):
+            REQUESTS["export"] += 1
+            body, ctype = xlsx, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        else:
+            return self.send_error(404)
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 탭 목록만 읽고 다운로드를 끊은 경우
+
+
+class LocalSheetsServer:
+    # with LocalSheetsServer() as base_url: GSHEETS_BASE_URL=base_url 로 앱 실행
+    def __init__(self, port=0):
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self.base_url
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
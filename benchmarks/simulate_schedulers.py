@@ -0,0 +1,200 @@
+# 출제 전략 오프라인 시뮬레이터: 가상 학습자들의 응답 스트림을 재생해 전략별 복습당 기억 유지량을 비교
+# - 기억 모델: 회상 확률 p = exp(-경과일 / S), 성공하면 S가 커지고(어렵게 떠올릴수록 더), 실패하면 줄어듦
+# - 응답: 실패 -> 어려움, 성공 -> 정상, p >= EASY_P인 성공 -> 쉬움
+# - 기본(vector) 엔진은 학습자 L명 x 카드 N장을 NumPy 배열로 한 스텝씩 동시에 진행 (초당 수백만 응답)
+#   exact 엔진은 scheduler 패키지의 실제 클래스를 그대로 돌려 vector 엔진의 규칙을 교차 확인
+# 실행: python benchmarks/simulate_schedulers.py [--strategies fibo,sm2,random] [--learners 2000] [--cards 500]
+#       [--days 30] [--per-day 100] [--engine vector|exact] [--seed 0]
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scheduler import FIBO_GAP, GRADUATED, HARD_GAP, STRATEGIES, WAITING, make_scheduler, time_based
+from scheduler.sm2 import DAY, FIRST_INTERVALS, HARD_EASE_STEP, MASTERED_INTERVAL, MIN_EASE, RELEARN_DELAY, START_EASE
+
+P_NEW = 0.3  # 처음 보는 카드를 맞힐 확률
+S_FIRST = 1.0  # 첫 노출 뒤 기억 안정도 (일)
+S_MIN = 0.3
+EASY_P = 0.95
+HARD, NORMAL, EASY = 0, 1, 2
+
+
+def recall(p, seen, rng):
+    # 반환: (응답 등급, 성공 여부)
+    success = rng.random(len(p)) < p
+    grade = np.where(success, np.where(seen & (p >= EASY_P), EASY, NORMAL), HARD)
+    return grade, success
+
+
+def update_memory(S, p, seen, success):
+    grown = S * (2.0 + 4.0 * (1 - p))
+    return np.where(~seen, S_FIRST, np.where(success, grown, np.maximum(S_MIN, 0.4 * S)))
+
+
+class VectorSim:
+    # 학습자별 덱 상태를 (L, N) 배열로 보관, 스텝마다 학습자당 카드 하나씩 출제/응답
+    # 복습 예약은 due(없으면 inf)의 행별 argmin, 신규 카드는 학습자별 무작위 순열에서 차례로 꺼냄
+    def __init__(self, strategy, learners, cards, per_day, serve_future, rng):
+        self.strategy, self.L, self.N, self.per_day, self.serve_future, self.rng = strategy, learners, cards, per_day, serve_future, rng
+        shape = (learners, cards)
+        self.rows = np.arange(learners)
+        self.due = np.full(shape, np.inf)
+        self.level = np.zeros(shape, np.int16)
+        self.mastered = np.zeros(shape, bool)
+        self.seen = np.zeros(shape, bool)
+        self.S = np.full(shape, S_FIRST)
+        self.last = np.zeros(shape)
+        self.ease = np.full(shape, START_EASE)
+        self.interval = np.zeros(shape)
+        self.perm = rng.permuted(np.tile(np.arange(cards), (learners, 1)), axis=1)
+        self.ptr = np.zeros(learners, np.int64)
+        self.solve_count = np.zeros(learners, np.int64)
+        self.unmastered = np.full(learners, cards, np.int64)
+
+    def now(self, step):
+        # 전략의 시계: 피보나치/무작위는 학습자별 응답 수, SM-2는 일 단위 시각
+        return np.full(self.L, step / self.per_day) if time_based(self.strategy) else self.solve_count
+
+    def pick(self, step):
+        # BaseScheduler.next()와 같은 규칙 (반환: 카드, 출제 여부)
+        if self.strategy == "random": return self.pick_uniform()
+        col = self.due.argmin(axis=1)
+        slot = self.due[self.rows, col]
+        scheduled = np.isfinite(slot)
+        pending = scheduled & (slot <= self.now(step))
+        has_new = self.ptr < self.N
+        take_new = has_new & (~pending | (self.rng.random(self.L) < 0.5))
+        take_due = ~take_new & (pending | (scheduled & self.serve_future))
+        card = np.where(take_new, self.perm[self.rows, np.minimum(self.ptr, self.N - 1)], col)
+        self.ptr += take_new
+        self.due[self.rows[take_due], col[take_due]] = np.inf
+        return card, take_new | take_due
+
+    def pick_uniform(self):
+        # 미정복 카드 중 균등 추출: 몇 번 다시 뽑고, 그래도 못 고른 행만 전체 스캔
+        active = self.unmastered > 0
+        card = self.rng.integers(0, self.N, self.L)
+        for _ in range(8):
+            miss = active & self.mastered[self.rows, card]
+            if not miss.any(): break
+            card[miss] = self.rng.integers(0, self.N, miss.sum())
+        miss = np.flatnonzero(active & self.mastered[self.rows, card])
+        if len(miss): card[miss] = (self.rng.random((len(miss), self.N)) * ~self.mastered[miss]).argmax(axis=1)
+        return card, active
+
+    def answer(self, rows, cards, grade, step):
+        lv = self.level[rows, cards]
+        hard, normal, easy = grade == HARD, grade == NORMAL, grade == EASY
+        new_lv = np.where(hard, 1, lv + 1)
+        if self.strategy == "sm2":
+            t = step / self.per_day
+            ease = np.where(hard, np.maximum(MIN_EASE, self.ease[rows, cards] - HARD_EASE_STEP), self.ease[rows, cards])
+            prev = self.interval[rows, cards]
+            grown = np.where((prev > 0) & (new_lv > len(FIRST_INTERVALS)), prev * ease,
+                             np.take(FIRST_INTERVALS, np.minimum(new_lv, len(FIRST_INTERVALS)) - 1))
+            interval = np.where(hard, 0.0, grown)
+            done = easy | (normal & (interval > MASTERED_INTERVAL))
+            due = np.where(hard, t + RELEARN_DELAY / DAY, t + interval)
+            self.ease[rows, cards], self.interval[rows, cards] = np.where(done, START_EASE, ease), np.where(done, 0.0, interval)
+        else:
+            done = easy | (normal & (new_lv >= len(FIBO_GAP)))
+            sc = self.solve_count[rows]
+            due = np.where(hard, sc + HARD_GAP, sc + np.take(FIBO_GAP, np.minimum(new_lv, len(FIBO_GAP) - 1)))
+        if self.strategy != "random":
+            keep = ~done
+            self.due[rows[keep], cards[keep]] = due[keep]
+        self.level[rows, cards] = np.where(done, 0, new_lv)
+        self.mastered[rows, cards] |= done
+        self.unmastered[rows] -= done  # 스텝마다 학습자당 한 장이라 rows는 중복 없음
+        self.solve_count[rows] += 1
+
+    def step(self, step):
+        card, active = self.pick(step)
+        rows, cards = self.rows[active], card[active]
+        if not len(rows): return 0
+        t = step / self.per_day
+        seen = self.seen[rows, cards]
+        S = self.S[rows, cards]
+        p = np.where(seen, np.exp(-(t - self.last[rows, cards]) / S), P_NEW)
+        grade, success = recall(p, seen, self.rng)
+        self.S[rows, cards] = update_memory(S, p, seen, success)
+        self.last[rows, cards] = t
+        self.seen[rows, cards] = True
+        self.answer(rows, cards, grade, step)
+        return len(rows)
+
+    def retention(self, step):
+        t = step / self.per_day
+        return np.where(self.seen, np.exp(-(t - self.last) / self.S), 0.0).sum(axis=1), self.mastered.sum(axis=1)
+
+
+def run_vector(strategy, args, rng):
+    sim = VectorSim(strategy, args.learners, args.cards, args.per_day, serve_future(strategy, args), rng)
+    steps = int(args.days * args.per_day)
+    reviews, start = 0, time.perf_counter()
+    for step in range(steps): reviews += sim.step(step)
+    elapsed = time.perf_counter() - start
+    retained, mastered = sim.retention(steps)
+    return reviews, elapsed, retained, mastered
+
+
+def run_exact(strategy, args, rng):
+    # 실제 스케줄러 클래스로 학습자 한 명씩 재생 (SM-2는 가상 시계)
+    reviews, retained, mastered, start = 0, [], [], time.perf_counter()
+    steps = int(args.days * args.per_day)
+    for learner in range(args.learners):
+        clock = [0.0]
+        kw = {"clock": lambda: clock[0] * DAY} if time_based(strategy) else {}
+        s = make_scheduler(strategy, [0] * args.cards, serve_future=serve_future(strategy, args), rng=random.Random(int(rng.integers(1 << 31))), **kw)
+        S, last, seen = np.full(args.cards, S_FIRST), np.zeros(args.cards), np.zeros(args.cards, bool)
+        for step in range(steps):
+            clock[0] = t = step / args.per_day
+            idx = s.next()
+            if idx in (GRADUATED, WAITING): continue
+            p = np.exp(-(t - last[idx]) / S[idx]) if seen[idx] else P_NEW
+            grade, success = recall(np.array([p]), np.array([seen[idx]]), rng)
+            S[idx] = update_memory(S[idx], p, seen[idx], success[0])
+            last[idx], seen[idx] = t, True
+            [s.answer_hard, s.answer_normal, s.answer_easy][grade[0]](idx)
+            reviews += 1
+        t = steps / args.per_day
+        retained.append(np.where(seen, np.exp(-(t - last) / S), 0.0).sum())
+        mastered.append(sum(s.is_mastered(i) for i in range(args.cards)))
+    return reviews, time.perf_counter() - start, np.array(retained), np.array(mastered)
+
+
+def serve_future(strategy, args):
+    # 기본값: 응답 수가 시계인 전략은 예약 카드를 앞당겨 출제(민법/경제 앱), 시간 기반은 대기(study 앱)
+    return args.serve_future if args.serve_future is not None else not time_based(strategy)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--strategies", default=",".join(STRATEGIES))
+    parser.add_argument("--learners", type=int, default=2000)
+    parser.add_argument("--cards", type=int, default=500)
+    parser.add_argument("--days", type=float, default=30)
+    parser.add_argument("--per-day", type=int, default=100, help="학습자당 하루 출제 기회 수")
+    parser.add_argument("--engine", choices=["vector", "exact"], default="vector")
+    parser.add_argument("--serve-future", type=lambda v: v.lower() in ("1", "true", "yes"), default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    run = run_vector if args.engine == "vector" else run_exact
+    print(f"{args.engine}: {args.learners} learners x {args.cards} cards, {args.days:g} days x {args.per_day}/day")
+    print(f"{'strategy':<10}{'reviews':>12}{'reviews/s':>14}{'retained':>11}{'mastered':>11}{'kept/100 rev':>14}")
+    for strategy in args.strategies.split(","):
+        reviews, elapsed, retained, mastered = run(strategy, args, np.random.default_rng(args.seed))
+        per_review = retained.sum() / max(reviews, 1) * 100
+        print(f"{strategy:<10}{reviews:>12,}{reviews / elapsed:>14,.0f}{retained.mean() / args.cards:>11.1%}"
+              f"{mastered.mean() / args.cards:>11.1%}{per_review:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
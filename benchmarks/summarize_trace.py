@@ -0,0 +1,45 @@
+# perf_trace JSONL 요약: 구간별 호출 수/합계/p50/p90/p99, rerun 전체 시간, 카운터 합계
+# 실행: python benchmarks/summarize_trace.py [.study_cache/trace.jsonl] [--top 20]
+import argparse
+import json
+from collections import Counter, defaultdict
+
+import numpy as np
+
+
+def load_events(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try: yield json.loads(line)
+            except ValueError: continue  # 기록 중 끊긴 마지막 줄
+
+
+def summarize(events):
+    spans, counters, reruns, sessions = defaultdict(list), Counter(), [], set()
+    for ev in events:
+        for name, ms in ev.get("spans", []): spans[name].append(ms)
+        counters.update(ev.get("counters", {}))
+        if "total_ms" in ev: reruns.append(ev["total_ms"]); sessions.add(ev.get("session"))
+    return spans, counters, reruns, sessions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", nargs="?", default=".study_cache/trace.jsonl")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    spans, counters, reruns, sessions = summarize(load_events(args.path))
+    if reruns:
+        p50, p90, p99 = np.percentile(reruns, [50, 90, 99])
+        print(f"reruns: {len(reruns)} from {len(sessions)} sessions  p50 {p50:.1f}  p90 {p90:.1f}  p99 {p99:.1f} ms")
+    print(f"{'span':<24}{'n':>8}{'total ms':>12}{'p50':>10}{'p90':>10}{'p99':>10}")
+    for name, values in sorted(spans.items(), key=lambda kv: -sum(kv[1]))[:args.top]:
+        p50, p90, p99 = np.percentile(values, [50, 90, 99])
+        print(f"{name:<24}{len(values):>8}{sum(values):>12.1f}{p50:>10.2f}{p90:>10.2f}{p99:>10.2f}")
+    if counters:
+        print("counters: " + ", ".join(f"{k}={v}" for k, v in sorted(counters.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import hashlib
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from scheduler import MASTERED_COUNT
+
+COUNTER_COLUMNS = ['정답횟수', '오답횟수', '어려움횟수', '정상횟수', '쉬움횟수']
+
+# index_map[이전 행] = 새 행 (-1: 삭제), added/edited는 새 덱 기준 행, removed는 이전 덱 기준 행
+DeckDiff = namedtuple("DeckDiff", ["index_map", "added", "removed", "edited", "structural"])
+
+
+def card_id(question, answer):
+    return hashlib.sha1(f"{question}\x1f{answer}".encode("utf-8")).hexdigest()[:16]
+
+
+def card_ids(df):
+    # 'ID' 열이 있으면 그 값을, 없으면 질문+정답 해시를 행 위치와 무관한 카드 ID로 사용
+    # (같은 내용이 반복되면 #n 접미사)
+    if 'ID' in df.columns and df['ID'].notna().all():
+        base = [str(v) for v in df['ID']]
+    else:
+        base = [card_id(q, a) for q, a in zip(df['질문'], df['정답'])]
+    seen, out = {}, []
+    for cid in base:
+        n = seen.get(cid, 0); seen[cid] = n + 1
+        out.append(cid if n == 0 else f"{cid}#{n}")
+    return out
+
+
+def _row_hashes(df, columns):
+    cols = [c for c in columns if c in df.columns]
+    return pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+
+
+def diff_decks(old_df, old_ids, new_df, new_ids):
+    # 이전 덱과 새로 받은 덱을 카드 ID로 맞춰 추가/삭제/수정된 카드를 찾음
+    new_pos = {c: i for i, c in enumerate(new_ids)}
+    index_map = np.fromiter((new_pos.get(c, -1) for c in old_ids), dtype=np.int64, count=len(old_ids))
+    kept_old = np.flatnonzero(index_map >= 0)
+    kept_new = index_map[kept_old]
+    old_set = set(old_ids)
+    added = [i for i, c in enumerate(new_ids) if c not in old_set]
+    removed = np.flatnonzero(index_map < 0).tolist()
+    cols = [c for c in old_df.columns if c in new_df.columns]
+    changed = _row_hashes(old_df, cols)[kept_old] != _row_hashes(new_df, cols)[kept_new]
+    edited = kept_new[changed].tolist()
+    structural = bool(added or removed) or not np.array_equal(kept_new, np.arange(len(kept_new)))
+    return DeckDiff(index_map, added, removed, edited, structural)
+
+
+def apply_mastered(view, ids, mastered_cards, sched, stats=None):
+    # 저장된 정복 카드(ReviewStore)는 덱 카운터보다 우선: 스케줄러에서 정복 처리하고
+    # 세션 overlay의 정답횟수를 정복 기준까지 올림 (시트에 반영하지 않는 설정에서도 진행률이 맞도록)
+    pos = {c: i for i, c in enumerate(ids)}
+    for card in mastered_cards:
+        idx = pos.get(card)
+        if idx is None: continue
+        sched.mark_mastered(idx)
+        short = MASTERED_COUNT - int(view.value(idx, '정답횟수'))
+        if short > 0:
+            view.add(idx, {'정답횟수': short})
+            if stats is not None: stats.apply(idx, {'정답횟수': short})
+
+
+def sync_deck(old_df, old_ids, new_df, sched, stats, new_ids=None):
+    # 새 덱으로 교체하면서 복습 상태를 카드 ID 기준으로 이어 붙임
+    # 행 구성이 그대로면 수정된 행만 반영 (O(변경 행)), 추가/삭제/이동이 있으면 위치 재매핑
+    if new_ids is None: new_ids = card_ids(new_df)
+    diff = diff_decks(old_df, old_ids, new_df, new_ids)
+    if diff.structural:
+        sched.remap(diff.index_map, new_df['정답횟수']); stats.reset(new_df)
+        return new_ids, diff
+    for idx in diff.edited:
+        deltas = {c: int(new_df.at[idx, c]) - int(old_df.at[idx, c]) for c in COUNTER_COLUMNS if c in new_df.columns}
+        if int(new_df.at[idx, '정답횟수']) >= MASTERED_COUNT: sched.mark_mastered(idx)
+        else: sched.mark_unmastered(idx)
+        stats.apply(idx, {c: d for c, d in deltas.items() if d})
+    if diff.edited: stats.invalidate()
+    return new_ids, diff
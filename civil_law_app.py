@@ -1,22 +1,42 @@
 import streamlit as st
 from streamlit_gsheets import GSheetsConnection
 import pandas as pd
-import random
 import streamlit.components.v1 as components
+from scheduler import DEFAULT_STRATEGY, FOCUS_DONE, GRADUATED, STRATEGIES, WAITING, make_scheduler, time_based
+from write_queue import SheetWriter, WriteBehindQueue
+from deck_cache import DeckCache
+from review_store import ReviewStore
+from card_identity import apply_mastered, card_ids, sync_deck
+from deck_stats import DeckStats
+from deck_store import DeckView, compact_deck
+from local_deck import load_local_deck, local_version
+import hashlib
+import os
+from datetime import datetime
+import uuid
+from perf_trace import show_debug_panel, timed, tracer
+from due_index import show_forecast
+from deck_transfer import transfer_panel
+from flip_deck import flip_session, reset_flip
+from search_index import search_done_panel, search_panel, sync_index
 
 # 1. 페이지 설정
 st.set_page_config(page_title="감평 반응형 인출기", layout="wide")
 
-# 2. 세션 및 피보나치 설정
-FIBO_GAP = [0, 5, 13, 21, 34, 55, 89, 144] 
+# 2. 세션 설정 (피보나치 간격은 scheduler.FIBO_GAP)
 if 'state' not in st.session_state: st.session_state.state = "IDLE"
 if 'current_index' not in st.session_state: st.session_state.current_index = None
-if 'q_levels' not in st.session_state: st.session_state.q_levels = {} 
-if 'q_wrong_levels' not in st.session_state: st.session_state.q_wrong_levels = {}
-if 'schedules' not in st.session_state: st.session_state.schedules = {} 
-if 'solve_count' not in st.session_state: st.session_state.solve_count = 0
+if 'scheduler' not in st.session_state: st.session_state.scheduler = None
 if 'last_msg' not in st.session_state: st.session_state.last_msg = "데이터 동기화 준비 완료."
 
+# 성능 측정: secrets의 debug_timing = true (또는 STUDY_TRACE=1)일 때만 켜짐, 구간별 시간은 trace_path(JSONL)에 기록
+@st.cache_resource
+def setup_tracing():
+    tracer.configure(st.secrets.get("debug_timing", False) or os.environ.get("STUDY_TRACE") == "1", st.secrets.get("trace_path", ".study_cache/trace.jsonl"))
+    return tracer
+if 'trace_session' not in st.session_state: st.session_state.trace_session = uuid.uuid4().hex[:8]
+setup_tracing().begin_run(st.session_state.trace_session)
+
 # 3. 디자인 설정 (PC 2/3, 모바일 1/2 사이즈 최적화)
 st.markdown("""
 <style>
@@ -60,37 +80,148 @@ st.markdown("""
 
 # 4. 데이터 로드
 conn = st.connection("gsheets", type=GSheetsConnection)
-@st.cache_data(ttl=1)
-def load_data():
-    try:
-        url = st.secrets["gsheets_url"].strip()
-        df_raw = conn.read(spreadsheet=url, worksheet=0)
-        df = df_raw.iloc[:, :7]
-        df.columns = ['질문', '정답', '정답횟수', '오답횟수', '어려움횟수', '정상횟수', '쉬움횟수']
-        df = df.dropna(subset=['질문']).reset_index(drop=True)
-        for col in ['정답횟수', '오답횟수', '어려움횟수', '정상횟수', '쉬움횟수']:
-            df[col] = pd.to_numeric(df[col]).fillna(0).astype(int)
-        return df
+SHEET_URL = st.secrets.get("gsheets_url", "").strip()
+# 오프라인 우선 모드: offline_deck(로컬 xlsx/CSV/Parquet)으로 학습, 응답은 로컬에 기록하고 시트에는 백그라운드로 반영
+OFFLINE_DECK = st.secrets.get("offline_deck") or os.environ.get("STUDY_OFFLINE_DECK")
+DECK_KEY = SHEET_URL or f"local:{os.path.abspath(OFFLINE_DECK or '')}"  # 복습 상태 저장 키
+
+def to_deck(df_raw):
+    df = df_raw.iloc[:, :7].copy()
+    for i in range(len(df.columns), 7): df[f"_{i}"] = 0  # 카운터 열이 덜 있는 로컬 파일 (예: study_list.xlsx)
+    df.columns = ['질문', '정답', '정답횟수', '오답횟수', '어려움횟수', '정상횟수', '쉬움횟수']
+    df = df.dropna(subset=['질문']).reset_index(drop=True)
+    for col in ['정답횟수', '오답횟수', '어려움횟수', '정상횟수', '쉬움횟수']:
+        df[col] = pd.to_numeric(df[col]).fillna(0).astype(int)
+    return compact_deck(df)
+
+def fetch_deck(url):
+    try: return to_deck(conn.read(spreadsheet=url, worksheet=0, ttl=0))
     except: return None
 
+# 디스크 덱 캐시: 즉시 반환 + 주기적 백그라운드 갱신 (deck_refresh_sec, 기본 300초)
+@st.cache_resource
+def get_deck_cache():
+    return DeckCache(fetch_deck, cache_dir=".study_cache/decks/civil", refresh_interval=st.secrets.get("deck_refresh_sec", 300))
+
+# 세션은 공유 덱을 복사하지 않고 카운터 증감분만 DeckView overlay에 보관
+@timed("load_data")
+def load_data(refresh=False):
+    if OFFLINE_DECK: return load_offline()
+    cache = get_deck_cache()
+    df = cache.refresh(SHEET_URL) if refresh else cache.get(SHEET_URL)
+    return None if df is None else DeckView(df)
+
+# 로컬 덱은 파일 버전마다 프로세스에 하나 (memory-map Feather), 이 파일 기준으로 쌓인 로컬 카운터를 overlay로 복원
+@st.cache_resource(max_entries=4)
+def shared_local_deck(path, version):
+    return load_local_deck(path, to_deck, cache_dir=".study_cache/local/civil")
+
+def load_offline():
+    try: version = local_version(OFFLINE_DECK); base = shared_local_deck(OFFLINE_DECK, version)
+    except Exception: return None
+    if base is None: return None
+    view = DeckView(base); pos = {c: i for i, c in enumerate(card_ids(base))}
+    for card, changes in get_review_store().load_counts(DECK_KEY, version).items():
+        if card in pos: view.add(pos[card], changes)
+    return view
+
+# 응답 기록은 프로세스 공용 write-behind 큐로 일괄 반영 (journal로 유실 방지)
+@st.cache_resource
+def get_write_queue(url):
+    if not url: return None  # 시트 없이 로컬 덱만 사용
+    os.makedirs(".study_cache", exist_ok=True)
+    journal = os.path.join(".study_cache", f"journal_{hashlib.sha1(url.encode()).hexdigest()[:12]}.jsonl")
+    cache = get_deck_cache()  # 반영된 증감분은 공유 덱 캐시에도 더함 (새 세션/새로고침이 옛 카운터를 받지 않도록)
+    return WriteBehindQueue(SheetWriter(conn, url, worksheet=0), journal, on_flush=lambda batch: cache.apply(url, batch))
+
+# 복습 레벨/일정은 카드 ID 기준으로 SQLite에 보관 (새로고침/재시작 후에도 유지)
+@st.cache_resource
+def get_review_store():
+    return ReviewStore()
+
+# 출제 전략은 덱마다 선택 (사이드바, ReviewStore에 저장 / 기본값은 secrets의 scheduler)
+# 복습 상태는 전략별로 따로 보관 (피보나치는 기존 키 그대로)
+def get_strategy(deck):
+    return get_review_store().strategy(deck) or st.secrets.get("scheduler", DEFAULT_STRATEGY)
+
+def review_key(deck, strategy):
+    return deck if strategy == DEFAULT_STRATEGY else f"{deck}#{strategy}"
+
+def new_scheduler(dataframe):
+    strategy = get_strategy(DECK_KEY)  # 시간 기반 전략(SM-2)은 예정 시각 전의 카드를 앞당겨 내지 않음 (WAITING)
+    s = make_scheduler(strategy, dataframe['정답횟수'], serve_future=not time_based(strategy)); st.session_state.card_ids = card_ids(dataframe)
+    pos = {c: i for i, c in enumerate(st.session_state.card_ids)}
+    solve_count, states = get_review_store().load(review_key(DECK_KEY, s.name))
+    s.restore(solve_count, {pos[c]: v for c, v in states.items() if c in pos})
+    apply_mastered(dataframe, st.session_state.card_ids, [c for c, v in states.items() if v[5]], s)
+    return s
+
+@timed("record_answer")
+def record_answer(q_idx, deltas, grade):
+    # 스케줄러 갱신 후 호출: 시트 카운터(write-behind) + 복습 상태(SQLite) 기록
+    df.add(q_idx, deltas)
+    stats.apply(q_idx, deltas)
+    card = st.session_state.card_ids[q_idx]; queue = get_write_queue(SHEET_URL)
+    if OFFLINE_DECK: get_review_store().add_counts(DECK_KEY, local_version(OFFLINE_DECK), card, deltas)
+    if queue is not None: queue.record(card, deltas)  # 행 위치는 시트 편집/오프라인 덱에서 어긋날 수 있어 카드 ID로 기록
+    lv, wl, due, extra, due_at = sched.card_state(q_idx)
+    get_review_store().record(review_key(DECK_KEY, sched.name), card, lv, wl, due, sched.solve_count, extra, due_at, grade, sched.is_mastered(q_idx))
+
 if 'df' not in st.session_state: st.session_state.df = load_data()
 df = st.session_state.df
+if df is not None and st.session_state.scheduler is None: st.session_state.scheduler = new_scheduler(df); st.session_state.stats = DeckStats(df)
+sched = st.session_state.scheduler; stats = st.session_state.get('stats')
+
+with st.sidebar:
+    strategies = list(STRATEGIES)
+    picked_strategy = st.selectbox("출제 방식", strategies, index=strategies.index(sched.name) if sched else 0, format_func=lambda n: STRATEGIES[n].label, disabled=sched is None)
+    if sched is not None and picked_strategy != sched.name:
+        get_review_store().set_strategy(DECK_KEY, picked_strategy)
+        st.session_state.scheduler = None; st.session_state.state = "IDLE"; st.session_state.current_index = None; st.rerun()
+    st.toggle("⚡ 빠른 넘기기", value=st.secrets.get("client_flip", True), key="client_flip", help="정답 확인/채점을 브라우저에서 처리하고 10문항마다 한 번에 저장")
+    if sched is not None and search_panel(df.base, sched) and st.session_state.state != "IDLE":
+        st.session_state.current_index = None if st.session_state.client_flip else sched.next(); st.session_state.state = "QUESTION"; reset_flip()
+    if sched is not None: show_forecast(sched.due_index)
+    if sched is not None: transfer_panel(df, st.session_state.card_ids, get_review_store(), review_key(DECK_KEY, sched.name), "민법")
 
-# 5. 출제 로직 (50% 신규 보장 유지)
+# 5. 출제 로직 (50% 신규 보장 유지, heap 기반 O(log n))
+@timed("next_question")
 def get_next_question(dataframe):
-    curr_cnt = st.session_state.solve_count
-    all_scheduled = [idx for sublist in st.session_state.schedules.values() for idx in sublist]
-    available_new = [i for i in range(len(dataframe)) if int(dataframe.iloc[i]['정답횟수']) < 5 and i not in all_scheduled]
-    pending_keys = sorted([k for k in st.session_state.schedules.keys() if k <= curr_cnt and st.session_state.schedules[k]])
-    
-    if available_new and pending_keys:
-        if random.random() < 0.5: return random.choice(available_new)
-        else: return st.session_state.schedules[pending_keys[0]].pop(0)
-    if available_new: return random.choice(available_new)
-    if pending_keys: return st.session_state.schedules[pending_keys[0]].pop(0)
-    future_keys = sorted([k for k in st.session_state.schedules.keys() if k > curr_cnt and st.session_state.schedules[k]])
-    if future_keys: return st.session_state.schedules[future_keys[0]].pop(0)
-    return "GRADUATED"
+    return st.session_state.scheduler.next()
+
+def start_question():
+    # 빠른 넘기기는 flip_session이 묶음을 직접 뽑으므로 미리 꺼내지 않음 (꺼낸 복습 카드는 예약 슬롯을 잃음)
+    st.session_state.current_index = None if st.session_state.client_flip else get_next_question(df); st.session_state.state = "QUESTION"
+
+GRADE_LABELS = ["어려움 (1/Ctrl)", "정상 (2/Alt)", "너무 쉬움 (3)"]
+
+def grade_card(q_idx, grade):
+    # 0 어려움 / 1 정상 / 2 쉬움 (버튼과 빠른 넘기기 공용)
+    if grade == 0: sched.answer_hard(q_idx); record_answer(q_idx, {'오답횟수': 1, '어려움횟수': 1}, grade)
+    elif grade == 1:
+        deltas = {'정상횟수': 1}
+        if sched.answer_normal(q_idx): deltas['정답횟수'] = 5 - int(df.value(q_idx, '정답횟수'))
+        record_answer(q_idx, deltas, grade)
+    else: sched.answer_easy(q_idx); record_answer(q_idx, {'정답횟수': 5 - int(df.value(q_idx, '정답횟수')), '쉬움횟수': 1}, grade)
+
+def flip_card(idx):
+    row = df.row(idx); c_lv = sched.levels.get(idx, 0)
+    return {"q": str(row["질문"]), "a": str(row["정답"]), "badge": "🆕 신규" if c_lv == 0 else f"🔥 Lv.{c_lv}"}
+
+# 동기화: 카드 ID로 새 덱과 비교해 추가/삭제/수정분만 반영 (복습 상태 유지)
+def apply_sync(new_df):
+    if new_df is None: return
+    st.session_state.card_ids, diff = sync_deck(df.frame(), st.session_state.card_ids, new_df.frame(), sched, stats)
+    apply_mastered(new_df, st.session_state.card_ids, get_review_store().mastered(review_key(DECK_KEY, sched.name)), sched, stats)  # 반영 실패로 시트 카운터가 뒤처져도 정복 유지
+    sync_index(df.base, new_df.base, diff)
+    if diff.structural: reset_flip()
+    cur = st.session_state.current_index
+    if isinstance(cur, int) and diff.structural:
+        moved = int(diff.index_map[cur]) if cur < len(diff.index_map) else -1
+        if moved >= 0: st.session_state.current_index = moved
+        else: st.session_state.current_index = sched.next(); st.session_state.state = "QUESTION"
+    st.session_state.df = new_df
+    st.session_state.last_msg = f"동기화 완료: 추가 {len(diff.added)} · 삭제 {len(diff.removed)} · 수정 {len(diff.edited)}"
 
 # --- 6. 메인 화면 ---
 if df is not None:
@@ -98,34 +229,44 @@ if df is not None:
     t_col1, t_col2, t_col3 = st.columns([5, 2.5, 2.5])
     with t_col2:
         if st.button("🔄 동기화", key="sync_btn"):
-            st.cache_data.clear(); st.session_state.df = load_data(); st.rerun()
+            queue = get_write_queue(SHEET_URL)
+            if queue is not None: queue.flush()
+            apply_sync(load_data(refresh=True)); st.rerun()
     with t_col3:
-        # [핵심] 오답노트 추출 로직
-        diff_df = df[df['어려움횟수'] > 0].sort_values(by='어려움횟수', ascending=False)
-        if not diff_df.empty:
-            csv_data = diff_df.to_csv(index=False).encode('utf-8-sig')
-            st.download_button(label="📥 오답노트 받기", data=csv_data, file_name='my_wrong_notes.csv', mime='text/csv')
+        # [핵심] 오답노트 추출 로직 (어려움 순위는 증분 유지, CSV는 클릭 시에만 생성)
+        if stats.has_wrong_notes:
+            st.download_button(label="📥 오답노트 받기", data=lambda: stats.wrong_note_csv(df), file_name='my_wrong_notes.csv', mime='text/csv')
         else:
             st.button("📥 오답 없음", disabled=True)
 
     if isinstance(st.session_state.current_index, int) and st.session_state.current_index >= len(df):
         st.session_state.current_index = get_next_question(df)
+    if st.session_state.current_index is None and st.session_state.state != "IDLE" and not st.session_state.client_flip:
+        st.session_state.current_index = get_next_question(df)  # 빠른 넘기기를 끈 직후
 
     _, col, _ = st.columns([1, 10, 1])
     with col:
         st.markdown(f'<p class="feedback-text">{st.session_state.last_msg}</p>', unsafe_allow_html=True)
-        if st.session_state.current_index == "GRADUATED":
+        if st.session_state.current_index == GRADUATED:
             st.markdown('<p class="question-text">🎊 모든 문항 정복 완료! 🎊</p>', unsafe_allow_html=True)
             if st.button("처음부터 다시 시작하기"):
-                st.session_state.q_levels = {}; st.session_state.q_wrong_levels = {}; st.session_state.schedules = {}; st.session_state.solve_count = 0; st.session_state.state = "IDLE"; st.session_state.current_index = None; st.rerun()
+                sched.reset(df['정답횟수']); get_review_store().clear(review_key(DECK_KEY, sched.name)); st.session_state.state = "IDLE"; st.session_state.current_index = None; st.rerun()
+        elif st.session_state.current_index == FOCUS_DONE: search_done_panel()
+        elif st.session_state.current_index == WAITING:
+            # 시간 기반 전략: 지금 복습할 카드가 없음 (다음 복습 시각 안내)
+            st.markdown(f'<p class="question-text">⏳ 오늘 복습 완료 · 다음 복습 {datetime.fromtimestamp(sched.next_due()):%m/%d %H:%M}</p>', unsafe_allow_html=True)
+            if st.button("다시 확인"): start_question(); st.rerun()
         elif st.session_state.state == "IDLE":
             st.markdown('<p class="question-text">인출 시스템</p>', unsafe_allow_html=True)
-            if st.button("훈련 시작 하기 (Space)"):
-                st.session_state.current_index = get_next_question(df); st.session_state.state = "QUESTION"; st.rerun()
+            if st.button("훈련 시작 하기 (Space)"): start_question(); st.rerun()
+        elif st.session_state.client_flip:
+            # 빠른 넘기기: 10문항 묶음을 브라우저에서 풀고 채점은 묶음 단위로 반영
+            idle = flip_session(sched, flip_card, grade_card, GRADE_LABELS)
+            if idle is not None: st.session_state.current_index = idle; st.rerun()
         elif st.session_state.state == "QUESTION":
-            row = df.iloc[st.session_state.current_index]
-            c_lv = st.session_state.q_levels.get(st.session_state.current_index, 0)
-            w_lv = st.session_state.q_wrong_levels.get(st.session_state.current_index, 0)
+            row = df.row(st.session_state.current_index)
+            c_lv = sched.levels.get(st.session_state.current_index, 0)
+            w_lv = sched.wrong_levels.get(st.session_state.current_index, 0)
             label = f'<div style="text-align:center;"><span class="status-badge badge-new">🆕 신규</span></div>' if c_lv == 0 else f'<div style="text-align:center;"><span class="status-badge badge-review">🔥 Lv.{c_lv}</span></div>'
             st.markdown(label, unsafe_allow_html=True)
             w_bars = "█" * min(w_lv, 15); w_empty = "░" * (15 - len(w_bars))
@@ -134,36 +275,20 @@ if df is not None:
             st.markdown(f'<p class="question-text">Q. {row["질문"]}</p>', unsafe_allow_html=True)
             if st.button("정답 확인하기 (Space)"): st.session_state.state = "ANSWER"; st.rerun()
         elif st.session_state.state == "ANSWER":
-            row = df.iloc[st.session_state.current_index]; q_idx = st.session_state.current_index
+            row = df.row(st.session_state.current_index); q_idx = st.session_state.current_index
             st.markdown(f'<p class="answer-text">A. {row["정답"]}</p>', unsafe_allow_html=True)
             c1, c2, c3 = st.columns(3)
-            with c1:
-                if st.button("어려움 (1/Ctrl)"):
-                    st.session_state.q_wrong_levels[q_idx] = st.session_state.q_wrong_levels.get(q_idx, 0) + 1
-                    st.session_state.q_levels[q_idx] = 1; df.at[q_idx, '오답횟수'] += 1; df.at[q_idx, '어려움횟수'] += 1
-                    try: conn.update(spreadsheet=st.secrets["gsheets_url"], data=df)
-                    except: pass
-                    target = st.session_state.solve_count + 5; st.session_state.schedules.setdefault(target, []).append(q_idx)
-                    st.session_state.solve_count += 1; st.session_state.current_index = get_next_question(df); st.session_state.state = "QUESTION"; st.rerun()
-            with c2:
-                if st.button("정상 (2/Alt)"):
-                    new_lv = st.session_state.q_levels.get(q_idx, 0) + 1; df.at[q_idx, '정상횟수'] += 1
-                    if new_lv > 7: df.at[q_idx, '정답횟수'] = 5; del st.session_state.q_levels[q_idx]
-                    else: st.session_state.q_levels[q_idx] = new_lv; st.session_state.schedules.setdefault(st.session_state.solve_count + FIBO_GAP[new_lv], []).append(q_idx)
-                    try: conn.update(spreadsheet=st.secrets["gsheets_url"], data=df)
-                    except: pass
-                    st.session_state.solve_count += 1; st.session_state.current_index = get_next_question(df); st.session_state.state = "QUESTION"; st.rerun()
-            with c3:
-                if st.button("너무 쉬움 (3)"):
-                    df.at[q_idx, '정답횟수'] = 5; df.at[q_idx, '쉬움횟수'] += 1
-                    try: conn.update(spreadsheet=st.secrets["gsheets_url"], data=df)
-                    except: pass
-                    if q_idx in st.session_state.q_levels: del st.session_state.q_levels[q_idx]
-                    st.session_state.solve_count += 1; st.session_state.current_index = get_next_question(df); st.session_state.state = "QUESTION"; st.rerun()
-
-        tot = len(df); m_q = len(df[df['정답횟수'] >= 5]); r_q = len(st.session_state.q_levels); n_q = tot - m_q - r_q
+            for grade, (c, label) in enumerate(zip((c1, c2, c3), GRADE_LABELS)):
+                if c.button(label):
+                    grade_card(q_idx, grade)
+                    st.session_state.current_index = get_next_question(df); st.session_state.state = "QUESTION"; st.rerun()
+
+        tot = stats.total; m_q, r_q, n_q = stats.counts(len(sched.levels))
         st.markdown(f'<div class="progress-container"><div class="bar-mastered" style="width:{(m_q/tot)*100}%"></div><div class="bar-review" style="width:{(r_q/tot)*100}%"></div><div class="bar-new" style="width:{(n_q/tot)*100}%"></div></div>', unsafe_allow_html=True)
         st.markdown(f'<div style="display:flex; justify-content:space-between; padding:5px; font-size:0.8rem;"><p>✅{m_q}</p><p>🔥{r_q}</p><p>🆕{n_q}</p></div>', unsafe_allow_html=True)
 
+if tracer.enabled:
+    with st.sidebar: show_debug_panel(st.session_state.trace_session)
+
 # 7. 단축키 엔진
-components.html("""<script>const doc = window.parent.document;doc.addEventListener('keydown', function(e) {if (e.code === 'Space') { e.preventDefault(); const btn = Array.from(doc.querySelectorAll('button')).find(el => el.innerText.includes('확인') || el.innerText.includes('시작')); if (btn) btn.click(); }else if (e.key === 'Control' || e.key === '1') { const btn = Array.from(doc.querySelectorAll('button')).find(el => el.innerText.includes('어려움')); if (btn) btn.click(); }else if (e.key === 'Alt' || e.key === '2') { e.preventDefault(); const btn = Array.from(doc.querySelectorAll('button')).find(el => el.innerText.includes('정상')); if (btn) btn.click(); }else if (e.key === '3') { const btn = Array.from(doc.querySelectorAll('button')).find(el => el.innerText.includes('쉬움')); if (btn) btn.click(); }});</script>""", height=0)
+components.html("""<script>const doc = window.parent.document;doc.addEventListener('keydown', function(e) {const t = e.target; if (t && (t.tagName === 'INPUT' || t.tagName === 'TEXTAREA' || t.isContentEditable)) return;if (e.code === 'Space') { e.preventDefault(); const btn = Array.from(doc.querySelectorAll('button')).find(el => el.innerText.includes('확인') || el.innerText.includes('시작')); if (btn) btn.click(); }else if (e.key === 'Control' || e.key === '1') { const btn = Array.from(doc.querySelectorAll('button')).find(el => el.innerText.includes('어려움')); if (btn) btn.click(); }else if (e.key === 'Alt' || e.key === '2') { e.preventDefault(); const btn = Array.from(doc.querySelectorAll('button')).find(el => el.innerText.includes('정상')); if (btn) btn.click(); }else if (e.key === '3') { const btn = Array.from(doc.querySelectorAll('button')).find(el => el.innerText.includes('쉬움')); if (btn) btn.click(); }});</script>""", height=0)
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from perf_trace import span
+from write_queue import _resolve_rows
+
+
+def merge_decks(decks):
+    # {시트 이름: DataFrame} -> 하나의 덱 ('시트', '행' 열이 (sheet, row) 키)
+    parts = [d.assign(시트=name, 행=range(len(d))) for name, d in decks.items() if d is not None and not d.empty]
+    if not parts: return None
+    return pd.concat(parts, ignore_index=True)
+
+
+def content_hash(df):
+    h = hashlib.sha1("\x1f".join(map(str, df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()
+
+
+class DeckCache:
+    # 시트별 덱을 디스크(Parquet + meta json)와 메모리에 보관
+    # - get(): 캐시가 있으면 즉시 반환, refresh_interval이 지나면 백그라운드에서 새로 가져옴
+    # - 내용 해시가 바뀐 경우에만 새 DataFrame으로 교체
+    # - refresh(key): 해당 시트만 즉시 다시 가져옴 (동기화 버튼, 실패 시 기존 캐시 유지)
+    # - apply(key, deltas): 시트에 반영된 카운터 증감분을 캐시에도 더함 (새 세션이 옛 카운터를 받지 않도록)
+    # fetch(key)는 DataFrame 또는 실패 시 None을 반환해야 함
+    def __init__(self, fetch, cache_dir=".study_cache/decks", refresh_interval=300):
+        self.fetch = fetch
+        self.cache_dir = cache_dir
+        self.refresh_interval = refresh_interval
+        self._mem = {}  # key -> {'df', 'hash', 'fetched_at'}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, key):
+        name = hashlib.sha1(key.encode()).hexdigest()[:16]
+        base = os.path.join(self.cache_dir, name)
+        return base + ".parquet", base + ".json"
+
+    def _load_disk(self, key):
+        data_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, encoding='utf-8') as f: meta = json.load(f)
+            return {'df': pd.read_parquet(data_path), 'hash': meta['hash'], 'fetched_at': meta['fetched_at']}
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save_disk(self, key, entry):
+        data_path, meta_path = self._paths(key)
+        try:
+            entry['df'].to_parquet(data_path + ".tmp", index=False)
+            os.replace(data_path + ".tmp", data_path)
+            with open(meta_path + ".tmp", 'w', encoding='utf-8') as f:
+                json.dump({'key': key, 'hash': entry['hash'], 'fetched_at': entry['fetched_at']}, f, ensure_ascii=False)
+            os.replace(meta_path + ".tmp", meta_path)
+        except Exception:
+            pass  # 디스크 캐시는 best-effort (혼합 타입 열 등은 메모리에만 보관)
+
+    def _entry(self, key):
+        with self._lock:
+            entry = self._mem.get(key)
+        if entry is None:
+            entry = self._load_disk(key)
+            if entry is not None:
+                with self._lock: entry = self._mem.setdefault(key, entry)
+        return entry
+
+    def get(self, key):
+        entry = self._entry(key)
+        if entry is None: return self.refresh(key)
+        if time.time() - entry['fetched_at'] > self.refresh_interval: self._refresh_async(key)
+        return entry['df']
+
+    def get_many(self, keys, refresh=False, max_workers=8):
+        # 여러 시트를 동시에 가져옴 (전체 시간 = 가장 느린 시트)
+        if not keys: return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as pool:
+            return list(pool.map(self.refresh if refresh else self.get, keys))
+
+    def version(self, key):
+        entry = self._entry(key)
+        return entry['hash'] if entry else None
+
+    def refresh(self, key):
+        with span("deck.fetch"): df = self.fetch(key)
+        entry = self._entry(key)
+        if df is None: return entry['df'] if entry else None
+        h = content_hash(df)
+        if entry is not None and entry['hash'] == h:
+            entry['fetched_at'] = time.time()
+            self._save_meta_only(key, entry)
+            return entry['df']
+        entry = {'df': df, 'hash': h, 'fetched_at': time.time()}
+        with self._lock: self._mem[key] = entry
+        self._save_disk(key, entry)
+        return df
+
+    def apply(self, key, deltas):
+        # deltas: {덱 행 번호 또는 카드 ID: {열: 증감}} (WriteBehindQueue flush 성공분)
+        # 기존 DataFrame은 다른 세션이 공유 중이므로 복사본을 고쳐 교체
+        entry = self._entry(key)
+        if entry is None: return
+        with self._lock:
+            entry = self._mem.get(key, entry)
+            df = entry['df'].copy()
+            changed = False
+            for row, changes in _resolve_rows(df, deltas).items():
+                if row >= len(df): continue
+                for col, d in changes.items():
+                    if col not in df.columns: continue
+                    df.iat[row, df.columns.get_loc(col)] += d; changed = True
+            if not changed: return
+            entry = {'df': df, 'hash': content_hash(df), 'fetched_at': entry['fetched_at']}
+            self._mem[key] = entry
+        self._save_disk(key, entry)
+
+    def _save_meta_only(self, key, entry):
+        _, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump({'key': key, 'hash': entry['hash'], 'fetched_at': entry['fetched_at']}, f, ensure_ascii=False)
+        except OSError:
+            pass
+
+    def _refresh_async(self, key):
+        with self._lock:
+            if key in self._refreshing: return
+            self._refreshing.add(key)
+
+        def run():
+            try: self.refresh(key)
+            finally:
+                with self._lock: self._refreshing.discard(key)
+        threading.Thread(target=run, name="deck-refresh", daemon=True).start()
@@ -0,0 +1,58 @@
+from bisect import bisect_left, insort
+
+import numpy as np
+
+from perf_trace import span
+from scheduler import MASTERED_COUNT
+
+
+class DeckStats:
+    # 진행률(정복/복습/신규)과 어려움 순위를 응답마다 증분 갱신
+    # - 로드 시 한 번만 벡터 연산, 이후 apply()는 변경된 카드만 반영
+    # - 오답노트 CSV는 요청 시 생성하고 version이 바뀔 때까지 재사용
+    def __init__(self, df):
+        self.version = 0
+        self.reset(df)
+
+    def reset(self, df):
+        self.total = len(df)
+        self._correct = df['정답횟수'].to_numpy(dtype=np.int64, copy=True)
+        self.mastered = int((self._correct >= MASTERED_COUNT).sum())
+        hard = df['어려움횟수'].to_numpy(dtype=np.int64) if '어려움횟수' in df.columns else np.zeros(len(df), dtype=np.int64)
+        nz = np.flatnonzero(hard > 0)
+        self._hard = dict(zip(nz.tolist(), hard[nz].tolist()))
+        self._ranking = sorted((-c, i) for i, c in self._hard.items())  # (-어려움횟수, 행) 오름차순
+        self.invalidate()
+
+    def invalidate(self):
+        self.version += 1
+        self._csv = None
+
+    def apply(self, idx, deltas):
+        d = deltas.get('정답횟수', 0)
+        if d:
+            before = int(self._correct[idx]); after = before + d; self._correct[idx] = after
+            self.mastered += (after >= MASTERED_COUNT) - (before >= MASTERED_COUNT)
+        d = deltas.get('어려움횟수', 0)
+        if d:
+            old = self._hard.get(idx, 0)
+            if old: del self._ranking[bisect_left(self._ranking, (-old, idx))]
+            self._hard[idx] = old + d
+            insort(self._ranking, (-(old + d), idx))
+        if idx in self._hard: self.invalidate()  # 오답노트에 포함된 행의 값이 바뀜
+
+    def counts(self, reviewing):
+        # 반환: (정복, 복습, 신규)
+        return self.mastered, reviewing, self.total - self.mastered - reviewing
+
+    @property
+    def has_wrong_notes(self):
+        return bool(self._ranking)
+
+    def ranking(self):
+        return [idx for _, idx in self._ranking]
+
+    def wrong_note_csv(self, df):
+        if self._csv is None:
+            with span("wrong_note_csv"): self._csv = df.take(self.ranking()).to_csv(index=False).encode('utf-8-sig')
+        return self._csv
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+COUNTER_COLUMNS = ['정답횟수', '오답횟수', '어려움횟수', '정상횟수', '쉬움횟수']
+
+
+def compact_deck(df):
+    # 프로세스 공용 덱용 압축: 카운터/행 번호는 int32, 반복 많은 텍스트는 category, 나머지 텍스트는 string
+    if df is None: return None
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if col in COUNTER_COLUMNS or col == '행': s = pd.to_numeric(s).fillna(0).astype(np.int32)
+        elif s.dtype == object or pd.api.types.is_string_dtype(s):
+            s = s.astype('category') if s.nunique(dropna=True) * 2 <= len(s) else s.astype('string')
+        out[col] = s.reset_index(drop=True)
+    return pd.DataFrame(out)
+
+
+class DeckView:
+    # 읽기 전용 공유 덱 + 세션별 카운터 증감분 overlay
+    # - 공유 덱(base)은 st.cache_resource의 덱 캐시가 보관, 세션은 복사하지 않음
+    # - 세션 메모리는 응답한 카드 수에 비례 ({행: {열: 증감}})
+    def __init__(self, base):
+        self.base = base
+        self._delta = {}
+
+    def __len__(self):
+        return len(self.base)
+
+    def __contains__(self, col):
+        return col in self.base.columns
+
+    @property
+    def columns(self):
+        return self.base.columns
+
+    @property
+    def empty(self):
+        return self.base.empty
+
+    @property
+    def answered(self):
+        return len(self._delta)
+
+    def add(self, idx, deltas):
+        deltas = {col: int(d) for col, d in deltas.items() if d and col in self.base.columns}
+        if not deltas: return
+        cur = self._delta.setdefault(int(idx), {})
+        for col, d in deltas.items(): cur[col] = cur.get(col, 0) + d
+
+    def value(self, idx, col):
+        v = self.base[col].iat[idx]
+        d = self._delta.get(idx, {}).get(col)
+        return v if d is None else int(v) + d
+
+    def __getitem__(self, col):
+        # 열 전체 (증감분 반영, overlay가 없는 열은 공유 덱의 Series 그대로)
+        s = self.base[col]
+        rows = [(i, ch[col]) for i, ch in self._delta.items() if col in ch]
+        if not rows: return s
+        values = s.to_numpy(dtype=np.int64, copy=True)
+        idx, d = zip(*rows)
+        values[list(idx)] += d
+        return pd.Series(values, index=s.index, name=col)
+
+    def _apply(self, frame, positions):
+        # positions: {덱 행: frame 안의 위치}
+        for idx, pos in positions.items():
+            for col, d in self._delta[idx].items():
+                loc = frame.columns.get_loc(col)
+                frame.iat[pos, loc] = int(frame.iat[pos, loc]) + d
+        return frame
+
+    def row(self, idx):
+        return self.take([idx]).iloc[0]
+
+    def take(self, rows):
+        # 일부 행만 복사해 증감분 반영 (오답노트 CSV 등)
+        rows = [int(i) for i in rows]
+        frame = self.base.take(rows).reset_index(drop=True)
+        return self._apply(frame, {idx: pos for pos, idx in enumerate(rows) if idx in self._delta})
+
+    def carry(self, old, index_map):
+        # 동기화로 새 덱에 옮길 때 이전 view의 증감분을 그대로 이어 붙임 (시트에 반영하지 않는 세션)
+        # index_map[이전 행] = 새 행 (-1: 삭제된 카드)
+        for idx, changes in old._delta.items():
+            moved = int(index_map[idx]) if idx < len(index_map) else -1
+            if moved >= 0: self.add(moved, changes)
+
+    def frame(self):
+        # 전체 덱 복사본 (동기화 비교 등 일시적으로만 사용)
+        return self._apply(self.base.copy(), {idx: idx for idx in self._delta})
@@ -0,0 +1,275 @@
+import csv
+import io
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from card_identity import COUNTER_COLUMNS, card_id
+
+CHUNK_ROWS = 5000
+DOWNLOAD_LIMIT = 100 * 2**20  # download_button으로 메모리에 올려 보낼 최대 크기
+DECK_COLUMNS = ['질문', '정답'] + COUNTER_COLUMNS + ['이미지', 'ID']
+HISTORY_COLUMNS = ['ID', '질문', '시각', '등급', '레벨', '오답레벨', '복습예정']
+
+
+# --- 내보내기 원본: DataFrame 조각 generator ---
+def _local_times(ts):
+    # 유닉스 초 -> 현재 시간대 기준 시각 (초 단위, 없으면 NaT)
+    t = pd.to_datetime(np.asarray(ts, dtype=np.float64), unit="s", utc=True).floor("s")
+    return t.tz_convert(datetime.now().astimezone().tzinfo).tz_localize(None).as_unit("s")
+
+
+def deck_frames(deck, ids, states=None, chunk_rows=CHUNK_ROWS):
+    # 덱(DeckView 또는 DataFrame)을 chunk_rows행씩: 카드 ID + 덱 열 (+ 복습 상태)
+    # states: ReviewStore.load()의 {card: (level, wrong_level, due_slot, extra, due_at, mastered)}
+    for start in range(0, len(deck), chunk_rows):
+        rows = range(start, min(start + chunk_rows, len(deck)))
+        frame = deck.take(rows).reset_index(drop=True)
+        frame = frame[[c for c in frame.columns if c != 'ID']]
+        chunk_ids = ids[start:rows.stop]
+        frame.insert(0, 'ID', chunk_ids)
+        if states is not None:
+            got = [states.get(c) for c in chunk_ids]
+            frame['레벨'] = [s[0] if s else 0 for s in got]
+            frame['오답레벨'] = [s[1] if s else 0 for s in got]
+            frame['복습예정'] = _local_times([s[4] if s and s[4] is not None else np.nan for s in got])
+        yield frame
+
+
+def history_frames(store, deck_key, deck=None, ids=None, chunk_rows=50000):
+    # 복습 기록(ReviewStore.review_log)을 chunk_rows행씩, deck/ids를 주면 질문도 붙임
+    questions = dict(zip(ids, deck['질문'].astype(str))) if deck is not None and ids is not None else {}
+    for rows in store.iter_log(deck_key, chunk_rows):
+        card, ts, grade, level, wrong, due_at = zip(*rows)
+        yield pd.DataFrame({'ID': card, '질문': [questions.get(c) for c in card], '시각': _local_times(ts), '등급': grade,
+                            '레벨': level, '오답레벨': wrong, '복습예정': _local_times([np.nan if t is None else t for t in due_at])},
+                           columns=HISTORY_COLUMNS)
+
+
+# --- 형식별 바이트 조각 generator ---
+def csv_chunks(frames):
+    # 첫 조각에만 BOM + 머리글 (엑셀에서 한글이 깨지지 않게)
+    first = True
+    for frame in frames:
+        text = frame.to_csv(index=False, header=first, lineterminator="\n")
+        yield (("\ufeff" + text) if first else text).encode("utf-8")
+        first = False
+
+
+class _ChunkSink:
+    # ParquetWriter가 쓰는 파일 객체: 쓴 바이트를 모아 두었다가 조각마다 내보냄
+    def __init__(self):
+        self._parts, self._pos, self.closed = [], 0, False
+
+    def write(self, data):
+        data = bytes(data); self._parts.append(data); self._pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._pos
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        out = b"".join(self._parts); self._parts = []
+        return out
+
+
+def _arrow_schema(table):
+    # 첫 조각 기준 스키마: category(dictionary)는 값 타입으로, 전부 비어 있는 열은 문자열로 (조각마다 같은 스키마)
+    def plain(t):
+        if pa.types.is_dictionary(t): return plain(t.value_type)
+        if pa.types.is_null(t) or pa.types.is_large_string(t): return pa.string()
+        return t
+    return pa.schema([pa.field(f.name, plain(f.type)) for f in table.schema])
+
+
+def parquet_chunks(frames, compression="zstd"):
+    # 조각 하나 = row group 하나, 쓴 만큼 바로 내보냄 (파일 전체를 메모리에 두지 않음)
+    sink, writer, schema = _ChunkSink(), None, None
+    for frame in frames:
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if writer is None:
+            schema = _arrow_schema(table)
+            writer = pq.ParquetWriter(sink, schema, compression=compression)
+        writer.write_table(table.cast(schema))
+        yield sink.drain()
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
+
+
+def anki_chunks(frames):
+    # Anki "텍스트 파일 가져오기" 형식: 파일 머리 지시어 + 탭 구분 (앞면, 뒷면, 태그)
+    # 태그: 시트 이름(병합 덱) + 복습 레벨 (예: 민법_총칙 lv::3)
+    yield "#separator:tab\n#html:false\n#columns:앞면\t뒷면\t태그\n#tags column:3\n".encode("utf-8")
+    for frame in frames:
+        tags = [""] * len(frame)
+        if '시트' in frame.columns: tags = [str(s).replace(" ", "_") for s in frame['시트']]
+        if '레벨' in frame.columns: tags = [f"{t} lv::{lv}".strip() for t, lv in zip(tags, frame['레벨'])]
+        buf = io.StringIO()
+        csv.writer(buf, delimiter="\t", lineterminator="\n").writerows(zip(frame['질문'].astype(str), frame['정답'].astype(str), tags))
+        yield buf.getvalue().encode("utf-8")
+
+
+# 형식 이름 -> (표시 이름, 확장자, MIME, 조각 generator)
+EXPORT_FORMATS = {
+    "csv": ("CSV", ".csv", "text/csv", csv_chunks),
+    "parquet": ("Parquet", ".parquet", "application/vnd.apache.parquet", parquet_chunks),
+    "anki": ("Anki (텍스트)", ".txt", "text/plain", anki_chunks),
+}
+
+
+def write_chunks(chunks, path):
+    # 조각을 임시 파일에 이어 쓰고 완료되면 교체 (반환: 바이트 수, 여러 세션이 같은 파일을 만들어도 섞이지 않게)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    size, tmp = 0, f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            for part in chunks: f.write(part); size += len(part)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp): os.remove(tmp)
+    return size
+
+
+# --- 가져오기 ---
+def read_chunks(source, chunk_rows=CHUNK_ROWS, sheet_name=None):
+    # 큰 xlsx/CSV를 chunk_rows행씩 DataFrame으로 (모든 값은 문자열/None 그대로, 검증은 CardImporter)
+    # xlsx는 openpyxl read-only 모드로 행을 흘려 읽음 (시트 전체를 메모리에 올리지 않음)
+    name = str(getattr(source, "name", source)).lower()
+    if name.endswith(".csv"):
+        yield from pd.read_csv(source, chunksize=chunk_rows, dtype=str, keep_default_na=False, na_values=[""], encoding="utf-8-sig")
+        return
+    if not name.endswith(".xlsx"): raise ValueError(f"가져올 수 없는 파일 형식: {name} (.xlsx, .csv)")
+    import openpyxl
+    wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None: return
+        header = [f"열{i + 1}" if h is None else str(h).strip() for i, h in enumerate(header)]
+        batch = []
+        for row in rows:
+            batch.append(row[:len(header)])
+            if len(batch) >= chunk_rows: yield pd.DataFrame(batch, columns=header); batch = []
+        if batch: yield pd.DataFrame(batch, columns=header)
+    finally:
+        wb.close()
+
+
+class CardImporter:
+    # 큰 파일에서 새 카드만 골라냄: 조각 단위로 읽어 검증 + 기존 카드/파일 안 중복 제거
+    # - 필수: 질문/정답 (비어 있으면 오류), 카운터 열은 숫자만 (빈 칸은 0)
+    # - 카드 ID는 card_ids()와 같은 규칙 (ID 열, 없으면 질문+정답 해시)
+    def __init__(self, existing_ids=(), chunk_rows=CHUNK_ROWS, max_errors=20):
+        self._seen = set(existing_ids)
+        self.chunk_rows, self.max_errors = chunk_rows, max_errors
+        self.read = self.added = self.duplicate = self.invalid = 0
+        self.errors = []  # (파일 행 번호, 사유), 처음 max_errors개만
+
+    def _error(self, line, reason):
+        self.invalid += 1
+        if len(self.errors) < self.max_errors: self.errors.append((line, reason))
+
+    def chunks(self, source, sheet_name=None):
+        line = 2  # 머리글 다음 행부터 (엑셀/CSV 행 번호)
+        for raw in read_chunks(source, self.chunk_rows, sheet_name):
+            raw.columns = [str(c).strip() for c in raw.columns]
+            missing = [c for c in ('질문', '정답') if c not in raw.columns]
+            if missing: raise ValueError(f"필수 열이 없습니다: {', '.join(missing)}")
+            lines = np.arange(line, line + len(raw)); line += len(raw)
+            frame = raw[[c for c in DECK_COLUMNS if c in raw.columns]].copy()
+            text = frame.apply(lambda s: s.astype("string").str.strip())
+            blank = (text.isna() | (text == "")).all(axis=1).to_numpy()  # 빈 행은 조용히 건너뜀
+            bad = np.full(len(frame), "", dtype=object)
+            for col in ('질문', '정답'):
+                empty = (text[col].isna() | (text[col] == "")).to_numpy()
+                bad[(bad == "") & empty] = f"{col} 없음"
+                frame[col] = text[col]
+            for col in [c for c in COUNTER_COLUMNS if c in frame.columns]:
+                num = pd.to_numeric(text[col], errors="coerce")
+                wrong = (num.isna() & text[col].notna() & (text[col] != "")).to_numpy()
+                bad[(bad == "") & wrong] = f"{col} 숫자 아님"
+                frame[col] = num.fillna(0).astype(int)
+            keep = np.zeros(len(frame), dtype=bool)
+            ids = text['ID'] if 'ID' in text.columns else pd.Series(pd.NA, index=text.index)
+            for i, (q, a, given) in enumerate(zip(frame['질문'], frame['정답'], ids)):
+                if blank[i]: continue
+                self.read += 1
+                if bad[i]: self._error(int(lines[i]), bad[i]); continue
+                cid = given if isinstance(given, str) and given else card_id(q, a)
+                if cid in self._seen: self.duplicate += 1; continue
+                self._seen.add(cid); keep[i] = True
+            if keep.any():
+                out = frame[keep].reset_index(drop=True)
+                for col in COUNTER_COLUMNS:
+                    if col not in out.columns: out[col] = 0
+                self.added += len(out)
+                yield out[[c for c in DECK_COLUMNS if c in out.columns]]
+
+    def to_file(self, source, path, fmt="parquet", sheet_name=None):
+        # 새 카드를 조각 단위로 파일에 씀 (반환: 바이트 수)
+        return write_chunks(EXPORT_FORMATS[fmt][3](self.chunks(source, sheet_name)), path)
+
+    def summary(self):
+        return f"읽음 {self.read} · 새 카드 {self.added} · 중복 {self.duplicate} · 오류 {self.invalid}"
+
+
+def _read(path):
+    with open(path, "rb") as f: return f.read()
+
+
+def _offer(path, label, file_name, mime, key):
+    # 디스크에 만든 파일을 내려받기로 제공: download_button은 파일 전체를 메모리에 올리므로 DOWNLOAD_LIMIT까지만
+    # (읽기는 버튼을 누를 때만, 한도를 넘으면 서버에 저장된 경로만 안내)
+    import streamlit as st
+    if not path or not os.path.exists(path): return
+    size = os.path.getsize(path)
+    if size <= DOWNLOAD_LIMIT:
+        st.download_button(f"{label} 받기", key=key, file_name=file_name, mime=mime, data=lambda: _read(path))
+    else:
+        st.caption(f"{label}: {size / 2**20:,.0f}MB로 내려받기 한도({DOWNLOAD_LIMIT // 2**20}MB)를 넘어 서버에만 저장됨 · {path}")
+
+
+def transfer_panel(deck, ids, store, deck_key, name, key="transfer", out_dir=".study_cache/exports"):
+    # 사이드바 내보내기/가져오기: 파일은 조각 단위로 디스크에 쓴 뒤 내려받기 (만들기를 누를 때만 생성)
+    # 가져오기: xlsx/CSV를 검증 + 중복 제거해 새 카드만 파일로 (시트에 붙여 넣거나 offline_deck으로 사용)
+    import streamlit as st
+    ss = st.session_state
+    stem = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(name)) or "deck"
+    with st.expander("📦 내보내기 · 가져오기", expanded=False):
+        fmt = st.selectbox("형식", list(EXPORT_FORMATS), format_func=lambda f: EXPORT_FORMATS[f][0], key=key + "_fmt")
+        label, ext, mime, chunks = EXPORT_FORMATS[fmt]
+        n_log = store.log_count(deck_key) if fmt != "anki" else 0
+        exports = [("deck", "덱 + 복습 상태", f"{stem}{ext}", lambda: deck_frames(deck, ids, store.load(deck_key)[1]))]
+        if n_log: exports.append(("log", f"복습 기록 ({n_log:,}건)", f"{stem}_기록{ext}", lambda: history_frames(store, deck_key, deck, ids)))
+        for suffix, title, file_name, frames in exports:
+            path = os.path.join(out_dir, f"{stem}_{suffix}{ext}")
+            if st.button(f"{title} 만들기", key=f"{key}_{suffix}_make"):
+                write_chunks(chunks(frames()), path); ss[f"{key}_{suffix}_file"] = (fmt, path)
+            made = ss.get(f"{key}_{suffix}_file")
+            if made and made[0] == fmt: _offer(made[1], title, file_name, mime, f"{key}_{suffix}")
+        upload = st.file_uploader("카드 가져오기 (xlsx/CSV)", type=["xlsx", "csv"], key=key + "_upload")
+        if upload is not None and st.button("검증 · 중복 검사", key=key + "_import"):
+            importer = CardImporter(ids)
+            path = os.path.join(out_dir, f"{stem}_새카드.csv")
+            try: importer.to_file(upload, path, fmt="csv")
+            except ValueError as e: st.error(str(e)); return
+            ss[key + "_result"] = (importer.summary(), importer.errors, path if importer.added else None)
+        result = ss.get(key + "_result")
+        if result:
+            summary, errors, path = result
+            st.caption(summary)
+            for line, reason in errors: st.caption(f"· {line}행: {reason}")
+            _offer(path, "새 카드 (CSV)", f"{stem}_새카드.csv", "text/csv", key + "_new")
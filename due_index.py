@@ -0,0 +1,110 @@
+import time
+from bisect import bisect_right, insort
+
+import numpy as np
+
+DAY = 86400
+
+
+def day_start(now):
+    # now가 속한 날의 로컬 자정 (유닉스 시각)
+    t = time.localtime(now)
+    return now - (t.tm_hour * 3600 + t.tm_min * 60 + t.tm_sec) - (now % 1)
+
+
+class DueIndex:
+    # 카드별 복습 예정 시각(due_at) 정렬 인덱스
+    # - 로드 시 한 번 정렬한 배열 + 이후 응답으로 바뀐 카드의 작은 정렬 overlay(추가/제거 시각)
+    # - count_until(t): 정렬 배열과 overlay 각각 이분 탐색 -> O(log n)
+    # - overlay가 커지면 한 번에 다시 정렬
+    def __init__(self, due_at, n_cards=0):
+        # due_at: {카드 행: 예정 시각}
+        self._build(due_at, n_cards)
+
+    def _build(self, due_at, n_cards):
+        n_cards = max(n_cards, max(due_at, default=-1) + 1)
+        cards = np.fromiter(due_at.keys(), dtype=np.int64, count=len(due_at))
+        times = np.fromiter(due_at.values(), dtype=np.float64, count=len(due_at))
+        order = np.argsort(times, kind="stable")
+        self._cards, self._times = cards[order], times[order]
+        self._pos = np.full(n_cards, -1, dtype=np.int64)  # 카드 행 -> 정렬 배열 위치
+        self._pos[self._cards] = np.arange(len(order))
+        self._live = np.ones(len(order), dtype=bool)
+        self._added = []  # 정렬 배열 밖에서 새로 잡힌 시각
+        self._removed = []  # 정렬 배열에서 빠진(바뀐) 카드의 원래 시각
+        self._moved = {}  # 카드 행 -> 현재 시각 (None: 예정 없음)
+
+    def __len__(self):
+        return int(self._live.sum()) + len(self._added) if self._moved else len(self._times)
+
+    def get(self, idx):
+        if idx in self._moved: return self._moved[idx]
+        pos = self._pos[idx] if idx < len(self._pos) else -1
+        return float(self._times[pos]) if pos >= 0 else None
+
+    def update(self, idx, t):
+        # 카드 하나의 예정 시각 변경 (t=None: 정복 등으로 예정 없음)
+        if idx in self._moved:
+            old = self._moved[idx]
+            if old is not None: del self._added[bisect_right(self._added, old) - 1]
+        else:
+            pos = self._pos[idx] if idx < len(self._pos) else -1
+            if pos >= 0: self._live[pos] = False; insort(self._removed, self._times[pos])
+        self._moved[idx] = t
+        if t is not None: insort(self._added, t)
+        if len(self._moved) > max(1024, len(self._times) // 8): self._compact()
+
+    def _compact(self):
+        self._build(self.due_map(), len(self._pos))
+
+    def due_map(self):
+        out = dict(zip(self._cards[self._live].tolist(), self._times[self._live].tolist()))
+        out.update((i, t) for i, t in self._moved.items() if t is not None)
+        return out
+
+    def count_until(self, t):
+        # 예정 시각이 t 이하인 카드 수
+        return int(np.searchsorted(self._times, t, side="right")) - bisect_right(self._removed, t) + bisect_right(self._added, t)
+
+    def count_between(self, start, end):
+        return self.count_until(end) - self.count_until(start)
+
+    def next_time(self):
+        # 가장 이른 예정 시각 (없으면 None)
+        live = self._times[self._live] if self._moved else self._times
+        first = [float(live[0])] if len(live) else []
+        if self._added: first.append(self._added[0])
+        return min(first) if first else None
+
+    def times(self):
+        # 현재 예정 시각 전체 (NumPy 배열, 정렬 안 됨)
+        if not self._moved: return self._times
+        return np.concatenate([self._times[self._live], np.asarray(self._added, dtype=np.float64)])
+
+    def summary(self, now=None):
+        # (지금 복습할 카드, 오늘 안에, 7일 안에)
+        now = time.time() if now is None else now
+        today = day_start(now)
+        return self.count_until(now), self.count_until(today + DAY), self.count_until(today + 7 * DAY)
+
+    def forecast(self, now=None, days=14):
+        # 앞으로 days일 동안 날짜별 복습 예정 카드 수 (0번째 날에 밀린 카드 포함)
+        now = time.time() if now is None else now
+        day = np.floor((self.times() - day_start(now)) / DAY).astype(np.int64)
+        day = np.maximum(day[day < days], 0)
+        return np.bincount(day, minlength=days)
+
+
+def show_forecast(index, now=None):
+    # 사이드바 복습 예보: 지금/오늘/이번 주 예정 수 + 날짜별 막대그래프
+    import pandas as pd
+    import streamlit as st
+    if index is None or not len(index): return
+    now = time.time() if now is None else now
+    due_now, today, week = index.summary(now)
+    with st.expander("📅 복습 예보", expanded=False):
+        c1, c2, c3 = st.columns(3)
+        c1.metric("지금", due_now); c2.metric("오늘", today); c3.metric("7일", week)
+        counts = index.forecast(now)
+        labels = [time.strftime("%m/%d", time.localtime(day_start(now) + d * DAY)) for d in range(len(counts))]
+        st.bar_chart(pd.DataFrame({"복습 예정": counts}, index=labels))
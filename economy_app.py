@@ -1,7 +1,19 @@
 import streamlit as st
 from streamlit_gsheets import GSheetsConnection
 import pandas as pd
-import random
+import os
+import uuid
+from deck_cache import DeckCache
+from deck_store import compact_deck
+from local_deck import load_local_deck, local_version
+from perf_trace import show_debug_panel, timed, tracer
+from due_index import show_forecast
+from deck_transfer import transfer_panel
+from flip_deck import flip_session, reset_flip
+from search_index import search_done_panel, search_panel
+from review_store import ReviewStore
+from card_identity import card_ids
+from scheduler import DEFAULT_STRATEGY, FOCUS_DONE, GRADUATED, STRATEGIES, WAITING, make_scheduler, time_based
 
 # 1. 페이지 설정
 st.set_page_config(page_title="경제학 인출 훈련기", layout="wide")
@@ -13,6 +25,17 @@ if 'state' not in st.session_state:
     st.session_state.state = "IDLE"
 if 'current_index' not in st.session_state:
     st.session_state.current_index = None
+if 'scheduler' not in st.session_state:
+    st.session_state.scheduler = None
+
+# 성능 측정: secrets의 debug_timing = true (또는 STUDY_TRACE=1)일 때만 켜짐
+@st.cache_resource
+def setup_tracing():
+    tracer.configure(st.secrets.get("debug_timing", False) or os.environ.get("STUDY_TRACE") == "1", st.secrets.get("trace_path", ".study_cache/trace.jsonl"))
+    return tracer
+if 'trace_session' not in st.session_state:
+    st.session_state.trace_session = uuid.uuid4().hex[:8]
+setup_tracing().begin_run(st.session_state.trace_session)
 
 # 3. 디자인 설정 (디자인은 그대로 유지)
 st.markdown("""
@@ -28,35 +51,152 @@ st.markdown("""
 # 4. 데이터 로드 로직 (강화된 버전)
 conn = st.connection("gsheets", type=GSheetsConnection)
 
-@st.cache_data(ttl=1) # 문제를 고치기 위해 TTL을 1초로 줄여 즉시 반영되게 합니다.
-def load_data():
+# 오프라인 모드: offline_deck(로컬 xlsx/CSV/Parquet)이 있으면 시트 대신 사용 (네트워크 없이 시작)
+OFFLINE_DECK = st.secrets.get("offline_deck") or os.environ.get("STUDY_OFFLINE_DECK")
+
+def to_deck(df):
+    if df is not None and not df.empty:
+        df = df.iloc[:, :2] # 첫 2개 컬럼만 선택
+        df.columns = ['질문', '정답']
+        return compact_deck(df)
+    return None
+
+def fetch_deck(url):
+    try:
+        # 시트를 읽어온 뒤 데이터가 있는지 확인 (실패 시 None -> 기존 캐시 유지)
+        return to_deck(conn.read(spreadsheet=url, worksheet=0, ttl=0))
+    except Exception as e:
+        return None
+
+# 디스크 덱 캐시: 즉시 반환 + 주기적 백그라운드 갱신 (TTL 1초 재요청 대체)
+@st.cache_resource
+def get_deck_cache():
+    return DeckCache(fetch_deck, cache_dir=".study_cache/decks/economy", refresh_interval=st.secrets.get("deck_refresh_sec", 300))
+
+# 로컬 덱은 파일 버전마다 프로세스에 하나 (memory-map Feather)
+@st.cache_resource(max_entries=4)
+def shared_local_deck(path, version):
+    return load_local_deck(path, to_deck, cache_dir=".study_cache/local/economy")
+
+@timed("load_data")
+def load_data(refresh=False):
     try:
+        if OFFLINE_DECK:
+            df = shared_local_deck(OFFLINE_DECK, local_version(OFFLINE_DECK))
+            return df if df is not None else pd.DataFrame(columns=['질문', '정답'])
         url = st.secrets["gsheets_url"].strip()
-        # 시트를 읽어온 뒤 데이터가 있는지 확인
-        df = conn.read(spreadsheet=url, worksheet=0) 
-        if df is not None and not df.empty:
-            df = df.iloc[:, :2] # 첫 2개 컬럼만 선택
-            df.columns = ['질문', '정답']
-            return df
-        return pd.DataFrame(columns=['질문', '정답'])
+        cache = get_deck_cache()
+        df = cache.refresh(url) if refresh else cache.get(url)
+        return df if df is not None else pd.DataFrame(columns=['질문', '정답'])
     except Exception as e:
         return pd.DataFrame(columns=['질문', '정답'])
 
 df = load_data()
 
+# 출제 엔진: 덱별로 고른 전략(기본 피보나치 간격)으로 출제하고 맞음/틀림을 복습 상태에 반영
+# 복습 상태는 카드 ID 기준으로 SQLite에 보관 (전략별로 따로, 피보나치는 덱 키 그대로)
+DECK_KEY = f"local:{os.path.abspath(OFFLINE_DECK)}" if OFFLINE_DECK else st.secrets.get("gsheets_url", "").strip()
+
+@st.cache_resource
+def get_review_store():
+    return ReviewStore()
+
+def get_strategy(deck):
+    return get_review_store().strategy(deck) or st.secrets.get("scheduler", DEFAULT_STRATEGY)
+
+def review_key(deck, strategy):
+    return deck if strategy == DEFAULT_STRATEGY else f"{deck}#{strategy}"
+
+def new_scheduler(dataframe):
+    # 시트에 정답 카운터가 없으므로 정복 여부는 ReviewStore에서 복원, 시간 기반 전략(SM-2)은 예정 시각 전의 카드를 앞당겨 내지 않음 (WAITING)
+    strategy = get_strategy(DECK_KEY)
+    s = make_scheduler(strategy, [0] * len(dataframe), serve_future=not time_based(strategy)); st.session_state.card_ids = card_ids(dataframe)
+    pos = {c: i for i, c in enumerate(st.session_state.card_ids)}
+    solve_count, states = get_review_store().load(review_key(DECK_KEY, s.name))
+    s.restore(solve_count, {pos[c]: v for c, v in states.items() if c in pos})
+    return s
+
+# 공유 덱이 바뀌면(백그라운드 갱신) 저장된 상태에서 스케줄러를 다시 구성
+# 보던 카드는 카드 ID로 새 덱에서 다시 찾음 (행 위치는 시트가 바뀌면 다른 카드일 수 있음), 없으면 다음 문항으로
+if not df.empty and (st.session_state.scheduler is None or st.session_state.get('deck_obj') is not df):
+    old_ids, cur = st.session_state.get('card_ids'), st.session_state.current_index
+    st.session_state.scheduler = new_scheduler(df); st.session_state.deck_obj = df
+    if isinstance(cur, int):
+        moved = {c: i for i, c in enumerate(st.session_state.card_ids)}.get(old_ids[cur]) if old_ids is not None and cur < len(old_ids) else None
+        if moved is not None: st.session_state.current_index = moved
+        elif st.session_state.state != "IDLE": st.session_state.current_index = st.session_state.scheduler.next(); st.session_state.state = "QUESTION"
+        else: st.session_state.current_index = None
+sched = st.session_state.scheduler
+
+@timed("next_question")
+def get_next_question(dataframe):
+    return sched.next()
+
+def start_question():
+    # 빠른 넘기기는 flip_session이 묶음을 직접 뽑으므로 미리 꺼내지 않음 (꺼낸 복습 카드는 예약 슬롯을 잃음)
+    st.session_state.current_index = None if st.session_state.client_flip else get_next_question(df)
+    st.session_state.state = "QUESTION"
+
+def record_answer(q_idx, grade):
+    lv, wl, due, extra, due_at = sched.card_state(q_idx)
+    get_review_store().record(review_key(DECK_KEY, sched.name), st.session_state.card_ids[q_idx], lv, wl, due, sched.solve_count, extra, due_at, grade, sched.is_mastered(q_idx))
+
+GRADE_LABELS = ["틀림 (X)", "맞음 (O)"]
+
+def grade_card(q_idx, grade):
+    # 0 틀림 / 1 맞음 (버튼과 빠른 넘기기 공용)
+    if grade == 0: sched.answer_hard(q_idx)
+    else: sched.answer_normal(q_idx)
+    record_answer(q_idx, grade)
+
+def flip_card(idx):
+    row = df.iloc[idx]
+    return {"q": str(row["질문"]), "a": str(row["정답"]), "badge": "지금 바로 떠올려보세요!"}
+
+if sched is not None:
+    with st.sidebar:
+        strategies = list(STRATEGIES)
+        picked_strategy = st.selectbox("출제 방식", strategies, index=strategies.index(sched.name), format_func=lambda n: STRATEGIES[n].label)
+        if picked_strategy != sched.name:
+            get_review_store().set_strategy(DECK_KEY, picked_strategy)
+            st.session_state.scheduler = None; st.session_state.state = "IDLE"; st.session_state.current_index = None; st.rerun()
+        st.toggle("⚡ 빠른 넘기기", value=st.secrets.get("client_flip", True), key="client_flip", help="정답 확인/채점을 브라우저에서 처리하고 10문항마다 한 번에 저장")
+        if search_panel(df, sched) and st.session_state.state != "IDLE":
+            st.session_state.current_index = None if st.session_state.client_flip else sched.next(); st.session_state.state = "QUESTION"; reset_flip()
+        show_forecast(sched.due_index)
+        transfer_panel(df, st.session_state.card_ids, get_review_store(), review_key(DECK_KEY, sched.name), "경제")
+
 # --- 5. 화면 구성 (ValueError 방지 핵심 로직) ---
 if not df.empty: # 데이터가 1개 이상 있을 때만 시작
     for _ in range(4): st.write("")
     _, col2, _ = st.columns([1, 10, 1])
 
     with col2:
-        if st.session_state.state == "IDLE":
+        if st.session_state.current_index is None and st.session_state.state != "IDLE" and not st.session_state.client_flip:
+            st.session_state.current_index = get_next_question(df)  # 빠른 넘기기를 끈 직후
+
+        if st.session_state.current_index == FOCUS_DONE:
+            search_done_panel()
+
+        elif st.session_state.current_index in (GRADUATED, WAITING):
+            done = st.session_state.current_index == GRADUATED
+            st.markdown(f'<p class="question-text">{"🎊 모든 문항 정복! 🎊" if done else "⏳ 지금 복습할 문항이 없습니다"}</p>', unsafe_allow_html=True)
+            if st.button("처음부터 다시 시작" if done else "다시 확인"):
+                if done: sched.reset([0] * len(df)); get_review_store().clear(review_key(DECK_KEY, sched.name))
+                start_question()
+                st.rerun()
+
+        elif st.session_state.state == "IDLE":
             st.markdown('<p class="question-text">준비되셨나요, 굿잡님?<br>인출 훈련 시작!</p>', unsafe_allow_html=True)
             if st.button("훈련 시작 하기", type="primary"):
-                st.session_state.current_index = random.randint(0, len(df)-1)
-                st.session_state.state = "QUESTION"
+                start_question()
                 st.rerun()
 
+        elif st.session_state.client_flip:
+            # 빠른 넘기기: 10문항 묶음을 브라우저에서 풀고 채점(1 틀림 / 2 맞음)은 묶음 단위로 반영
+            idle = flip_session(sched, flip_card, grade_card, GRADE_LABELS)
+            if idle is not None: st.session_state.current_index = idle; st.rerun()
+
         elif st.session_state.state == "QUESTION":
             row = df.iloc[st.session_state.current_index]
             st.markdown('<p class="info-text">지금 바로 떠올려보세요!</p>', unsafe_allow_html=True)
@@ -71,15 +211,21 @@ if not df.empty: # 데이터가 1개 이상 있을 때만 시작
             c1, c2 = st.columns(2)
             with (c1, c2):
                 if c1.button("맞음 (O)", type="primary"):
-                    st.session_state.current_index = random.randint(0, len(df)-1)
+                    grade_card(st.session_state.current_index, 1)
+                    st.session_state.current_index = get_next_question(df)
                     st.session_state.state = "QUESTION"
                     st.rerun()
                 if c2.button("틀림 (X)"):
-                    st.session_state.current_index = random.randint(0, len(df)-1)
+                    grade_card(st.session_state.current_index, 0)
+                    st.session_state.current_index = get_next_question(df)
                     st.session_state.state = "QUESTION"
                     st.rerun()
 else:
     st.error("❗ 구글 시트에서 데이터를 불러오지 못했습니다. 시트 내용을 다시 확인해 주세요.")
     if st.button("데이터 다시 불러오기"):
-        st.cache_data.clear() # 캐시 강제 삭제
+        load_data(refresh=True) # 현재 시트만 강제 갱신
         st.rerun()
+
+if tracer.enabled:
+    with st.sidebar:
+        show_debug_panel(st.session_state.trace_session)
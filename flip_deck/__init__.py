@@ -0,0 +1,52 @@
+import os
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from scheduler import FOCUS_DONE, GRADUATED, WAITING
+
+# 브라우저 쪽 카드 넘기기: 정답 확인/채점마다 서버 rerun 없이 묶음 단위로만 왕복
+_component = components.declare_component("flip_deck", path=os.path.join(os.path.dirname(__file__), "frontend"))
+
+BATCH_SIZE = 10
+
+
+def next_batch(sched, k=BATCH_SIZE):
+    # 스케줄러에서 서로 다른 카드 k장을 미리 뽑음 (출제할 카드가 없으면 (빈 목록, GRADUATED/WAITING/FOCUS_DONE))
+    out, seen = [], set()
+    for _ in range(2 * k):
+        idx = sched.next()
+        if idx in (GRADUATED, WAITING, FOCUS_DONE): return out, (None if out else idx)
+        if idx not in seen: seen.add(idx); out.append(int(idx))
+        if len(out) >= k: break
+    return out, None
+
+
+def flip_session(sched, card, grade, labels, key="flip_deck", batch_size=BATCH_SIZE, prepare=None):
+    # card(idx) -> {"q", "a", "img", "badge"}, grade(idx, 등급 번호) -> 버튼 채점과 같은 처리
+    # prepare(idx 목록): 묶음의 카드를 그리기 전에 한 번에 호출 (이미지 동시 다운로드 등)
+    # 컴포넌트가 돌려준 채점(st.session_state[key])을 먼저 반영하고, 묶음을 다 풀었으면 새 묶음을 그림
+    # 반환: 출제할 카드가 없으면 GRADUATED/WAITING/FOCUS_DONE, 아니면 None
+    ss = st.session_state
+    cur = ss.get(key + "_batch")
+    if cur is not None and cur["sched"] is not sched: cur = None  # 전략 변경/다시 시작
+    value = ss.get(key)
+    if cur is not None and value and value.get("batch") == cur["id"]:
+        new = value["grades"][cur["applied"]:]
+        for idx, g in new: grade(int(idx), int(g))
+        cur["applied"] += len(new)
+        if cur["applied"] >= len(cur["cards"]): cur = dict(cur, cards=[])
+    if cur is None or not cur["cards"]:
+        cards, idle = next_batch(sched, batch_size)
+        if idle is not None: ss.pop(key + "_batch", None); return idle
+        ss[key + "_seq"] = ss.get(key + "_seq", 0) + 1  # 묶음 번호는 세션 안에서 계속 증가 (이전 응답값과 섞이지 않게)
+        cur = {"id": ss[key + "_seq"], "cards": cards, "applied": 0, "sched": sched}
+    ss[key + "_batch"] = cur
+    if prepare is not None: prepare(cur["cards"])
+    _component(batch=cur["id"], cards=[dict(card(i), idx=i) for i in cur["cards"]], labels=list(labels), key=key, default=None)
+    return None
+
+
+def reset_flip(key="flip_deck"):
+    # 동기화로 행 위치가 바뀌면 보여주던 묶음은 버림 (채점하지 않은 카드는 다음 묶음에서 다시 출제)
+    st.session_state.pop(key + "_batch", None)
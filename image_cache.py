@@ -0,0 +1,127 @@
+import base64
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from PIL import Image
+
+from perf_trace import count, span
+
+
+class ImageCache:
+    # 카드 이미지를 표시 해상도로 줄여 메모리 LRU + 디스크 LRU에 보관
+    # - get(url): 메모리 -> 디스크 -> 다운로드 순 (실패 시 None, 앱은 원본 URL로 대체)
+    # - prefetch(urls): 다음 카드 이미지를 백그라운드에서 미리 받음
+    # - data_url(url): 축소본을 data URL로 (브라우저 쪽 컴포넌트에 그대로 넘김, 실패 시 None)
+    def __init__(self, cache_dir=".study_cache/images", max_width=1200, mem_items=64,
+                 disk_bytes=200 * 1024 * 1024, workers=4, timeout=10, retry_after=60):
+        self.cache_dir = cache_dir
+        self.max_width = max_width
+        self.mem_items = mem_items
+        self.disk_bytes = disk_bytes
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._mem = OrderedDict()
+        self._inflight = {}
+        self._failed = {}  # 실패한 URL -> 시각 (retry_after초 동안 재시도 안 함)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-prefetch")
+        os.makedirs(cache_dir, exist_ok=True)
+        self._disk = OrderedDict()  # 파일 경로 -> 크기 (오래된 접근 순)
+        entries = sorted(os.scandir(cache_dir), key=lambda e: e.stat().st_mtime)
+        for e in entries:
+            if e.is_file(): self._disk[e.path] = e.stat().st_size
+        self._disk_total = sum(self._disk.values())
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest())
+
+    # --- 메모리 / 디스크 LRU ---
+    def _remember(self, url, data):
+        with self._lock:
+            self._mem[url] = data; self._mem.move_to_end(url)
+            while len(self._mem) > self.mem_items: self._mem.popitem(last=False)
+
+    def _read_disk(self, url):
+        path = self._path(url)
+        try:
+            with open(path, "rb") as f: data = f.read()
+        except OSError:
+            return None
+        with self._lock:
+            if path in self._disk: self._disk.move_to_end(path)
+        try: os.utime(path)
+        except OSError: pass
+        return data
+
+    def _write_disk(self, url, data):
+        path = self._path(url)
+        with open(path + ".tmp", "wb") as f: f.write(data)
+        os.replace(path + ".tmp", path)
+        with self._lock:
+            self._disk_total += len(data) - self._disk.pop(path, 0)
+            self._disk[path] = len(data)
+            while self._disk_total > self.disk_bytes and len(self._disk) > 1:
+                old, size = self._disk.popitem(last=False)
+                self._disk_total -= size
+                try: os.remove(old)
+                except OSError: pass
+
+    # --- 다운로드 + 축소 ---
+    def _fetch(self, url):
+        with span("image.download"): resp = requests.get(url, timeout=self.timeout)
+        resp.raise_for_status()
+        img = Image.open(io.BytesIO(resp.content))
+        img.thumbnail((self.max_width, self.max_width * 4))
+        out = io.BytesIO()
+        if img.mode in ("RGBA", "LA", "P"): img.save(out, format="PNG", optimize=True)
+        else: img.convert("RGB").save(out, format="JPEG", quality=85)
+        return out.getvalue()
+
+    def _load(self, url):
+        data = self._read_disk(url)
+        if data is None:
+            try: data = self._fetch(url)
+            except Exception:
+                with self._lock: self._failed[url] = time.monotonic()
+                return None
+            self._write_disk(url, data)
+        self._remember(url, data)
+        return data
+
+    def _submit(self, url):
+        with self._lock:
+            fut = self._inflight.get(url)
+            started = fut is None
+            if started: fut = self._inflight[url] = self._pool.submit(self._load, url)
+        if started: fut.add_done_callback(lambda _: self._forget(url))
+        return fut
+
+    def _forget(self, url):
+        with self._lock: self._inflight.pop(url, None)
+
+    def get(self, url):
+        with self._lock:
+            data = self._mem.get(url)
+            if data is not None: self._mem.move_to_end(url); count("image.hit"); return data
+            if time.monotonic() - self._failed.get(url, -self.retry_after) < self.retry_after: return None
+        count("image.miss")
+        with span("image.wait"): return self._submit(url).result()
+
+    def data_url(self, url):
+        data = self.get(url)
+        if data is None: return None
+        mime = "image/png" if data.startswith(b"\x89PNG") else "image/jpeg"
+        return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+
+    def prefetch(self, urls):
+        for url in urls:
+            with self._lock:
+                if url in self._mem or url in self._inflight: continue
+                if time.monotonic() - self._failed.get(url, -self.retry_after) < self.retry_after: continue
+            self._submit(url)
@@ -0,0 +1,56 @@
+import hashlib
+import os
+
+import pandas as pd
+import pyarrow.feather as feather
+
+from sheet_source import workbook_sheet_names
+
+LOCAL_SUFFIXES = (".xlsx", ".csv", ".parquet", ".feather", ".arrow")
+
+
+def local_sheet_names(path):
+    # xlsx는 탭 이름 목록, 그 외 파일은 파일 이름 하나
+    if path.lower().endswith(".xlsx"):
+        with open(path, "rb") as f: return workbook_sheet_names(f.read())
+    return [os.path.splitext(os.path.basename(path))[0]]
+
+
+def read_local_table(path, sheet_name=0):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".xlsx": return pd.read_excel(path, sheet_name=sheet_name)
+    if ext == ".csv": return pd.read_csv(path)
+    if ext == ".parquet": return pd.read_parquet(path)
+    if ext in (".feather", ".arrow"): return pd.read_feather(path)  # 원본은 prepare에서 정규화하므로 그대로 복사해 읽음
+    raise ValueError(f"지원하지 않는 덱 파일 형식: {path} ({', '.join(LOCAL_SUFFIXES)})")
+
+
+def _source_key(path, sheet_name):
+    return hashlib.sha1(f"{os.path.abspath(path)}|{sheet_name}".encode()).hexdigest()[:12]
+
+
+def local_version(path, sheet_name=0):
+    # 원본 파일의 수정 시각/크기로 만든 버전 문자열 (파일이 바뀌면 달라짐)
+    st = os.stat(path)
+    return hashlib.sha1(f"{_source_key(path, sheet_name)}|{st.st_mtime_ns}|{st.st_size}".encode()).hexdigest()[:16]
+
+
+def load_local_deck(path, prepare, cache_dir=".study_cache/local", sheet_name=0):
+    # 오프라인 덱: 원본(xlsx/CSV/Parquet)을 처음 한 번만 정규화해 비압축 Feather(Arrow IPC)로 저장하고
+    # 이후에는 memory-map으로 바로 읽음 (네트워크/엑셀 파싱 없이 시작)
+    # split_blocks: 카운터(int32) 열은 블록으로 합치지 않아 매핑된 버퍼를 그대로 씀, 텍스트는 Arrow 기반 string
+    # (category 코드만 복사, 공유 덱은 읽기 전용이라 매핑이 읽기 전용이어도 됨)
+    # prepare(원본 DataFrame) -> 앱용 덱 DataFrame (cache_dir은 앱마다 따로 둠)
+    os.makedirs(cache_dir, exist_ok=True)
+    prefix = _source_key(path, sheet_name) + "-"
+    cached = os.path.join(cache_dir, prefix + local_version(path, sheet_name) + ".arrow")
+    if not os.path.exists(cached):
+        df = prepare(read_local_table(path, sheet_name))
+        if df is None: return None
+        df.reset_index(drop=True).to_feather(cached + ".tmp", compression="uncompressed")
+        os.replace(cached + ".tmp", cached)
+        for e in os.scandir(cache_dir):  # 같은 원본의 이전 버전 정리
+            if e.name.startswith(prefix) and e.path != cached:
+                try: os.remove(e.path)
+                except OSError: pass
+    return feather.read_table(cached, memory_map=True).to_pandas(split_blocks=True)
@@ -0,0 +1,142 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter, deque
+from contextlib import nullcontext
+
+import numpy as np
+
+_NULL = nullcontext()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer._record(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class Tracer:
+    # 핫패스 타이머/카운터 (꺼져 있으면 span()은 공용 nullcontext, count()는 즉시 반환)
+    # - 스크립트 실행(rerun) 단위로 구간별 시간을 모아 사이드바에 표시하고 JSONL로 기록
+    # - 백그라운드 스레드(시트 반영, 이미지 미리 받기)의 구간은 rerun과 별개 이벤트로 기록
+    def __init__(self, enabled=False, path=None, window=500):
+        self.enabled = enabled
+        self.path = path
+        self.window = window
+        self.counters = Counter()
+        self._samples = {}  # 구간 이름 -> 최근 window개 (ms)
+        self._open = {}  # 세션 -> 진행 중인 rerun
+        self._last = {}  # 세션 -> 마지막으로 끝난 rerun
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def configure(self, enabled, path=None):
+        self.enabled = bool(enabled)
+        self.path = path
+        if path: os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    # --- 측정 ---
+    def span(self, name):
+        return _Span(self, name) if self.enabled else _NULL
+
+    def timed(self, name):
+        def wrap(fn):
+            @functools.wraps(fn)
+            def inner(*args, **kwargs):
+                if not self.enabled: return fn(*args, **kwargs)
+                with _Span(self, name): return fn(*args, **kwargs)
+            return inner
+        return wrap
+
+    def count(self, name, n=1):
+        if not self.enabled: return
+        run = getattr(self._local, "run", None)
+        with self._lock:
+            self.counters[name] += n
+            if run is not None: run["counters"][name] += n
+
+    def _record(self, name, ms):
+        run = getattr(self._local, "run", None)
+        with self._lock:
+            self._samples.setdefault(name, deque(maxlen=self.window)).append(ms)
+            if run is not None:
+                run["spans"].append((name, round(ms, 3)))
+        if run is None: self._write({"ts": time.time(), "thread": threading.current_thread().name, "spans": [[name, round(ms, 3)]]})
+
+    # --- rerun 단위 ---
+    def begin_run(self, session):
+        # 끝까지 가지 않은 이전 실행(st.rerun()으로 중단)은 곧바로 이어지는 이번 실행 시작 시각으로 마감
+        if not self.enabled: return
+        now = time.perf_counter()
+        with self._lock: prev = self._open.pop(session, None)
+        if prev is not None: prev["rerun"] = True; self._finish(prev, now)
+        run = {"session": session, "ts": time.time(), "start": now, "spans": [], "counters": Counter()}
+        with self._lock: self._open[session] = run
+        self._local.run = run
+
+    def end_run(self, session):
+        if not self.enabled: return
+        with self._lock: run = self._open.pop(session, None)
+        if run is not None: self._finish(run, time.perf_counter())
+        self._local.run = None
+
+    def _finish(self, run, end):
+        run["total_ms"] = round((end - run["start"]) * 1000, 3)
+        with self._lock:
+            self._samples.setdefault("rerun", deque(maxlen=self.window)).append(run["total_ms"])
+            self._last[run["session"]] = run
+        self._write({"ts": run["ts"], "session": run["session"], "total_ms": run["total_ms"], "rerun": run.get("rerun", False),
+                     "spans": [list(s) for s in run["spans"]], "counters": dict(run["counters"])})
+
+    def last_run(self, session):
+        with self._lock: return self._last.get(session)
+
+    def percentiles(self):
+        # 반환: [(구간, 표본 수, p50, p90, p99)] (최근 window개 기준)
+        with self._lock: samples = {name: list(v) for name, v in self._samples.items()}
+        out = []
+        for name, values in sorted(samples.items()):
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            out.append((name, len(values), round(p50, 2), round(p90, 2), round(p99, 2)))
+        return out
+
+    def _write(self, event):
+        if not self.path: return
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f: f.write(line)
+
+
+# 프로세스 공용 (앱에서 configure로 켬, 라이브러리 모듈은 span/count만 호출)
+tracer = Tracer()
+span = tracer.span
+timed = tracer.timed
+count = tracer.count
+
+
+def show_debug_panel(session):
+    # 사이드바 디버그 패널: 직전 rerun의 구간별 시간 + 최근 구간별 p50/p90/p99 + 카운터
+    import pandas as pd
+    import streamlit as st
+    tracer.end_run(session)
+    run = tracer.last_run(session)
+    with st.expander("⏱️ 성능 측정", expanded=False):
+        if run is not None:
+            st.caption(f"직전 실행 {run['total_ms']:.1f} ms")
+            if run["spans"]: st.table(pd.DataFrame(run["spans"], columns=["구간", "ms"]))
+        rows = tracer.percentiles()
+        if rows: st.table(pd.DataFrame(rows, columns=["구간", "n", "p50", "p90", "p99"]))
+        if tracer.counters: st.table(pd.DataFrame(sorted(tracer.counters.items()), columns=["카운터", "값"]))
+        if tracer.path: st.caption(f"trace: {tracer.path}")
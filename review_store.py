@@ -0,0 +1,165 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS card_state (
+    deck TEXT NOT NULL,
+    card TEXT NOT NULL,
+    level INTEGER NOT NULL DEFAULT 0,
+    wrong_level INTEGER NOT NULL DEFAULT 0,
+    due_slot INTEGER,
+    PRIMARY KEY (deck, card)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS deck_meta (
+    deck TEXT PRIMARY KEY,
+    solve_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS deck_strategy (
+    deck TEXT PRIMARY KEY,
+    strategy TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS local_counts (
+    deck TEXT NOT NULL,
+    base TEXT NOT NULL,
+    card TEXT NOT NULL,
+    col TEXT NOT NULL,
+    delta INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (deck, card, col)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS review_log (
+    id INTEGER PRIMARY KEY,
+    deck TEXT NOT NULL,
+    card TEXT NOT NULL,
+    ts REAL NOT NULL,
+    grade INTEGER NOT NULL,
+    level INTEGER,
+    wrong_level INTEGER,
+    due_at REAL
+);
+CREATE INDEX IF NOT EXISTS review_log_deck ON review_log (deck, id);
+"""
+
+
+class ReviewStore:
+    # 카드별 복습 레벨/오답 레벨/다음 출제 슬롯을 SQLite(WAL)에 보관
+    # - load(): 세션 시작 시 한 번의 SELECT로 복원
+    # - record(): 응답마다 해당 카드 한 행만 upsert (전체 재작성 없음) + 복습 기록(review_log) 한 행 추가
+    def __init__(self, path=".study_cache/review_state.sqlite3"):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        # 이전 버전 DB: 전략별 추가 상태(JSON), 실제 복습 예정 시각, 정복 여부 열 추가
+        cols = [r[1] for r in self._db.execute("PRAGMA table_info(card_state)")]
+        if "extra" not in cols: self._db.execute("ALTER TABLE card_state ADD COLUMN extra TEXT")
+        if "due_at" not in cols: self._db.execute("ALTER TABLE card_state ADD COLUMN due_at REAL")
+        if "mastered" not in cols: self._db.execute("ALTER TABLE card_state ADD COLUMN mastered INTEGER NOT NULL DEFAULT 0")
+        # 덱별 복습 기록 수: 화면을 그릴 때마다 COUNT(*)하지 않도록 record()에서 함께 증가 (기존 기록은 한 번만 셈)
+        if "reviews" not in [r[1] for r in self._db.execute("PRAGMA table_info(deck_meta)")]:
+            self._db.execute("BEGIN")
+            self._db.execute("ALTER TABLE deck_meta ADD COLUMN reviews INTEGER NOT NULL DEFAULT 0")
+            self._db.execute("INSERT OR IGNORE INTO deck_meta (deck) SELECT DISTINCT deck FROM review_log")
+            self._db.execute("UPDATE deck_meta SET reviews = (SELECT COUNT(*) FROM review_log WHERE review_log.deck = deck_meta.deck)")
+            self._db.execute("COMMIT")
+        self._lock = threading.Lock()
+
+    def load(self, deck):
+        # 반환: (solve_count, {card: (level, wrong_level, due_slot, extra, due_at, mastered)})
+        with self._lock:
+            row = self._db.execute("SELECT solve_count FROM deck_meta WHERE deck = ?", (deck,)).fetchone()
+            cards = self._db.execute("SELECT card, level, wrong_level, due_slot, extra, due_at, mastered FROM card_state WHERE deck = ?", (deck,)).fetchall()
+        return (row[0] if row else 0), {c: (lv, wl, due, json.loads(ex) if ex else None, at, bool(m)) for c, lv, wl, due, ex, at, m in cards}
+
+    def record(self, deck, card, level, wrong_level, due_slot, solve_count, extra=None, due_at=None, grade=None, mastered=False):
+        # extra: 전략별 추가 상태 (예: SM-2의 (ease, 간격)), JSON으로 저장
+        # due_at: 실제 복습 예정 시각 (유닉스 초, 없으면 NULL)
+        # grade: 채점 등급 (앱의 GRADE_LABELS 순서), 주어지면 복습 기록에 남김
+        # mastered: 정복 여부 (시트 카운터에 반영되지 않는 덱도 재시작 후 정복 상태 유지)
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute(
+                    "INSERT INTO card_state (deck, card, level, wrong_level, due_slot, extra, due_at, mastered) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (deck, card) DO UPDATE SET level = excluded.level, wrong_level = excluded.wrong_level, "
+                    "due_slot = excluded.due_slot, extra = excluded.extra, due_at = excluded.due_at, mastered = excluded.mastered",
+                    (deck, card, level, wrong_level, due_slot, None if extra is None else json.dumps(extra), due_at, int(bool(mastered))))
+                self._db.execute(
+                    "INSERT INTO deck_meta (deck, solve_count, reviews) VALUES (?, ?, ?) "
+                    "ON CONFLICT (deck) DO UPDATE SET solve_count = excluded.solve_count, reviews = reviews + excluded.reviews",
+                    (deck, solve_count, int(grade is not None)))
+                if grade is not None:
+                    self._db.execute("INSERT INTO review_log (deck, card, ts, grade, level, wrong_level, due_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                     (deck, card, time.time(), int(grade), level, wrong_level, due_at))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK"); raise
+
+    def mastered(self, deck):
+        # 정복한 카드 ID 목록 (동기화 뒤 다시 적용)
+        with self._lock:
+            return [r[0] for r in self._db.execute("SELECT card FROM card_state WHERE deck = ? AND mastered = 1", (deck,))]
+
+    # --- 복습 기록 (내보내기용) ---
+    def log_count(self, deck):
+        # review_log 행 수 (deck_meta에 유지하는 값, 인덱스 스캔 없음)
+        with self._lock:
+            row = self._db.execute("SELECT reviews FROM deck_meta WHERE deck = ?", (deck,)).fetchone()
+        return row[0] if row else 0
+
+    def iter_log(self, deck, chunk_rows=10000):
+        # 복습 기록을 chunk_rows행씩: [(card, ts, grade, level, wrong_level, due_at), ...]
+        # id 기준 keyset 페이지 (조각마다 잠깐만 잠금, 전체를 한 번에 읽지 않음)
+        last = 0
+        while True:
+            with self._lock:
+                rows = self._db.execute("SELECT id, card, ts, grade, level, wrong_level, due_at FROM review_log "
+                                        "WHERE deck = ? AND id > ? ORDER BY id LIMIT ?", (deck, last, chunk_rows)).fetchall()
+            if not rows: return
+            last = rows[-1][0]
+            yield [r[1:] for r in rows]
+            if len(rows) < chunk_rows: return
+
+    # --- 덱별 출제 전략 ---
+    def strategy(self, deck):
+        with self._lock:
+            row = self._db.execute("SELECT strategy FROM deck_strategy WHERE deck = ?", (deck,)).fetchone()
+        return row[0] if row else None
+
+    def set_strategy(self, deck, strategy):
+        with self._lock:
+            self._db.execute("INSERT INTO deck_strategy (deck, strategy) VALUES (?, ?) "
+                             "ON CONFLICT (deck) DO UPDATE SET strategy = excluded.strategy", (deck, strategy))
+
+    # --- 오프라인 덱의 카운터 증감분 (base = 로컬 덱 파일 버전) ---
+    def load_counts(self, deck, base):
+        # 반환: {card: {열: 증감}}, 로컬 파일이 바뀌었으면(다른 base) 이전 증감분은 버림
+        with self._lock:
+            self._db.execute("DELETE FROM local_counts WHERE deck = ? AND base != ?", (deck, base))
+            rows = self._db.execute("SELECT card, col, delta FROM local_counts WHERE deck = ?", (deck,)).fetchall()
+        out = {}
+        for card, col, d in rows: out.setdefault(card, {})[col] = d
+        return out
+
+    def add_counts(self, deck, base, card, deltas):
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                for col, d in deltas.items():
+                    self._db.execute(
+                        "INSERT INTO local_counts (deck, base, card, col, delta) VALUES (?, ?, ?, ?, ?) "
+                        "ON CONFLICT (deck, card, col) DO UPDATE SET delta = delta + excluded.delta, base = excluded.base",
+                        (deck, base, card, col, int(d)))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK"); raise
+
+    def clear(self, deck):
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.execute("DELETE FROM card_state WHERE deck = ?", (deck,))
+            self._db.execute("UPDATE deck_meta SET solve_count = 0 WHERE deck = ?", (deck,))  # 복습 기록은 지우지 않으므로 기록 수는 유지
+            self._db.execute("COMMIT")
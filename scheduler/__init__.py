@@ -0,0 +1,17 @@
+from .base import DAY, FOCUS_DONE, GRADUATED, MASTERED_COUNT, WAITING, BaseScheduler
+from .fibo import FIBO_DAYS, FIBO_GAP, HARD_GAP, FiboScheduler
+from .sm2 import SM2Scheduler
+from .uniform import UniformScheduler
+
+# 덱별로 고를 수 있는 출제 전략 (이름 -> 클래스)
+STRATEGIES = {cls.name: cls for cls in (FiboScheduler, SM2Scheduler, UniformScheduler)}
+DEFAULT_STRATEGY = FiboScheduler.name
+
+
+def make_scheduler(strategy, correct_counts, **kwargs):
+    return STRATEGIES.get(strategy, STRATEGIES[DEFAULT_STRATEGY])(correct_counts, **kwargs)
+
+
+def time_based(strategy):
+    # 실제 시각 기준 전략 (예약 시각 전이면 WAITING): 예약 카드를 앞당겨 내지 않도록 serve_future=False로 만듦
+    return STRATEGIES.get(strategy, STRATEGIES[DEFAULT_STRATEGY]).idle_result == WAITING
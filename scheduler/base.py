@@ -0,0 +1,229 @@
+import heapq
+import random
+import time
+
+from due_index import DAY, DueIndex
+
+MASTERED_COUNT = 5
+GRADUATED = "GRADUATED"
+WAITING = "WAITING"  # 예약된 카드는 있지만 아직 출제 시각이 안 됨 (시간 기반 전략, serve_future=False)
+FOCUS_DONE = "FOCUS_DONE"  # 검색 필터의 카드를 모두 정복 (덱 전체에는 남은 카드가 있을 수 있음)
+
+
+class BaseScheduler:
+    # 출제 엔진 공통부: 복습 슬롯 min-heap + 예약 인덱스 집합 + 미정복 비트맵 + 신규 풀
+    # next()는 O(log n), 정답 처리도 O(log n) (전체 행 스캔 없음)
+    # 전략(하위 클래스)은 now()(슬롯 단위의 현재 시각)와 answer_hard/normal/easy만 정의
+    # 카드 상태: levels(복습 레벨), wrong_levels(오답 레벨), 슬롯 + 전략별 추가 상태(extra)
+    # 슬롯과 별개로 카드마다 실제 복습 예정 시각(due_at, 유닉스 초)을 두고 정렬 인덱스(due_index)로 집계
+    name = None
+    label = None
+    idle_result = GRADUATED  # serve_future=False에서 출제할 카드가 없을 때 next()의 반환값
+
+    def __init__(self, correct_counts, serve_future=True, rng=None, clock=time.time):
+        self.serve_future = serve_future
+        self.rng = rng or random
+        self.clock = clock
+        self.reset(correct_counts)
+
+    def now(self):
+        raise NotImplementedError
+
+    def reset(self, correct_counts):
+        self.solve_count = 0
+        self.levels = {}
+        self.wrong_levels = {}
+        self.due_at = {}
+        self._heap = []
+        self._slot_of = {}
+        self._seq = 0
+        self._focus = None
+        self.reset_deck(correct_counts)
+
+    def reset_deck(self, correct_counts):
+        # 덱이 다시 로드되었을 때: 미정복 비트맵/신규 풀만 재구성하고 복습 일정은 유지
+        self._unmastered = bytearray(1 if int(c) < MASTERED_COUNT else 0 for c in correct_counts)
+        n = len(self._unmastered)
+        stale = [idx for idx in self._slot_of if idx >= n]
+        for idx in stale: del self._slot_of[idx]
+        for d in self._card_dicts():
+            for idx in [i for i in d if i >= n]: del d[idx]
+        if stale:
+            self._heap = [e for e in self._heap if e[2] < n]; heapq.heapify(self._heap)
+        self.due_index = DueIndex(self.due_at, n)
+        self._focus = None  # 행 위치가 바뀌었을 수 있으므로 검색 필터는 앱이 다시 걸어야 함
+        self._new_pool = []
+        self._new_pos = {}
+        for idx in range(n):
+            if self._unmastered[idx] and idx not in self._slot_of: self._pool_add(idx)
+
+    def _card_dicts(self):
+        # 카드 인덱스를 키로 쓰는 상태 dict들 (remap/reset_deck에서 함께 옮김)
+        return [self.levels, self.wrong_levels, self.due_at]
+
+    def card_state(self, idx):
+        # 저장용: (level, wrong_level, due_slot, extra, due_at) - extra는 전략별 추가 상태 (없으면 None)
+        return self.levels.get(idx, 0), self.wrong_levels.get(idx, 0), self.due_slot(idx), None, self.due_at.get(idx)
+
+    def _restore_extra(self, idx, extra):
+        pass
+
+    def restore(self, solve_count, states):
+        # 저장된 상태 복원: states = {idx: (level, wrong_level, due_slot, extra, due_at, mastered)}
+        # due_at 인덱스는 복원이 끝난 뒤 한 번에 정렬
+        self.solve_count = solve_count
+        for idx, (lv, wl, due, *rest) in states.items():
+            if idx >= len(self._unmastered): continue
+            extra, due_at, mastered = (list(rest) + [None] * 3)[:3]
+            if wl: self.wrong_levels[idx] = wl
+            if mastered: self.mark_mastered(idx); continue  # 덱 카운터로는 미정복이어도 저장된 정복 상태 우선
+            if lv: self.levels[idx] = lv
+            if extra is not None: self._restore_extra(idx, extra)
+            if due_at is not None and self._unmastered[idx]: self.due_at[idx] = due_at
+            if due is not None: self.schedule(idx, due)
+        self.due_index = DueIndex(self.due_at, len(self))
+
+    def set_due(self, idx, days):
+        # 실제 복습 예정 시각 = 지금 + days일 (None이면 예정 없음)
+        t = None if days is None else self.clock() + days * DAY
+        if t is None: self.due_at.pop(idx, None)
+        else: self.due_at[idx] = t
+        self.due_index.update(idx, t)
+
+    def remap(self, index_map, correct_counts):
+        # 시트 동기화로 행 위치가 바뀐 경우: index_map[이전 위치] = 새 위치 (-1이면 삭제된 카드)
+        def moved(i): return int(index_map[i]) if i < len(index_map) else -1
+        for d in self._card_dicts():
+            kept = {moved(i): v for i, v in d.items() if moved(i) >= 0}
+            d.clear(); d.update(kept)
+        self._heap = [(slot, seq, moved(i)) for i, (slot, seq) in self._slot_of.items() if moved(i) >= 0]
+        self._slot_of = {i: (slot, seq) for slot, seq, i in self._heap}
+        heapq.heapify(self._heap)
+        self.reset_deck(correct_counts)
+
+    def __len__(self):
+        return len(self._unmastered)
+
+    # --- 검색 필터 (출제 대상을 일부 카드로 제한) ---
+    def focus(self, rows):
+        # rows만 출제 (None이면 해제): 필터용 heap/신규 풀을 따로 만들어 next()가 그쪽을 씀
+        if rows is None: self._focus = None; return
+        mask = bytearray(len(self))
+        for r in rows:
+            if 0 <= r < len(mask): mask[r] = 1
+        self._focus = mask
+        self._fheap = [(slot, seq, idx) for idx, (slot, seq) in self._slot_of.items() if mask[idx]]
+        heapq.heapify(self._fheap)
+        self._fpool = [idx for idx in self._new_pool if mask[idx]]
+        self._fpos = {idx: i for i, idx in enumerate(self._fpool)}
+
+    @property
+    def focused(self):
+        return self._focus is not None
+
+    def _queue(self):
+        # 지금 출제에 쓰는 (heap, 신규 풀)
+        return (self._fheap, self._fpool) if self._focus is not None else (self._heap, self._new_pool)
+
+    # --- 신규 풀 (O(1) 추가/삭제/랜덤 선택) ---
+    def _pool_add(self, idx):
+        if idx not in self._new_pos:
+            self._new_pos[idx] = len(self._new_pool); self._new_pool.append(idx)
+            if self._focus is not None and self._focus[idx]: self._fpos[idx] = len(self._fpool); self._fpool.append(idx)
+
+    def _pool_remove(self, idx):
+        pos = self._new_pos.pop(idx, None)
+        if pos is None: return
+        last = self._new_pool.pop()
+        if last != idx: self._new_pool[pos] = last; self._new_pos[last] = pos
+        pos = self._fpos.pop(idx, None) if self._focus is not None else None
+        if pos is None: return
+        last = self._fpool.pop()
+        if last != idx: self._fpool[pos] = last; self._fpos[last] = pos
+
+    # --- 복습 슬롯 heap ---
+    def schedule(self, idx, slot):
+        self._seq += 1
+        self._slot_of[idx] = (slot, self._seq)
+        heapq.heappush(self._heap, (slot, self._seq, idx))
+        if self._focus is not None and self._focus[idx]: heapq.heappush(self._fheap, (slot, self._seq, idx))
+        self._pool_remove(idx)
+
+    def _peek(self, heap=None):
+        # 이미 다른 슬롯으로 옮겨진 항목은 지연 삭제
+        heap = self._queue()[0] if heap is None else heap
+        while heap:
+            slot, seq, idx = heap[0]
+            if self._slot_of.get(idx) == (slot, seq): return slot
+            heapq.heappop(heap)
+        return None
+
+    def _pop(self):
+        heap = self._queue()[0]
+        self._peek(heap)
+        _, _, idx = heapq.heappop(heap)
+        del self._slot_of[idx]
+        if self._unmastered[idx]: self._pool_add(idx)
+        return idx
+
+    def upcoming(self, k):
+        # 다음에 나올 가능성이 큰 카드들 (이미지 미리 받기용, 상태 변경 없음)
+        # 복습 heap에서 앞쪽 k개를 O(k log k)로 훑고, 신규 풀에서 k개를 표본 추출
+        heap, pool = self._queue()
+        out, frontier = [], [(heap[0], 0)] if heap else []
+        while frontier and len(out) < k:
+            (slot, seq, idx), i = heapq.heappop(frontier)
+            if self._slot_of.get(idx) == (slot, seq): out.append(idx)
+            for c in (2 * i + 1, 2 * i + 2):
+                if c < len(heap): heapq.heappush(frontier, (heap[c], c))
+        if pool: out += self.rng.sample(pool, min(k, len(pool)))
+        return out
+
+    def due_slot(self, idx):
+        entry = self._slot_of.get(idx)
+        return entry[0] if entry else None
+
+    def next_due(self):
+        # 가장 이른 예약 슬롯 (없으면 None)
+        return self._peek()
+
+    def is_scheduled(self, idx):
+        return idx in self._slot_of
+
+    def is_mastered(self, idx):
+        return not self._unmastered[idx]
+
+    def mark_unmastered(self, idx):
+        self._unmastered[idx] = 1
+        if idx not in self._slot_of: self._pool_add(idx)
+
+    def mark_mastered(self, idx):
+        self._unmastered[idx] = 0
+        self._pool_remove(idx)
+        self.levels.pop(idx, None)
+        if idx in self.due_at: self.set_due(idx, None)
+
+    # --- 출제 (50% 신규 보장 유지) ---
+    def next(self):
+        pool = self._queue()[1]
+        slot = self._peek()
+        pending = slot is not None and slot <= self.now()
+        if pool and pending:
+            return self.rng.choice(pool) if self.rng.random() < 0.5 else self._pop()
+        if pool: return self.rng.choice(pool)
+        if pending: return self._pop()
+        if slot is None: return GRADUATED if self._focus is None else FOCUS_DONE
+        if self.serve_future: return self._pop()
+        return self.idle_result
+
+    # --- 응답 처리 (전략별) ---
+    def answer_hard(self, idx):
+        raise NotImplementedError
+
+    def answer_normal(self, idx):
+        # 반환값: 이번 응답으로 정복되었는지 여부
+        raise NotImplementedError
+
+    def answer_easy(self, idx):
+        self.mark_mastered(idx)
+        self.solve_count += 1
@@ -0,0 +1,42 @@
+from .base import BaseScheduler
+
+# 피보나치 복습 간격 (solve_count 기준, 한 세션 안의 출제 순서)
+FIBO_GAP = [0, 5, 13, 21, 34, 55, 89, 144]
+HARD_GAP = 5
+# 레벨별 실제 복습 간격 (일, 세션을 넘어서는 복습 예정 시각)
+FIBO_DAYS = [0, 1, 2, 3, 5, 8, 13, 21]
+
+
+class FiboScheduler(BaseScheduler):
+    # 기존 방식: 응답 횟수(solve_count)를 시계로 삼아 피보나치 간격 뒤에 다시 출제
+    # 세션을 다시 열면 실제 예정 시각(due_at)이 지난 카드를 먼저, 아직 안 된 카드는 맨 뒤(간격 144 이후)로 보냄
+    name = "fibo"
+    label = "피보나치 간격"
+
+    def now(self):
+        return self.solve_count
+
+    def restore(self, solve_count, states):
+        super().restore(solve_count, states)
+        now = self.clock()
+        ahead = sorted((t, idx) for idx, t in self.due_at.items() if t > now and self.is_scheduled(idx))
+        for t, idx in sorted((t, idx) for idx, t in self.due_at.items() if t <= now and self.is_scheduled(idx)):
+            self.schedule(idx, min(self.due_slot(idx), self.solve_count))
+        for rank, (t, idx) in enumerate(ahead):
+            self.schedule(idx, max(self.due_slot(idx), self.solve_count + FIBO_GAP[-1] + rank))
+
+    def answer_hard(self, idx):
+        self.wrong_levels[idx] = self.wrong_levels.get(idx, 0) + 1
+        self.levels[idx] = 1
+        self.schedule(idx, self.solve_count + HARD_GAP); self.set_due(idx, FIBO_DAYS[0])
+        self.solve_count += 1
+
+    def answer_normal(self, idx):
+        # 반환값: 이번 응답으로 정복(레벨 7 초과)되었는지 여부
+        new_lv = self.levels.get(idx, 0) + 1
+        mastered = new_lv >= len(FIBO_GAP)
+        if mastered: self.mark_mastered(idx)
+        else:
+            self.levels[idx] = new_lv; self.schedule(idx, self.solve_count + FIBO_GAP[new_lv]); self.set_due(idx, FIBO_DAYS[new_lv])
+        self.solve_count += 1
+        return mastered
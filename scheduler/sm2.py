@@ -0,0 +1,67 @@
+import time
+
+from .base import DAY, WAITING, BaseScheduler
+
+# SM-2 계열 시간 기반 간격 (슬롯 = 유닉스 시각 초)
+START_EASE = 2.5
+MIN_EASE = 1.3
+HARD_EASE_STEP = 0.2
+RELEARN_DELAY = 600  # 어려움: 10분 뒤 다시
+FIRST_INTERVALS = [1.0, 6.0]  # 레벨 1, 2의 간격 (일)
+MASTERED_INTERVAL = 180.0  # 간격이 이보다 길어지면 정복
+
+
+class SM2Scheduler(BaseScheduler):
+    # 카드별 ease(간격 배수)와 간격(일)을 두고 실제 시각 기준으로 출제
+    # - 어려움: 레벨 1로, ease 감소, RELEARN_DELAY 뒤 재출제
+    # - 정상: 레벨 1/2는 FIRST_INTERVALS, 이후 직전 간격 x ease
+    # clock은 시뮬레이터에서 가상 시계로 교체 가능
+    name = "sm2"
+    label = "SM-2 (시간 기반)"
+    idle_result = WAITING
+
+    def __init__(self, correct_counts, serve_future=True, rng=None, clock=time.time):
+        self.eases = {}
+        self.intervals = {}
+        super().__init__(correct_counts, serve_future=serve_future, rng=rng, clock=clock)
+
+    def now(self):
+        return int(self.clock())
+
+    def reset(self, correct_counts):
+        self.eases = {}
+        self.intervals = {}
+        super().reset(correct_counts)
+
+    def _card_dicts(self):
+        return super()._card_dicts() + [self.eases, self.intervals]
+
+    def card_state(self, idx):
+        lv, wl, due, _, due_at = super().card_state(idx)
+        extra = (self.eases[idx], self.intervals.get(idx, 0.0)) if idx in self.eases else None
+        return lv, wl, due, extra, due_at
+
+    def _restore_extra(self, idx, extra):
+        self.eases[idx], self.intervals[idx] = extra
+
+    def answer_hard(self, idx):
+        self.wrong_levels[idx] = self.wrong_levels.get(idx, 0) + 1
+        self.levels[idx] = 1
+        self.eases[idx] = max(MIN_EASE, self.eases.get(idx, START_EASE) - HARD_EASE_STEP)
+        self.intervals[idx] = 0.0
+        self.schedule(idx, self.now() + RELEARN_DELAY); self.set_due(idx, RELEARN_DELAY / DAY)
+        self.solve_count += 1
+
+    def answer_normal(self, idx):
+        new_lv = self.levels.get(idx, 0) + 1
+        ease = self.eases.setdefault(idx, START_EASE)
+        prev = self.intervals.get(idx, 0.0)
+        interval = prev * ease if prev and new_lv > len(FIRST_INTERVALS) else FIRST_INTERVALS[min(new_lv, len(FIRST_INTERVALS)) - 1]
+        mastered = interval > MASTERED_INTERVAL
+        if mastered:
+            self.mark_mastered(idx); self.eases.pop(idx, None); self.intervals.pop(idx, None)
+        else:
+            self.levels[idx] = new_lv; self.intervals[idx] = interval
+            self.schedule(idx, self.now() + int(interval * DAY)); self.set_due(idx, interval)
+        self.solve_count += 1
+        return mastered
@@ -0,0 +1,33 @@
+from .base import BaseScheduler
+from .fibo import FIBO_GAP
+
+
+class UniformScheduler(BaseScheduler):
+    # 비교 기준용: 미정복 카드 중 균등 무작위 출제 (복습 예약 없음)
+    # 정상 응답이 len(FIBO_GAP)번 쌓이거나 쉬움이면 정복
+    name = "random"
+    label = "무작위"
+
+    def now(self):
+        return self.solve_count
+
+    def upcoming(self, k):
+        pool = self._queue()[1]
+        return self.rng.sample(pool, min(k, len(pool))) if pool else []
+
+    def next(self):
+        pool = self._queue()[1]
+        return self.rng.choice(pool) if pool else super().next()
+
+    def answer_hard(self, idx):
+        self.wrong_levels[idx] = self.wrong_levels.get(idx, 0) + 1
+        self.levels[idx] = 1
+        self.solve_count += 1
+
+    def answer_normal(self, idx):
+        new_lv = self.levels.get(idx, 0) + 1
+        mastered = new_lv >= len(FIBO_GAP)
+        if mastered: self.mark_mastered(idx)
+        else: self.levels[idx] = new_lv
+        self.solve_count += 1
+        return mastered
@@ -0,0 +1,206 @@
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+_ROW_BITS = 21  # 행 번호 비트 (카드 200만 장까지), 글자 코드포인트도 21비트
+_ROW_MASK = (1 << _ROW_BITS) - 1
+
+
+def normalize(texts):
+    # NFC + 소문자 + 공백 제거 (띄어쓰기가 달라도 찾을 수 있게)
+    s = pd.Series(texts, dtype=object).fillna("").astype(str)
+    return s.str.normalize("NFC").str.lower().str.replace(r"\s+", "", regex=True).tolist()
+
+
+def frame_texts(df, columns=("질문", "정답")):
+    # 색인할 행별 원문: 질문 + 정답
+    cols = [df[c].astype(str) for c in columns if c in df.columns]
+    texts = cols[0]
+    for c in cols[1:]: texts = texts + " " + c
+    return texts.tolist()
+
+
+def grams(text):
+    # 검색어 하나의 n-gram 키: 한 글자면 unigram, 그 이상이면 bigram
+    cp = [ord(c) for c in text]
+    if len(cp) == 1: return {cp[0]}
+    return {(a << _ROW_BITS) | b for a, b in zip(cp, cp[1:])}
+
+
+class SearchIndex:
+    # 질문/정답 글자 n-gram 역색인 (형태소 분석 없이 한국어 부분 문자열 검색)
+    # - 키: 글자 하나(unigram) 또는 연속된 두 글자(bigram), 값: 그 키가 나오는 카드 행 (CSR 배열)
+    # - 빌드는 NumPy로 한 번에: 전체 텍스트를 코드포인트 배열로 바꿔 (키, 행) 쌍을 np.unique
+    # - 동기화 때는 행 재매핑 + 바뀐 카드만 작은 overlay에 추가, overlay가 커지면 다시 빌드
+    def __init__(self, texts, normalized=False):
+        self._texts = list(texts) if normalized else normalize(texts)
+        n = len(self._texts)
+        if n > _ROW_MASK: raise ValueError(f"검색 색인은 카드 {_ROW_MASK}장까지 지원합니다: {n}")
+        joined = "\x00".join(self._texts) + "\x00"
+        cp = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+        row = np.repeat(np.arange(n, dtype=np.int64), np.fromiter(map(len, self._texts), dtype=np.int64, count=n) + 1)
+        uni = cp != 0
+        bi = uni[:-1] & uni[1:]
+        keys = np.concatenate([cp[uni], (cp[:-1][bi] << _ROW_BITS) | cp[1:][bi]])
+        rows = np.concatenate([row[uni], row[:-1][bi]])
+        combo = np.sort((keys << _ROW_BITS) | rows)  # np.unique(해시 기반)보다 정렬 + 인접 비교가 훨씬 빠름
+        combo = combo[np.concatenate([[True], combo[1:] != combo[:-1]])]
+        k = combo >> _ROW_BITS
+        starts = np.flatnonzero(np.concatenate([[True], k[1:] != k[:-1]]))
+        self._keys, self._starts = k[starts], np.append(starts, len(combo))
+        self._rows = (combo & _ROW_MASK).astype(np.int32)
+        self._dead = None  # 정렬 배열의 항목이 낡은 행 (수정된 카드)
+        self._extra = {}  # 키 -> 수정/추가된 카드 행 집합
+        self._changed = set()
+
+    @classmethod
+    def from_frame(cls, df, columns=("질문", "정답")):
+        return cls(frame_texts(df, columns))
+
+    def __len__(self):
+        return len(self._texts)
+
+    def _postings(self, key):
+        i = np.searchsorted(self._keys, key)
+        rows = self._rows[self._starts[i]:self._starts[i + 1]] if i < len(self._keys) and self._keys[i] == key else self._rows[:0]
+        if self._dead is not None and len(rows): rows = rows[~self._dead[rows]]
+        extra = self._extra.get(key)
+        return np.union1d(rows, np.fromiter(extra, dtype=np.int32)) if extra else rows
+
+    def search(self, query, fuzzy=False, ratio=0.6):
+        # 공백으로 나눈 검색어를 모두 포함하는 카드 행 (정확 검색: 행 순서, fuzzy: 겹치는 n-gram 수 순)
+        terms = [t for t in normalize(str(query).split()) if t]
+        if not terms: return np.arange(len(self), dtype=np.int32)
+        if fuzzy: return self._fuzzy(terms, ratio)
+        found = None
+        for term in terms:
+            lists = sorted((self._postings(k) for k in grams(term)), key=len)
+            rows = lists[0]
+            for other in lists[1:]:
+                if not len(rows): break
+                rows = np.intersect1d(rows, other, assume_unique=True)
+            found = rows if found is None else np.intersect1d(found, rows, assume_unique=True)
+            if not len(found): break
+        # 세 글자 이상은 n-gram을 모두 가져도 순서가 다를 수 있어 실제 부분 문자열인지 확인
+        texts, long_terms = self._texts, [t for t in terms if len(t) > 2]
+        if long_terms: found = np.fromiter((r for r in found.tolist() if all(t in texts[r] for t in long_terms)), dtype=np.int32)
+        return np.sort(found)
+
+    def _fuzzy(self, terms, ratio):
+        # 오타/조사 차이 허용: 검색어 n-gram 중 ratio 이상을 가진 카드를 겹침 수 순으로
+        keys = set().union(*(grams(t) for t in terms))
+        hits = [self._postings(k) for k in keys]
+        score = np.bincount(np.concatenate(hits), minlength=len(self)) if hits else np.zeros(len(self), dtype=np.int64)
+        rows = np.flatnonzero(score >= max(1, int(ratio * len(keys))))
+        return rows[np.argsort(-score[rows], kind="stable")].astype(np.int32)
+
+    # --- 동기화 ---
+    def updated(self, diff, texts):
+        # 카드 ID 동기화 결과(DeckDiff)로 새 덱용 색인을 만듦 (원본은 다른 세션이 공유하므로 그대로 둠)
+        # texts: 새 덱의 행별 원문 (추가/수정된 행만 정규화해 씀)
+        out = object.__new__(SearchIndex)
+        out.__dict__.update(self.__dict__)
+        out._extra = {k: set(v) for k, v in self._extra.items()}
+        out._changed = set(self._changed)
+        n_new = len(texts)
+        if diff.structural:
+            m = np.asarray(diff.index_map, dtype=np.int64)
+            rows = m[self._rows]; keep = rows >= 0
+            kept = np.concatenate([[0], np.cumsum(keep)])
+            out._rows, out._starts = rows[keep].astype(np.int32), kept[self._starts]
+            out._dead = None
+            if self._dead is not None:
+                out._dead = np.zeros(n_new, dtype=bool)
+                old_dead = np.flatnonzero(self._dead[:len(m)]); moved = m[old_dead]
+                out._dead[moved[moved >= 0]] = True
+            out._extra = {k: {int(m[r]) for r in v if r < len(m) and m[r] >= 0} for k, v in out._extra.items()}
+            out._changed = {int(m[r]) for r in out._changed if r < len(m) and m[r] >= 0}
+            new_texts = [None] * n_new
+            for old, new in enumerate(m.tolist()):
+                if new >= 0: new_texts[new] = self._texts[old]
+            out._texts = new_texts
+        else:
+            out._texts = list(self._texts)
+            if self._dead is not None: out._dead = self._dead.copy()
+        changed = sorted(set(int(i) for i in diff.added) | set(int(i) for i in diff.edited) | {i for i, t in enumerate(out._texts) if t is None})
+        if out._dead is None or len(out._dead) != n_new:
+            dead = np.zeros(n_new, dtype=bool)
+            if out._dead is not None: dead[:min(n_new, len(out._dead))] = out._dead[:n_new]
+            out._dead = dead
+        for idx, text in zip(changed, normalize([texts[i] for i in changed])):
+            if out._texts[idx] is not None:
+                for k in _all_grams(out._texts[idx]) if idx in out._changed else ():
+                    s = out._extra.get(k)
+                    if s: s.discard(idx)
+            out._texts[idx] = text; out._dead[idx] = True; out._changed.add(idx)
+            for k in _all_grams(text): out._extra.setdefault(k, set()).add(idx)
+        if len(out._changed) > max(1000, n_new // 10): return SearchIndex(out._texts, normalized=True)
+        return out
+
+
+def _all_grams(text):
+    # 색인용: 글자 하나 + 연속 두 글자 모두
+    cp = [ord(c) for c in text]
+    return set(cp) | {(a << _ROW_BITS) | b for a, b in zip(cp, cp[1:])}
+
+
+# 공유 덱(프레임 객체)마다 색인 하나: 같은 덱을 보는 세션은 색인을 함께 씀, 덱이 버려지면 함께 정리
+_shared = {}
+_lock = threading.Lock()
+
+
+def shared_index(frame, columns=("질문", "정답")):
+    with _lock: index = _shared.get(id(frame))
+    return index if index is not None else adopt(frame, SearchIndex.from_frame(frame, columns))
+
+
+def sync_index(old_frame, new_frame, diff, columns=("질문", "정답")):
+    # 동기화: 이전 덱의 색인을 diff로 증분 갱신해 새 덱의 색인으로 등록 (다른 세션이 먼저 했으면 그것을 씀)
+    # 이전 덱의 색인이 없으면(아직 안 만듦) 새 덱은 처음 쓸 때 빌드
+    with _lock: index, old = _shared.get(id(new_frame)), _shared.get(id(old_frame))
+    if index is not None or old is None: return index
+    return adopt(new_frame, old.updated(diff, frame_texts(new_frame, columns)))
+
+
+def adopt(frame, index):
+    # 동기화로 증분 갱신한 색인을 새 공유 덱의 색인으로 등록 (이미 있으면 기존 것 사용)
+    with _lock:
+        if id(frame) in _shared: return _shared[id(frame)]
+        _shared[id(frame)] = index
+    weakref.finalize(frame, _shared.pop, id(frame), None)
+    return index
+
+
+def search_panel(frame, sched, key="search"):
+    # 사이드바 검색 학습: 검색어를 정하면 출제 대상을 검색 결과로 제한 (결과가 없으면 전체)
+    # 반환: 사용자가 검색어/옵션을 바꿨는지 (앱은 다음 문항을 다시 뽑음)
+    import streamlit as st
+    ss = st.session_state
+    index = shared_index(frame)  # 덱을 처음 그릴 때 빌드 (같은 덱의 세션끼리 공유)
+    query = st.text_input("🔎 주제로 골라 학습", key=key + "_query", placeholder="예: 임대차, 탄력성").strip()
+    fuzzy = st.checkbox("비슷한 표현도 (오타 허용)", key=key + "_fuzzy")
+    want = (query, fuzzy) if query else None
+    changed = ss.get(key + "_applied") != want
+    if changed or (want is not None and ss.get(key + "_count") and not sched.focused):  # 스케줄러 재생성/동기화 뒤 다시 적용
+        rows = index.search(query, fuzzy=fuzzy) if want else None
+        sched.focus(rows if rows is not None and len(rows) else None)
+        ss[key + "_applied"], ss[key + "_count"] = want, (None if rows is None else len(rows))
+    if want is not None:
+        n = ss.get(key + "_count") or 0
+        st.caption(f"검색 결과 {n}문항에서 출제" if n else "검색 결과 없음 · 전체에서 출제")
+    return changed
+
+
+def clear_search(key="search"):
+    # 버튼 on_click용: 검색어를 지우면 다음 실행에서 search_panel이 필터를 풀고 전체에서 출제
+    import streamlit as st
+    st.session_state[key + "_query"] = ""
+
+
+def search_done_panel(key="search"):
+    # 검색한 카드를 모두 정복 (FOCUS_DONE): 덱 전체 정복/초기화 화면 대신 검색 해제만 안내
+    import streamlit as st
+    st.markdown('<p class="question-text">🔎 검색한 문항을 모두 정복했습니다</p>', unsafe_allow_html=True)
+    st.button("검색 해제하고 전체에서 계속", on_click=clear_search, args=(key,))
@@ -0,0 +1,115 @@
+import io
+import os
+import re
+import struct
+import threading
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+import zlib
+from urllib.parse import quote
+
+import requests
+
+# 로컬 테스트 서버 등으로 교체 가능
+GSHEETS_BASE_URL = os.environ.get("GSHEETS_BASE_URL", "https://docs.google.com").rstrip("/")
+WORKBOOK_XML = "xl/workbook.xml"
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+
+
+def extract_sheet_id(url):
+    match = re.search(r"/d/([a-zA-Z0-9-_]+)", url)
+    return match.group(1) if match else None
+
+
+def gviz_csv_url(sheet_id, sheet_name):
+    return f"{GSHEETS_BASE_URL}/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={quote(sheet_name)}"
+
+
+def export_xlsx_url(sheet_id):
+    return f"{GSHEETS_BASE_URL}/spreadsheets/d/{sheet_id}/export?format=xlsx"
+
+
+# --- 시트 탭 이름 추출 (xl/workbook.xml만 읽음) ---
+def parse_workbook_xml(xml_bytes):
+    root = ET.fromstring(xml_bytes)
+    return [s.get("name") for s in root.iter(_NS + "sheet")]
+
+
+def workbook_sheet_names(data):
+    # 전체 xlsx 바이트: 중앙 디렉터리에서 workbook.xml 한 항목만 압축 해제
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        return parse_workbook_xml(zf.read(WORKBOOK_XML))
+
+
+def scan_for_workbook_xml(buf):
+    # 다운로드 중인 앞부분 바이트에서 로컬 헤더를 따라가며 workbook.xml을 찾음
+    # 반환: xml 바이트 / None(데이터 더 필요) / False(스트림 스캔 불가 -> 전체 다운로드)
+    pos = 0
+    while pos + _LOCAL_HEADER.size <= len(buf):
+        sig, _, flag, method, _, _, _, csize, _, nlen, elen = _LOCAL_HEADER.unpack_from(buf, pos)
+        if sig != b"PK\x03\x04": return False
+        if flag & 0x08 and csize == 0: return False  # 크기를 데이터 디스크립터에 둔 항목
+        start = pos + _LOCAL_HEADER.size + nlen + elen
+        if start > len(buf): return None
+        name = buf[pos + _LOCAL_HEADER.size:pos + _LOCAL_HEADER.size + nlen].decode("utf-8", "replace")
+        if name == WORKBOOK_XML:
+            if start + csize > len(buf): return None
+            raw = bytes(buf[start:start + csize])
+            if method == 0: return raw
+            if method == 8: return zlib.decompress(raw, -15)
+            return False
+        pos = start + csize
+    return None
+
+
+class WorkbookCache:
+    # 시트 ID별 탭 이름과 xlsx 바이트를 프로세스 공용으로 보관
+    # - sheet_names(): workbook.xml이 나오는 즉시 다운로드 중단 (이미지 많은 대용량 통합문서 대비)
+    # - workbook(): 전체 바이트가 필요할 때 받아두고, 탭 이름도 같은 바이트에서 재사용
+    def __init__(self, ttl=300, timeout=10, chunk_size=64 * 1024):
+        self.ttl = ttl
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self._names = {}
+        self._books = {}
+        self._lock = threading.Lock()
+
+    def _fresh(self, table, sheet_id):
+        with self._lock:
+            hit = table.get(sheet_id)
+        if hit and time.time() - hit[1] <= self.ttl: return hit[0]
+        return None
+
+    def _store(self, table, sheet_id, value):
+        with self._lock: table[sheet_id] = (value, time.time())
+        return value
+
+    def sheet_names(self, sheet_id):
+        names = self._fresh(self._names, sheet_id)
+        if names is not None: return names
+        data = self._fresh(self._books, sheet_id)
+        if data is not None: return self._store(self._names, sheet_id, workbook_sheet_names(data))
+        buf = bytearray()
+        with requests.get(export_xlsx_url(sheet_id), timeout=self.timeout, stream=True) as resp:
+            resp.raise_for_status()
+            found = None
+            for chunk in resp.iter_content(self.chunk_size):
+                buf += chunk
+                found = scan_for_workbook_xml(buf)
+                if found: return self._store(self._names, sheet_id, parse_workbook_xml(found))
+                if found is False: break
+            if found is False:  # 스캔 불가: 나머지를 마저 받음 (None으로 끝났으면 이미 전부 받았고 스트림은 다시 못 읽음)
+                for chunk in resp.iter_content(self.chunk_size): buf += chunk
+        data = self._store(self._books, sheet_id, bytes(buf))
+        return self._store(self._names, sheet_id, workbook_sheet_names(data))
+
+    def workbook(self, sheet_id):
+        data = self._fresh(self._books, sheet_id)
+        if data is not None: return data
+        resp = requests.get(export_xlsx_url(sheet_id), timeout=self.timeout)
+        resp.raise_for_status()
+        data = self._store(self._books, sheet_id, resp.content)
+        self._store(self._names, sheet_id, workbook_sheet_names(data))
+        return data
@@ -1,25 +1,46 @@
 import streamlit as st
 from streamlit_gsheets import GSheetsConnection
 import pandas as pd
-import random
 import streamlit.components.v1 as components
-import re
-import requests
-from urllib.parse import quote
+import io
+import hashlib
+import os
+import uuid
+from datetime import datetime
+from perf_trace import show_debug_panel, timed, tracer
+from due_index import show_forecast
+from deck_transfer import transfer_panel
+from flip_deck import flip_session, reset_flip
+from search_index import search_done_panel, search_panel, sync_index
+from scheduler import DEFAULT_STRATEGY, FOCUS_DONE, GRADUATED, STRATEGIES, WAITING, make_scheduler
+from deck_cache import DeckCache, merge_decks
+from write_queue import SheetWriter, WriteBehindQueue
+from review_store import ReviewStore
+from card_identity import apply_mastered, card_ids, sync_deck
+from deck_stats import DeckStats
+from deck_store import DeckView, compact_deck
+from image_cache import ImageCache
+from local_deck import load_local_deck, local_sheet_names, local_version
+from sheet_source import WorkbookCache, extract_sheet_id, gviz_csv_url
 
 # 1. 페이지 설정
 st.set_page_config(page_title="감평 최종 인출기", layout="wide")
 
-# 2. 세션 설정
-FIBO_GAP = [0, 5, 13, 21, 34, 55, 89, 144] 
+# 2. 세션 설정 (피보나치 간격은 scheduler.FIBO_GAP)
 if 'state' not in st.session_state: st.session_state.state = "IDLE"
 if 'current_index' not in st.session_state: st.session_state.current_index = None
-if 'q_levels' not in st.session_state: st.session_state.q_levels = {} 
-if 'q_wrong_levels' not in st.session_state: st.session_state.q_wrong_levels = {}
-if 'schedules' not in st.session_state: st.session_state.schedules = {} 
-if 'solve_count' not in st.session_state: st.session_state.solve_count = 0
+if 'scheduler' not in st.session_state: st.session_state.scheduler = None
 if 'last_msg' not in st.session_state: st.session_state.last_msg = "데이터 로드 준비 중..."
 if 'sheet_name' not in st.session_state: st.session_state.sheet_name = None
+if 'sheet_names' not in st.session_state: st.session_state.sheet_names = None  # 여러 시트 함께 학습 모드
+
+# 성능 측정: secrets의 debug_timing = true (또는 STUDY_TRACE=1)일 때만 켜짐, 구간별 시간은 trace_path(JSONL)에 기록
+@st.cache_resource
+def setup_tracing():
+    tracer.configure(st.secrets.get("debug_timing", False) or os.environ.get("STUDY_TRACE") == "1", st.secrets.get("trace_path", ".study_cache/trace.jsonl"))
+    return tracer
+if 'trace_session' not in st.session_state: st.session_state.trace_session = uuid.uuid4().hex[:8]
+setup_tracing().begin_run(st.session_state.trace_session)
 
 # 3. 디자인 설정 (PC 2/3, 모바일 1/2 유지)
 st.markdown("""
@@ -50,24 +71,32 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # 4. 데이터 로드 로직
+# 오프라인 우선 모드: offline_deck(로컬 xlsx/CSV/Parquet)으로 학습, 응답은 로컬에 기록 (write_back 설정 시 시트에는 백그라운드로 반영)
+OFFLINE_DECK = st.secrets.get("offline_deck") or os.environ.get("STUDY_OFFLINE_DECK")
+
 @st.cache_data(ttl=60)
 def get_sheet_id():
     try:
-        url = st.secrets["gsheets_url"].strip()
-        match = re.search(r"/d/([a-zA-Z0-9-_]+)", url)
-        return match.group(1) if match else None
+        return extract_sheet_id(st.secrets["gsheets_url"].strip())
     except: return None
 
-@st.cache_data(ttl=300)
+def deck_key():
+    # 복습 상태 저장 키: 시트 ID (시트 없이 로컬 덱만 쓰면 파일 경로)
+    return get_sheet_id() or f"local:{os.path.abspath(OFFLINE_DECK or '')}"
+
+# 탭 목록: xlsx 전체 파싱 대신 xl/workbook.xml만 읽음 (시트 ID별 캐시, 받아둔 바이트 재사용)
+@st.cache_resource
+def get_workbook_cache():
+    return WorkbookCache(ttl=300)
+
+@timed("sheet_names")
 def get_all_sheet_names():
+    if OFFLINE_DECK:
+        try: return local_sheet_names(OFFLINE_DECK)
+        except: return []
     sheet_id = get_sheet_id()
     if not sheet_id: return []
-    try:
-        export_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=xlsx"
-        resp = requests.get(export_url, timeout=10)
-        resp.raise_for_status()
-        xls = pd.ExcelFile(resp.content)
-        return xls.sheet_names
+    try: return get_workbook_cache().sheet_names(sheet_id)
     except: return []
 
 # 구글 드라이브 이미지 변환
@@ -77,29 +106,165 @@ def convert_google_drive_link(url):
         return f"https://drive.google.com/uc?id={file_id}"
     return url
 
-@st.cache_data(ttl=1)
-def load_data(sheet_name):
+def card_image_url(row):
+    if '이미지' in row and pd.notna(row['이미지']) and str(row['이미지']).strip() != "":
+        return convert_google_drive_link(str(row['이미지']).strip())
+    return None
+
+# 이미지 캐시: 표시 해상도로 축소해 메모리/디스크 LRU에 보관 (실패 시 원본 URL 표시)
+@st.cache_resource
+def get_image_cache():
+    return ImageCache()
+
+@timed("show_image")
+def show_card_image(row):
+    img_url = card_image_url(row)
+    if img_url: st.image(get_image_cache().get(img_url) or img_url, use_container_width=True)
+
+# 빠른 넘기기용: 카드 영역(높이 320px)에 맞춘 작은 축소본을 data URL로 넘김 (묶음 10장 왕복 크기 제한)
+@st.cache_resource
+def get_flip_image_cache():
+    return ImageCache(cache_dir=".study_cache/images_flip", max_width=640, disk_bytes=50 * 1024 * 1024)
+
+@timed("prefetch_images")
+def prefetch_flip_images(rows):
+    get_flip_image_cache().prefetch([u for u in (card_image_url(df.row(i)) for i in rows) if u])
+
+@timed("prefetch_images")
+def prefetch_upcoming_images(k=4):
+    urls = [card_image_url(df.row(i)) for i in sched.upcoming(k) if i < len(df)]
+    get_image_cache().prefetch([u for u in urls if u])
+
+def to_deck(df):
+    df.columns = [str(c).strip() for c in df.columns]
+    
+    if '이미지' not in df.columns: df['이미지'] = pd.NA
+    
+    cols = ['질문', '정답', '정답횟수', '오답횟수', '어려움횟수', '정상횟수', '쉬움횟수', '이미지', 'ID']
+    df = df[[c for c in cols if c in df.columns]]
+    
+    df = df.dropna(subset=['질문']).reset_index(drop=True)
+    for col in ['정답횟수', '오답횟수', '어려움횟수', '정상횟수', '쉬움횟수']:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col]).fillna(0).astype(int)
+    return compact_deck(df)
+
+def fetch_deck(key):
+    sheet_id, sheet_name = key.split("/", 1)
+    try:
+        try: df = pd.read_csv(gviz_csv_url(sheet_id, sheet_name))
+        except Exception: df = pd.read_excel(io.BytesIO(workbooks.workbook(sheet_id)), sheet_name=sheet_name)  # gviz 실패 시 xlsx에서 로드
+        return to_deck(df)
+    except: return None
+
+# 디스크 덱 캐시: 즉시 반환 + 주기적 백그라운드 갱신 (deck_refresh_sec, 기본 300초)
+@st.cache_resource
+def get_deck_cache():
+    return DeckCache(fetch_deck, cache_dir=".study_cache/decks/study", refresh_interval=st.secrets.get("deck_refresh_sec", 300))
+
+@timed("load_data")
+def load_data(sheet_name, refresh=False):
+    if OFFLINE_DECK: return load_offline([sheet_name])
+    sheet_id = get_sheet_id()
+    if not sheet_id: return None
+    cache = get_deck_cache(); key = f"{sheet_id}/{sheet_name}"
+    df = cache.refresh(key) if refresh else cache.get(key)
+    return None if df is None else DeckView(df)
+
+# 병합 덱도 (캐시 키 목록, 각 시트 내용 버전)마다 프로세스에 하나만 보관, '시트' 열에는 탭 이름
+@st.cache_resource(max_entries=16)
+def shared_merged_deck(keys, sheet_names, versions, _decks):
+    return compact_deck(merge_decks(dict(zip(sheet_names, _decks))))
+
+# 여러 시트: 동시에 가져와 ('시트', '행') 키로 하나의 덱으로 병합
+@timed("load_data")
+def load_multi(sheet_names, refresh=False):
+    if OFFLINE_DECK: return load_offline(sheet_names)
     sheet_id = get_sheet_id()
     if not sheet_id: return None
+    cache = get_deck_cache(); keys = [f"{sheet_id}/{n}" for n in sheet_names]
+    decks = cache.get_many(keys, refresh=refresh)
+    df = shared_merged_deck(tuple(keys), tuple(sheet_names), tuple(cache.version(k) for k in keys), decks)
+    return None if df is None else DeckView(df)
+
+# 로컬 덱: 탭/파일 버전마다 프로세스에 하나 (memory-map Feather), 이 파일 기준으로 쌓인 로컬 카운터를 overlay로 복원
+@st.cache_resource(max_entries=16)
+def shared_local_deck(path, sheet_name, version):
+    return load_local_deck(path, to_deck, cache_dir=".study_cache/local/study", sheet_name=sheet_name if path.lower().endswith(".xlsx") else 0)
+
+def load_offline(sheet_names):
     try:
-        encoded_name = quote(sheet_name)
-        csv_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={encoded_name}"
-        df = pd.read_csv(csv_url)
-        df.columns = [c.strip() for c in df.columns]
-        
-        if '이미지' not in df.columns: df['이미지'] = pd.NA
-        
-        cols = ['질문', '정답', '정답횟수', '오답횟수', '어려움횟수', '정상횟수', '쉬움횟수', '이미지']
-        df = df[[c for c in cols if c in df.columns]]
-        
-        df = df.dropna(subset=['질문']).reset_index(drop=True)
-        for col in ['정답횟수', '오답횟수', '어려움횟수', '정상횟수', '쉬움횟수']:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col]).fillna(0).astype(int)
-        return df
-    except: return None
+        version = local_version(OFFLINE_DECK)
+        decks = [shared_local_deck(OFFLINE_DECK, n, version) for n in sheet_names]
+    except Exception: return None
+    base = decks[0] if len(decks) == 1 else shared_merged_deck(tuple(f"local:{OFFLINE_DECK}/{n}" for n in sheet_names), tuple(sheet_names), (version,) * len(decks), decks)
+    if base is None: return None
+    view = DeckView(base); pos = {c: i for i, c in enumerate(card_ids(base))}
+    for card, changes in get_review_store().load_counts(deck_key(), version).items():
+        if card in pos: view.add(pos[card], changes)
+    return view
+
+def reload_deck(refresh=False):
+    if st.session_state.sheet_names: return load_multi(st.session_state.sheet_names, refresh=refresh)
+    return load_data(st.session_state.sheet_name, refresh=refresh)
+
+# 시트 반영(write_back 설정 시): 병합 덱의 행을 원래 탭/행으로 돌려 기록
+@st.cache_resource
+def get_write_queue(sheet_name):
+    url = st.secrets.get("gsheets_url", "").strip()
+    if not url: return None  # 시트 없이 로컬 덱만 사용
+    os.makedirs(".study_cache", exist_ok=True)
+    journal = os.path.join(".study_cache", f"journal_{hashlib.sha1(f'{url}/{sheet_name}'.encode()).hexdigest()[:12]}.jsonl")
+    conn = st.connection("gsheets", type=GSheetsConnection)
+    cache, key = get_deck_cache(), f"{get_sheet_id()}/{sheet_name}"  # 반영된 증감분은 공유 덱 캐시에도 더함
+    return WriteBehindQueue(SheetWriter(conn, url, worksheet=sheet_name, by_header=True), journal, on_flush=lambda batch: cache.apply(key, batch))
+
+# 복습 레벨/일정은 카드 ID 기준으로 SQLite에 보관 (새로고침/재시작 후에도 유지, 시트 ID 단위)
+@st.cache_resource
+def get_review_store():
+    return ReviewStore()
+
+# 출제 전략은 덱마다 선택 (사이드바, ReviewStore에 저장 / 기본값은 secrets의 scheduler)
+# 복습 상태는 전략별로 따로 보관 (피보나치는 기존 키 그대로)
+def get_strategy(deck):
+    return get_review_store().strategy(deck) or st.secrets.get("scheduler", DEFAULT_STRATEGY)
+
+def review_key(deck, strategy):
+    return deck if strategy == DEFAULT_STRATEGY else f"{deck}#{strategy}"
+
+def new_scheduler(dataframe):
+    s = make_scheduler(get_strategy(deck_key()), dataframe['정답횟수'], serve_future=False); st.session_state.card_ids = card_ids(dataframe)
+    pos = {c: i for i, c in enumerate(st.session_state.card_ids)}
+    solve_count, states = get_review_store().load(review_key(deck_key(), s.name))
+    s.restore(solve_count, {pos[c]: v for c, v in states.items() if c in pos})
+    apply_mastered(dataframe, st.session_state.card_ids, [c for c, v in states.items() if v[5]], s)  # write_back 꺼짐에서도 정복 카드는 정복으로 표시
+    return s
+
+@timed("record_answer")
+def record_answer(q_idx, deltas, grade):
+    # 스케줄러 갱신 후 호출: 복습 상태(SQLite) + 시트 카운터 기록
+    card = st.session_state.card_ids[q_idx]
+    lv, wl, due, extra, due_at = sched.card_state(q_idx)
+    get_review_store().record(review_key(deck_key(), sched.name), card, lv, wl, due, sched.solve_count, extra, due_at, grade, sched.is_mastered(q_idx))
+    deltas = {col: d for col, d in deltas.items() if col in df.columns}
+    df.add(q_idx, deltas)
+    stats.apply(q_idx, deltas)
+    if OFFLINE_DECK: get_review_store().add_counts(deck_key(), local_version(OFFLINE_DECK), card, deltas)
+    if not st.secrets.get("write_back", False): return
+    if '시트' in df.columns: sheet, card = df.value(q_idx, '시트'), tab_card_ids()[df.value(q_idx, '시트')][int(df.value(q_idx, '행'))]
+    else: sheet = st.session_state.sheet_name
+    queue = get_write_queue(sheet)
+    if queue is not None: queue.record(card, deltas)  # 행 위치는 시트 편집/오프라인 덱에서 어긋날 수 있어 카드 ID로 기록
+
+def tab_card_ids():
+    # 병합 덱: 탭 안에서의 카드 ID (같은 내용이 여러 탭에 있으면 병합 덱 기준 #n 접미사가 시트와 달라짐)
+    base = df.base; cached = st.session_state.get('tab_card_ids')
+    if cached is None or cached[0] is not base:
+        st.session_state.tab_card_ids = cached = (base, {name: card_ids(part) for name, part in base.groupby('시트', sort=False)})
+    return cached[1]
 
 # [로직 변경] 시트 선택창 제거 -> 첫 번째 시트 자동 로드
+workbooks = get_workbook_cache()
 sheet_list = get_all_sheet_names()
 
 if 'df' not in st.session_state or st.session_state.df is None:
@@ -107,22 +272,77 @@ if 'df' not in st.session_state or st.session_state.df is None:
     if st.session_state.sheet_name is None:
         st.session_state.sheet_name = sheet_list[0] if sheet_list else "시트18"
     
-    st.session_state.df = load_data(st.session_state.sheet_name)
+    st.session_state.df = reload_deck()
 
 df = st.session_state.df
+if df is not None and st.session_state.scheduler is None: st.session_state.scheduler = new_scheduler(df); st.session_state.stats = DeckStats(df)
+sched = st.session_state.scheduler; stats = st.session_state.get('stats')
+
+with st.sidebar:
+    strategies = list(STRATEGIES)
+    picked_strategy = st.selectbox("출제 방식", strategies, index=strategies.index(sched.name) if sched else 0, format_func=lambda n: STRATEGIES[n].label, disabled=sched is None)
+    if sched is not None and picked_strategy != sched.name:
+        get_review_store().set_strategy(deck_key(), picked_strategy)
+        st.session_state.scheduler = None; st.session_state.state = "IDLE"; st.session_state.current_index = None; st.rerun()
+    st.toggle("⚡ 빠른 넘기기", value=st.secrets.get("client_flip", True), key="client_flip", help="정답 확인/채점을 브라우저에서 처리하고 10문항마다 한 번에 저장")
+    if sched is not None and search_panel(df.base, sched) and st.session_state.state != "IDLE":
+        st.session_state.current_index = None if st.session_state.client_flip else sched.next(); st.session_state.state = "QUESTION"; reset_flip()
+    if sched is not None: show_forecast(sched.due_index)
+    if sched is not None: transfer_panel(df, st.session_state.card_ids, get_review_store(), review_key(deck_key(), sched.name), st.session_state.sheet_name)
 
-# 5. 출제 로직
+# 5. 출제 로직 (heap 기반 O(log n))
+@timed("next_question")
 def get_next_question(dataframe):
     if dataframe is None or len(dataframe) == 0: return None
-    curr_cnt = st.session_state.solve_count
-    all_scheduled = [idx for sublist in st.session_state.schedules.values() for idx in sublist]
-    available_new = [i for i in range(len(dataframe)) if int(dataframe.iloc[i]['정답횟수']) < 5 and i not in all_scheduled]
-    pending_keys = sorted([k for k in st.session_state.schedules.keys() if k <= curr_cnt and st.session_state.schedules[k]])
-    if available_new and pending_keys:
-        return random.choice(available_new) if random.random() < 0.5 else st.session_state.schedules[pending_keys[0]].pop(0)
-    if available_new: return random.choice(available_new)
-    if pending_keys: return st.session_state.schedules[pending_keys[0]].pop(0)
-    return "GRADUATED"
+    return st.session_state.scheduler.next()
+
+def start_question():
+    # 빠른 넘기기는 flip_session이 묶음을 직접 뽑으므로 미리 꺼내지 않음 (꺼낸 복습 카드는 예약 슬롯을 잃음)
+    st.session_state.current_index = None if st.session_state.client_flip else get_next_question(df); st.session_state.state = "QUESTION"
+
+GRADE_LABELS = ["어려움 (1/Ctrl)", "정상 (2/Alt)", "너무 쉬움 (3)"]
+
+def grade_card(q_idx, grade):
+    # 0 어려움 / 1 정상 / 2 쉬움 (버튼과 빠른 넘기기 공용)
+    if grade == 0: sched.answer_hard(q_idx); record_answer(q_idx, {'오답횟수': 1}, grade)
+    elif grade == 1:
+        deltas = {'정상횟수': 1}
+        if sched.answer_normal(q_idx): deltas['정답횟수'] = 5 - int(df.value(q_idx, '정답횟수'))
+        record_answer(q_idx, deltas, grade)
+    else: sched.answer_easy(q_idx); record_answer(q_idx, {'정답횟수': 5 - int(df.value(q_idx, '정답횟수')), '쉬움횟수': 1}, grade)
+
+def flip_card(idx):
+    # 이미지는 캐시된 축소본 (prefetch_flip_images로 묶음 전체를 동시에 받아둠, 실패 시 원본 URL)
+    row = df.row(idx); c_lv = sched.levels.get(idx, 0); url = card_image_url(row)
+    img = url and (get_flip_image_cache().data_url(url) or url)
+    return {"q": str(row["질문"]), "a": str(row["정답"]), "img": img, "badge": "🆕 신규 문항" if c_lv == 0 else f"🔥 복습 Lv.{c_lv}"}
+
+with st.sidebar:
+    picked = st.multiselect("📚 여러 시트 함께 학습", sheet_list, default=[n for n in (st.session_state.sheet_names or []) if n in sheet_list])
+    if st.button("선택한 시트 불러오기", key="multi_load_btn", disabled=not picked):
+        st.session_state.sheet_names = picked if len(picked) > 1 else None
+        st.session_state.sheet_name = " + ".join(picked)
+        st.session_state.df = None; st.session_state.scheduler = None; st.session_state.state = "IDLE"; st.session_state.current_index = None; st.rerun()
+
+# 동기화: 카드 ID로 새 덱과 비교해 추가/삭제/수정분만 반영 (복습 상태 유지)
+def apply_sync(new_df):
+    if new_df is None: return
+    new_ids = card_ids(new_df.base)
+    if not st.secrets.get("write_back", False) and not OFFLINE_DECK:
+        # 시트에 반영하지 않은 세션 증감분은 새 덱으로 옮김 (그러지 않으면 비교에서 '수정'으로 보여 정복이 풀림)
+        pos = {c: i for i, c in enumerate(new_ids)}
+        new_df.carry(df, [pos.get(c, -1) for c in st.session_state.card_ids])
+    st.session_state.card_ids, diff = sync_deck(df.frame(), st.session_state.card_ids, new_df.frame(), sched, stats, new_ids)
+    apply_mastered(new_df, new_ids, get_review_store().mastered(review_key(deck_key(), sched.name)), sched, stats)
+    sync_index(df.base, new_df.base, diff)
+    if diff.structural: reset_flip()
+    cur = st.session_state.current_index
+    if isinstance(cur, int) and diff.structural:
+        moved = int(diff.index_map[cur]) if cur < len(diff.index_map) else -1
+        if moved >= 0: st.session_state.current_index = moved
+        else: st.session_state.current_index = sched.next(); st.session_state.state = "QUESTION"
+    st.session_state.df = new_df
+    st.session_state.last_msg = f"동기화 완료: 추가 {len(diff.added)} · 삭제 {len(diff.removed)} · 수정 {len(diff.edited)}"
 
 # --- 6. 메인 화면 ---
 if df is not None and not df.empty:
@@ -130,81 +350,82 @@ if df is not None and not df.empty:
     t_col1, t_col2, t_col3 = st.columns([6, 2, 2])
     with t_col2:
         if st.button("🔄 동기화", key="sync_btn"):
-            st.cache_data.clear(); st.session_state.df = load_data(st.session_state.sheet_name); st.rerun()
+            if st.secrets.get("write_back", False):
+                for queue in map(get_write_queue, df['시트'].unique() if '시트' in df.columns else [st.session_state.sheet_name]):
+                    if queue is not None: queue.flush()
+            apply_sync(reload_deck(refresh=True)); st.rerun()
     with t_col3:
         # [확인 완료] 오답노트 다운로드 버튼
+        # 어려움 순위는 증분 유지, CSV는 클릭 시에만 생성
         if '어려움횟수' in df.columns:
-            diff_df = df[df['어려움횟수'] > 0].sort_values(by='어려움횟수', ascending=False)
-            if not diff_df.empty:
-                csv = diff_df.to_csv(index=False).encode('utf-8-sig')
-                st.download_button(label="📥 오답노트", data=csv, file_name=f'{st.session_state.sheet_name}_오답.csv', mime='text/csv')
+            if stats.has_wrong_notes:
+                st.download_button(label="📥 오답노트", data=lambda: stats.wrong_note_csv(df), file_name=f'{st.session_state.sheet_name}_오답.csv', mime='text/csv')
             else:
                 st.button("📥 오답 없음", disabled=True)
 
     if isinstance(st.session_state.current_index, int) and st.session_state.current_index >= len(df):
         st.session_state.current_index = get_next_question(df)
+    if st.session_state.current_index is None and st.session_state.state != "IDLE" and not st.session_state.client_flip:
+        st.session_state.current_index = get_next_question(df)  # 빠른 넘기기를 끈 직후
 
     _, col, _ = st.columns([1, 10, 1])
     with col:
         st.markdown(f'<p class="feedback-text">{st.session_state.last_msg}</p>', unsafe_allow_html=True)
-        if st.session_state.current_index == "GRADUATED":
+        if st.session_state.current_index == GRADUATED:
             st.markdown(f'<p class="question-text">🎊 {st.session_state.sheet_name} 정복! 🎊</p>', unsafe_allow_html=True)
             if st.button("다시 시작"):
-                st.session_state.q_levels = {}; st.session_state.solve_count = 0; st.session_state.state = "IDLE"; st.session_state.current_index = None; st.rerun()
+                sched.reset(df['정답횟수']); get_review_store().clear(review_key(deck_key(), sched.name)); st.session_state.state = "IDLE"; st.session_state.current_index = None; st.rerun()
+        elif st.session_state.current_index == FOCUS_DONE: search_done_panel()
+        elif st.session_state.current_index == WAITING:
+            # 시간 기반 전략: 지금 복습할 카드가 없음 (다음 복습 시각 안내)
+            st.markdown(f'<p class="question-text">⏳ 오늘 복습 완료 · 다음 복습 {datetime.fromtimestamp(sched.next_due()):%m/%d %H:%M}</p>', unsafe_allow_html=True)
+            if st.button("다시 확인"): start_question(); st.rerun()
         elif st.session_state.state == "IDLE":
             st.markdown(f'<p class="question-text">[{st.session_state.sheet_name}] 준비 완료</p>', unsafe_allow_html=True)
-            if st.button("훈련 시작 (Space)"):
-                st.session_state.current_index = get_next_question(df); st.session_state.state = "QUESTION"; st.rerun()
+            if st.button("훈련 시작 (Space)"): start_question(); st.rerun()
+        elif st.session_state.client_flip:
+            # 빠른 넘기기: 10문항 묶음을 브라우저에서 풀고 채점은 묶음 단위로 반영
+            idle = flip_session(sched, flip_card, grade_card, GRADE_LABELS, prepare=prefetch_flip_images)
+            if idle is not None: st.session_state.current_index = idle; st.rerun()
         elif st.session_state.state == "QUESTION":
-            row = df.iloc[st.session_state.current_index]
-            c_lv = st.session_state.q_levels.get(st.session_state.current_index, 0)
+            row = df.row(st.session_state.current_index)
+            c_lv = sched.levels.get(st.session_state.current_index, 0)
             
-            # 이미지 처리
-            if '이미지' in row and pd.notna(row['이미지']) and str(row['이미지']).strip() != "":
-                img_url = convert_google_drive_link(str(row['이미지']).strip())
-                st.image(img_url, use_container_width=True)
+            # 이미지 처리 (캐시된 축소본, 다음 카드 이미지는 미리 받아둠)
+            show_card_image(row); prefetch_upcoming_images()
             
             st.markdown(f'<div style="text-align:center;"><span class="status-badge badge-new">🆕 신규 문항</span></div>' if c_lv == 0 else f'<div style="text-align:center;"><span class="status-badge badge-review">🔥 복습 Lv.{c_lv}</span></div>', unsafe_allow_html=True)
-            w_bars = "█" * min(st.session_state.q_wrong_levels.get(st.session_state.current_index, 0), 15); w_empty = "░" * (15 - len(w_bars))
+            w_bars = "█" * min(sched.wrong_levels.get(st.session_state.current_index, 0), 15); w_empty = "░" * (15 - len(w_bars))
             c_bars = "█" * min(c_lv, 15); c_empty = "░" * (15 - len(c_bars))
             st.markdown(f'<div class="dual-gauge-container"><div class="gauge-row"><span class="wrong-side">{w_empty}{w_bars}</span><span class="center-line">|</span><span class="correct-side">{c_bars}{c_empty}</span></div></div>', unsafe_allow_html=True)
             st.markdown(f'<p class="question-text">Q. {row["질문"]}</p>', unsafe_allow_html=True)
             if st.button("정답 확인 (Space)"): st.session_state.state = "ANSWER"; st.rerun()
         elif st.session_state.state == "ANSWER":
-            row = df.iloc[st.session_state.current_index]; q_idx = st.session_state.current_index
-            
-            if '이미지' in row and pd.notna(row['이미지']) and str(row['이미지']).strip() != "":
-                img_url = convert_google_drive_link(str(row['이미지']).strip())
-                st.image(img_url, use_container_width=True)
+            row = df.row(st.session_state.current_index); q_idx = st.session_state.current_index
+            show_card_image(row)
 
             st.markdown(f'<p class="answer-text">A. {row["정답"]}</p>', unsafe_allow_html=True)
             c1, c2, c3 = st.columns(3)
-            with c1:
-                if st.button("어려움 (1/Ctrl)"):
-                    st.session_state.q_wrong_levels[q_idx] = st.session_state.q_wrong_levels.get(q_idx, 0) + 1; st.session_state.q_levels[q_idx] = 1; df.at[q_idx, '오답횟수'] += 1
-                    st.session_state.schedules.setdefault(st.session_state.solve_count + 5, []).append(q_idx); st.session_state.solve_count += 1; st.session_state.current_index = get_next_question(df); st.session_state.state = "QUESTION"; st.rerun()
-            with c2:
-                if st.button("정상 (2/Alt)"):
-                    new_lv = st.session_state.q_levels.get(q_idx, 0) + 1; df.at[q_idx, '정상횟수'] += 1
-                    if new_lv > 7: df.at[q_idx, '정답횟수'] = 5; del st.session_state.q_levels[q_idx]
-                    else: st.session_state.q_levels[q_idx] = new_lv; st.session_state.schedules.setdefault(st.session_state.solve_count + FIBO_GAP[new_lv], []).append(q_idx)
-                    st.session_state.solve_count += 1; st.session_state.current_index = get_next_question(df); st.session_state.state = "QUESTION"; st.rerun()
-            with c3:
-                if st.button("너무 쉬움 (3)"):
-                    df.at[q_idx, '정답횟수'] = 5; df.at[q_idx, '쉬움횟수'] += 1
-                    st.session_state.solve_count += 1; st.session_state.current_index = get_next_question(df); st.session_state.state = "QUESTION"; st.rerun()
-
-        tot = len(df); m_q = len(df[df['정답횟수'] >= 5]); r_q = len(st.session_state.q_levels); n_q = tot - m_q - r_q
+            for grade, (c, label) in enumerate(zip((c1, c2, c3), GRADE_LABELS)):
+                if c.button(label):
+                    grade_card(q_idx, grade)
+                    st.session_state.current_index = get_next_question(df); st.session_state.state = "QUESTION"; st.rerun()
+
+        tot = stats.total; m_q, r_q, n_q = stats.counts(len(sched.levels))
         st.markdown(f'<div class="progress-container"><div class="bar-mastered" style="width:{(m_q/tot)*100}%"></div><div class="bar-review" style="width:{(r_q/tot)*100}%"></div><div class="bar-new" style="width:{(n_q/tot)*100}%"></div></div>', unsafe_allow_html=True)
         st.markdown(f'<div style="display:flex; justify-content:space-between; padding:5px; font-size:0.8rem;"><p>✅{m_q}</p><p>🔥{r_q}</p><p>🆕{n_q}</p></div>', unsafe_allow_html=True)
 else:
     st.error(f"⚠️ '{st.session_state.sheet_name}' 시트를 불러오지 못했습니다.")
     st.info("1. requirements.txt에 openpyxl이 있는지 확인하세요.\n2. 구글 시트 공유가 '뷰어'로 되어 있는지 확인하세요.")
 
+if tracer.enabled:
+    with st.sidebar: show_debug_panel(st.session_state.trace_session)
+
 components.html("""
 <script>
     const doc = window.parent.document;
     doc.addEventListener('keydown', function(e) {
+        const t = e.target; if (t && (t.tagName === 'INPUT' || t.tagName === 'TEXTAREA' || t.isContentEditable)) return;  // 검색창 등 입력 중에는 단축키 없음
         if (e.code === 'Space') { e.preventDefault(); const btn = Array.from(doc.querySelectorAll('button')).find(el => el.innerText.includes('확인') || el.innerText.includes('시작')); if (btn) btn.click(); }
         else if (e.key === '1' || e.key === 'Control') { const btn = Array.from(doc.querySelectorAll('button')).find(el => el.innerText.includes('어려움')); if (btn) btn.click(); }
         else if (e.key === '2' || e.key === 'Alt') { e.preventDefault(); const btn = Array.from(doc.querySelectorAll('button')).find(el => el.innerText.includes('정상')); if (btn) btn.click(); }
@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# 저장소 최상위 모듈(scheduler, write_queue 등)을 그대로 import
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+COUNTERS = ['정답횟수', '오답횟수', '어려움횟수', '정상횟수', '쉬움횟수']
+
+
+def small_deck(n):
+    # 질문/정답 + 카운터 0으로 된 n장짜리 시트
+    return pd.DataFrame({'질문': [f"질문 {i}" for i in range(n)], '정답': [f"정답 {i}" for i in range(n)], **{c: 0 for c in COUNTERS}})
+
+
+def click(at, label):
+    # AppTest: label이 들어간 (활성) 버튼을 눌러 다시 실행, 없으면 False
+    for b in at.button:
+        if label in str(b.label) and not b.disabled:
+            b.click(); at.run()
+            assert not at.exception
+            return True
+    return False
+
+
+@pytest.fixture
+def fake_sheet_app(tmp_path, monkeypatch):
+    # 앱을 AppTest로 실행할 때 구글 시트 대신 benchmarks/fake_sheets 사용 (작업 폴더는 tmp_path)
+    pytest.importorskip("streamlit_gsheets")
+    import streamlit as st
+    import streamlit_gsheets
+    import sheet_source
+    sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+    from fake_sheets import REQUESTS, FakeGSheetsConnection, FakeSheets, LocalSheetsServer
+    monkeypatch.setattr(streamlit_gsheets, "GSheetsConnection", FakeGSheetsConnection)
+    monkeypatch.chdir(tmp_path)
+    st.cache_resource.clear(); st.cache_data.clear()
+    with LocalSheetsServer() as base_url:
+        monkeypatch.setattr(sheet_source, "GSHEETS_BASE_URL", base_url)
+        yield FakeSheets, REQUESTS
+    st.cache_resource.clear(); st.cache_data.clear()
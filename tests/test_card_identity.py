@@ -0,0 +1,61 @@
+import pandas as pd
+
+from card_identity import apply_mastered, card_ids, diff_decks, sync_deck
+from conftest import small_deck
+from deck_stats import DeckStats
+from deck_store import DeckView
+from scheduler import MASTERED_COUNT, FiboScheduler
+
+
+def test_card_ids_follow_content_not_position():
+    df = pd.DataFrame({'질문': ["가", "나", "가"], '정답': ["1", "2", "1"]})
+    ids = card_ids(df)
+    assert ids[2] == ids[0] + "#1"  # 같은 내용이 반복되면 접미사
+    assert card_ids(df.iloc[[1, 0, 2]].reset_index(drop=True)) == [ids[1], ids[0], ids[2]]
+    assert card_ids(df.assign(ID=["a", "b", "c"])) == ["a", "b", "c"]
+
+
+def test_diff_decks_reports_added_removed_edited():
+    old = small_deck(4)
+    new = pd.concat([old.iloc[[0, 2, 3]], small_deck(5).iloc[[4]]], ignore_index=True)
+    new.loc[1, '정답횟수'] = 2
+    diff = diff_decks(old, card_ids(old), new, card_ids(new))
+    assert diff.index_map.tolist() == [0, -1, 1, 2]
+    assert diff.added == [3] and diff.removed == [1] and diff.edited == [1] and diff.structural
+    same = diff_decks(old, card_ids(old), old.copy(), card_ids(old))
+    assert not same.structural and same.edited == [] and same.added == same.removed == []
+
+
+def test_sync_deck_updates_edited_rows_in_place():
+    old = small_deck(5)
+    sched, stats = FiboScheduler(old['정답횟수'], serve_future=True), DeckStats(old)
+    new = old.copy()
+    new.loc[2, ['정답횟수', '어려움횟수']] = [MASTERED_COUNT, 1]  # 다른 기기에서 정복
+    ids, diff = sync_deck(old, card_ids(old), new, sched, stats)
+    assert not diff.structural and diff.edited == [2]
+    assert sched.is_mastered(2) and stats.mastered == 1 and stats.ranking() == [2]
+    _, diff = sync_deck(new, ids, old.copy(), sched, stats)  # 시트에서 되돌림
+    assert not sched.is_mastered(2) and stats.mastered == 0
+
+
+def test_sync_deck_remaps_state_when_rows_move():
+    old = small_deck(4)
+    old.loc[3, '정답횟수'] = MASTERED_COUNT
+    sched, stats = FiboScheduler(old['정답횟수'], serve_future=True), DeckStats(old)
+    sched.answer_hard(1)
+    new = pd.concat([small_deck(6).iloc[[5]], old.iloc[[3, 1, 0]]], ignore_index=True)  # 추가 + 삭제 + 이동
+    ids, diff = sync_deck(old, card_ids(old), new, sched, stats)
+    assert diff.structural and ids == card_ids(new)
+    assert sched.is_mastered(1) and not sched.is_mastered(0) and stats.mastered == 1
+    assert sched.is_scheduled(2)  # 어려움으로 예약했던 카드가 새 위치로
+
+
+def test_apply_mastered_lifts_session_counters():
+    view = DeckView(small_deck(3))
+    ids = card_ids(view.base)
+    sched, stats = FiboScheduler(view['정답횟수'], serve_future=True), DeckStats(view.base)
+    apply_mastered(view, ids, [ids[1], "deleted-card"], sched, stats)
+    assert sched.is_mastered(1) and view.value(1, '정답횟수') == MASTERED_COUNT and stats.mastered == 1
+    assert view.base['정답횟수'].sum() == 0  # 공유 덱은 그대로
+    apply_mastered(view, ids, [ids[1]], sched, stats)  # 이미 정복이면 더하지 않음
+    assert view.value(1, '정답횟수') == MASTERED_COUNT and stats.mastered == 1
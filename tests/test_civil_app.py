@@ -0,0 +1,17 @@
+import os
+
+from conftest import ROOT, click, small_deck
+
+
+def test_sm2_waiting_screen(fake_sheet_app):
+    from streamlit.testing.v1 import AppTest
+    FakeSheets, _ = fake_sheet_app
+    FakeSheets.seed("C", {"시트1": small_deck(1)})
+    at = AppTest.from_file(os.path.join(ROOT, "civil_law_app.py"), default_timeout=60)
+    at.secrets["gsheets_url"] = "https://docs.google.com/spreadsheets/d/C/edit"
+    at.secrets["client_flip"] = False; at.secrets["scheduler"] = "sm2"
+    at.run()
+    assert click(at, "훈련 시작") and click(at, "정답 확인") and click(at, "정상")
+    assert at.session_state.current_index == "WAITING"  # 예정 시각 전의 카드를 다시 내지 않음
+    assert any("오늘 복습 완료" in m.value for m in at.markdown)
+    assert not any("다시 시작" in str(b.label) for b in at.button)
@@ -0,0 +1,88 @@
+import os
+import threading
+import time
+
+from card_identity import card_ids
+from conftest import ROOT, small_deck
+from deck_cache import DeckCache
+from write_queue import WriteBehindQueue
+
+
+def test_flushed_deltas_reach_cached_deck(tmp_path):
+    sheet = small_deck(5)
+    cache = DeckCache(lambda key: sheet.copy(), cache_dir=str(tmp_path / "decks"))
+    before = cache.get("s")
+    version = cache.version("s")
+    ids = card_ids(before)
+    q = WriteBehindQueue(lambda batch: None, str(tmp_path / "j.jsonl"), start=False, on_flush=lambda batch: cache.apply("s", batch))
+    q.record(ids[3], {'정답횟수': 5, '쉬움횟수': 1}); q.record(1, {'오답횟수': 1})
+    assert cache.get("s") is before  # 반영 전에는 그대로
+    assert q.flush()
+    after = cache.get("s")
+    assert after.at[3, '정답횟수'] == 5 and after.at[3, '쉬움횟수'] == 1 and after.at[1, '오답횟수'] == 1
+    assert before['정답횟수'].sum() == 0  # 다른 세션이 쓰는 DataFrame은 건드리지 않음
+    assert cache.version("s") != version
+    restarted = DeckCache(lambda key: None, cache_dir=str(tmp_path / "decks"))
+    assert restarted.get("s").at[3, '정답횟수'] == 5  # 디스크 캐시에도 반영
+
+
+def test_failed_flush_leaves_cache_alone(tmp_path):
+    cache = DeckCache(lambda key: small_deck(3), cache_dir=str(tmp_path / "decks"))
+    before = cache.get("s")
+
+    def broken(batch): raise IOError("sheet unavailable")
+    q = WriteBehindQueue(broken, str(tmp_path / "j.jsonl"), start=False, on_flush=lambda batch: cache.apply("s", batch))
+    q.record(0, {'정답횟수': 1})
+    assert not q.flush()
+    assert cache.get("s") is before
+
+
+def test_get_many_fetches_tabs_concurrently_in_order(tmp_path):
+    sheets = {"a": small_deck(1), "b": small_deck(2), "c": small_deck(3)}
+    together = threading.Barrier(3, timeout=5)  # 차례로 가져오면 BrokenBarrierError
+    calls = []
+
+    def fetch(key):
+        calls.append(key); together.wait()
+        return sheets[key].copy()
+    cache = DeckCache(fetch, cache_dir=str(tmp_path / "decks"))
+    assert [len(d) for d in cache.get_many(["c", "a", "b"])] == [3, 1, 2]
+    assert cache.get_many([]) == []
+    calls.clear()
+    assert [len(d) for d in cache.get_many(["a", "b"])] == [1, 2] and calls == []  # 캐시에서 바로
+
+
+def test_get_many_refresh_keeps_cache_for_failed_tabs(tmp_path):
+    sheets = {"a": small_deck(1), "b": small_deck(2)}
+    cache = DeckCache(lambda key: None if sheets[key] is None else sheets[key].copy(), cache_dir=str(tmp_path / "decks"))
+    before = cache.get_many(["a", "b"])
+    sheets["a"], sheets["b"] = small_deck(4), None  # b는 가져오기 실패
+    after = cache.get_many(["a", "b"], refresh=True)
+    assert len(after[0]) == 4 and after[1] is before[1]
+
+
+def test_answer_then_refresh_sees_flushed_mastery(fake_sheet_app):
+    from streamlit.testing.v1 import AppTest
+    FakeSheets, REQUESTS = fake_sheet_app
+    FakeSheets.seed("S", {"시트1": small_deck(30)})
+
+    def session():
+        at = AppTest.from_file(os.path.join(ROOT, "civil_law_app.py"), default_timeout=60)
+        at.secrets["gsheets_url"] = "https://docs.google.com/spreadsheets/d/S/edit"; at.secrets["client_flip"] = False
+        at.run()
+        assert not at.exception
+        return at
+
+    def click(at, label):
+        next(b for b in at.button if label in str(b.label)).click(); at.run()
+        assert not at.exception
+
+    at = session()
+    click(at, "시작")
+    updates = REQUESTS["update"]
+    for _ in range(10): click(at, "확인"); click(at, "쉬움")  # batch_size(10)를 채워 백그라운드 flush
+    deadline = time.monotonic() + 10
+    while REQUESTS["update"] == updates and time.monotonic() < deadline: time.sleep(0.05)
+    assert (FakeSheets.decks["S"]["시트1"]['정답횟수'] >= 5).sum() == 10
+    refreshed = session()  # 새로고침: 새 세션은 공유 덱 캐시에서 시작
+    assert refreshed.session_state.stats.mastered == 10
@@ -0,0 +1,40 @@
+import io
+import random
+
+import pandas as pd
+
+from conftest import small_deck
+from deck_stats import DeckStats
+from scheduler import MASTERED_COUNT
+
+
+def test_apply_matches_full_recount():
+    df = small_deck(40)
+    rng = random.Random(3)
+    stats = DeckStats(df)
+    for _ in range(300):
+        idx = rng.randrange(len(df))
+        deltas = {'정답횟수': rng.choice([-1, 1, 2]), '어려움횟수': rng.choice([0, 0, 1])}
+        deltas['정답횟수'] = max(deltas['정답횟수'], -int(df.at[idx, '정답횟수']))
+        for c, d in deltas.items(): df.at[idx, c] += d
+        stats.apply(idx, deltas)
+    fresh = DeckStats(df)
+    assert stats.mastered == fresh.mastered == int((df['정답횟수'] >= MASTERED_COUNT).sum())
+    assert stats.ranking() == fresh.ranking()  # 어려움 많은 순, 같으면 행 순
+    assert stats.counts(3) == (stats.mastered, 3, len(df) - stats.mastered - 3)
+
+
+def test_wrong_note_csv_is_reused_until_a_listed_row_changes():
+    df = small_deck(5)
+    df['어려움횟수'] = [0, 2, 0, 1, 0]
+    stats = DeckStats(df)
+    assert stats.has_wrong_notes and stats.ranking() == [1, 3]
+    csv = stats.wrong_note_csv(df)
+    assert stats.wrong_note_csv(df) is csv
+    assert pd.read_csv(io.BytesIO(csv), encoding="utf-8-sig")['질문'].tolist() == ["질문 1", "질문 3"]
+    stats.apply(0, {'정답횟수': 1})  # 오답노트 밖의 행
+    assert stats.wrong_note_csv(df) is csv
+    version = stats.version
+    stats.apply(3, {'어려움횟수': 2})
+    assert stats.version > version and stats.ranking() == [3, 1]
+    assert stats.wrong_note_csv(df) is not csv
@@ -0,0 +1,32 @@
+import numpy as np
+
+from conftest import small_deck
+from deck_store import DeckView, compact_deck
+
+
+def test_compact_deck_narrows_columns():
+    df = small_deck(6).assign(이미지=["a.png", "a.png", "a.png", "b.png", "b.png", "b.png"])
+    out = compact_deck(df)
+    assert out['정답횟수'].dtype == np.int32 and out['이미지'].dtype == 'category'
+    assert out['질문'].tolist() == df['질문'].tolist()
+
+
+def test_view_overlays_deltas_without_touching_base():
+    base = compact_deck(small_deck(4))
+    view = DeckView(base)
+    view.add(1, {'정답횟수': 2, '오답횟수': 0, '없는열': 5}); view.add(1, {'정답횟수': 1}); view.add(3, {'쉬움횟수': 1})
+    assert view.answered == 2
+    assert view.value(1, '정답횟수') == 3 and view.value(0, '정답횟수') == 0
+    assert view['정답횟수'].tolist() == [0, 3, 0, 0]
+    assert np.shares_memory(view['오답횟수'].to_numpy(), base['오답횟수'].to_numpy())  # overlay가 없는 열은 복사하지 않음
+    assert view.take([3, 1])['쉬움횟수'].tolist() == [1, 0] and view.row(1)['정답횟수'] == 3
+    assert view.frame()[['정답횟수', '쉬움횟수']].to_numpy().sum() == 4
+    assert base[['정답횟수', '쉬움횟수']].to_numpy().sum() == 0
+
+
+def test_carry_moves_deltas_to_new_rows():
+    old = DeckView(small_deck(3))
+    old.add(0, {'정답횟수': 1}); old.add(2, {'오답횟수': 2})
+    new = DeckView(small_deck(3))
+    new.carry(old, [-1, 0, 1])  # 0행 삭제, 나머지는 한 칸씩 앞으로
+    assert new.answered == 1 and new.value(1, '오답횟수') == 2
@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+from card_identity import card_id
+from deck_transfer import DECK_COLUMNS, CardImporter
+
+
+def write_csv(path, rows, header=("질문", "정답", "정답횟수")):
+    lines = [",".join(header)] + [",".join(r) for r in rows]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8-sig")
+    return str(path)
+
+
+def test_importer_validates_and_drops_duplicates_across_chunks(tmp_path):
+    src = write_csv(tmp_path / "new.csv", [
+        ("임대차", "2년", "1"),   # 2행: 기존 카드
+        ("전세권", "물권", ""),    # 3행: 빈 카운터는 0
+        ("", "", ""),              # 4행: 빈 행은 건너뜀
+        ("", "답만", "0"),         # 5행: 질문 없음
+        ("저당권", "담보", "많이"),  # 6행: 숫자 아님
+        ("유치권", "점유", "3"),
+        ("전세권", "물권", "0"),    # 8행: 파일 안 중복 (다른 조각)
+    ])
+    importer = CardImporter([card_id("임대차", "2년")], chunk_rows=2)
+    frames = list(importer.chunks(src))
+    out = pd.concat(frames, ignore_index=True)
+    assert out['질문'].tolist() == ["전세권", "유치권"] and out['정답횟수'].tolist() == [0, 3]
+    assert list(out.columns) == [c for c in DECK_COLUMNS if c in out.columns] and '쉬움횟수' in out.columns
+    assert (importer.read, importer.added, importer.duplicate, importer.invalid) == (6, 2, 2, 2)
+    assert importer.errors == [(5, "질문 없음"), (6, "정답횟수 숫자 아님")]
+    assert importer.summary() == "읽음 6 · 새 카드 2 · 중복 2 · 오류 2"
+
+
+def test_importer_reads_xlsx_and_honours_id_column(tmp_path):
+    pytest.importorskip("openpyxl")
+    path = tmp_path / "new.xlsx"
+    pd.DataFrame({'ID': ["a", "b", "a"], '질문': ["가", "나", "다"], '정답': ["1", "2", "3"]}).to_excel(path, index=False)
+    importer = CardImporter(["b"])
+    size = importer.to_file(str(path), str(tmp_path / "out.csv"), fmt="csv")
+    assert size > 0 and (importer.added, importer.duplicate) == (1, 2)
+    assert pd.read_csv(tmp_path / "out.csv", encoding="utf-8-sig")['ID'].tolist() == ["a"]
+
+
+def test_importer_rejects_missing_columns_and_formats(tmp_path):
+    with pytest.raises(ValueError, match="정답"): list(CardImporter().chunks(write_csv(tmp_path / "a.csv", [("가",)], header=("질문",))))
+    with pytest.raises(ValueError, match="형식"): list(CardImporter().chunks(str(tmp_path / "deck.txt")))
@@ -0,0 +1,35 @@
+import random
+
+import numpy as np
+
+from due_index import DAY, DueIndex, day_start
+
+
+def test_updates_match_a_fresh_index():
+    rng = random.Random(5)
+    due = {i: rng.uniform(0, 100) for i in range(0, 200, 2)}
+    index = DueIndex(due, 200)
+    for _ in range(3000):  # overlay가 커져 중간에 다시 정렬되는 경우 포함
+        idx = rng.randrange(200)
+        t = None if rng.random() < 0.2 else rng.uniform(0, 100)
+        index.update(idx, t)
+        if t is None: due.pop(idx, None)
+        else: due[idx] = t
+    fresh = DueIndex(due, 200)
+    assert index.due_map() == due and len(index) == len(due)
+    for t in (0, 25.5, 50, 99.9, 100):
+        assert index.count_until(t) == fresh.count_until(t) == sum(v <= t for v in due.values())
+    assert index.next_time() == min(due.values())
+    assert sorted(index.times().tolist()) == sorted(due.values())
+    assert all(index.get(i) == due.get(i) for i in range(200))
+
+
+def test_summary_and_forecast_by_local_day():
+    now = day_start(1_700_000_000) + 12 * 3600  # 로컬 정오
+    index = DueIndex({0: now - DAY, 1: now - 60, 2: now + 3600, 3: now + 3 * DAY, 4: now + 30 * DAY})
+    assert index.summary(now) == (2, 3, 4)
+    forecast = index.forecast(now, days=7)
+    assert forecast[0] == 3 and forecast[3] == 1 and forecast.sum() == 4  # 밀린 카드는 오늘로
+    index.update(2, None); index.update(4, now)
+    assert index.summary(now) == (3, 3, 4) and index.next_time() == now - DAY
+    assert np.array_equal(index.forecast(now, days=7), [3, 0, 0, 1, 0, 0, 0])
@@ -0,0 +1,54 @@
+import os
+
+import pandas as pd
+
+from conftest import ROOT, click
+
+
+def session(sheet_id, **secrets):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(os.path.join(ROOT, "economy_app.py"), default_timeout=60)
+    at.secrets["gsheets_url"] = f"https://docs.google.com/spreadsheets/d/{sheet_id}/edit"; at.secrets["client_flip"] = False
+    for k, v in secrets.items(): at.secrets[k] = v
+    at.run()
+    assert not at.exception
+    return at
+
+
+def test_mastery_survives_restart(fake_sheet_app):
+    FakeSheets, _ = fake_sheet_app
+    FakeSheets.seed("E", {"시트1": pd.DataFrame({'질문': ["GDP", "CPI"], '정답': ["국내총생산", "소비자물가지수"]})})
+    at = session("E")
+    assert click(at, "훈련 시작")
+    for _ in range(40):
+        if not click(at, "정답 확인"): break
+        click(at, "맞음")
+    sched = at.session_state.scheduler
+    assert sched.is_mastered(0) and sched.is_mastered(1)
+    restarted = session("E")  # 시트에는 정답 카운터가 없으므로 ReviewStore에서 복원
+    assert click(restarted, "훈련 시작")
+    assert any("모든 문항 정복" in m.value for m in restarted.markdown)
+
+
+def test_sm2_waits_instead_of_cramming(fake_sheet_app):
+    FakeSheets, _ = fake_sheet_app
+    FakeSheets.seed("W", {"시트1": pd.DataFrame({'질문': ["GDP"], '정답': ["국내총생산"]})})
+    at = session("W", scheduler="sm2")
+    assert click(at, "훈련 시작") and click(at, "정답 확인") and click(at, "맞음")
+    assert at.session_state.current_index == "WAITING"
+    assert click(at, "다시 확인") and at.session_state.current_index == "WAITING"
+
+
+def test_refreshed_deck_keeps_current_card(fake_sheet_app):
+    import time
+    FakeSheets, _ = fake_sheet_app
+    deck = pd.DataFrame({'질문': ["GDP", "CPI", "PPI"], '정답': ["국내총생산", "소비자물가지수", "생산자물가지수"]})
+    FakeSheets.seed("D", {"시트1": deck})
+    at = session("D", deck_refresh_sec=0)
+    assert click(at, "훈련 시작")
+    shown = at.session_state.deck_obj['질문'].iloc[at.session_state.current_index]
+    FakeSheets.seed("D", {"시트1": pd.concat([pd.DataFrame({'질문': ["M2"], '정답': ["통화량"]}), deck], ignore_index=True)})
+    deadline = time.monotonic() + 10
+    while len(at.session_state.deck_obj) == 3 and time.monotonic() < deadline: time.sleep(0.1); at.run()  # 백그라운드 갱신
+    assert len(at.session_state.deck_obj) == 4
+    assert at.session_state.deck_obj['질문'].iloc[at.session_state.current_index] == shown  # 맨 앞에 행이 끼어도 같은 카드
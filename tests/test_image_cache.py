@@ -0,0 +1,23 @@
+import base64
+import io
+
+from PIL import Image
+
+from image_cache import ImageCache
+
+
+def encoded(mode, fmt):
+    out = io.BytesIO()
+    Image.new(mode, (4, 4)).save(out, format=fmt)
+    return out.getvalue()
+
+
+def test_data_url_uses_cached_thumbnail(tmp_path):
+    cache = ImageCache(cache_dir=str(tmp_path), workers=1)
+    png, jpeg = encoded("RGBA", "PNG"), encoded("RGB", "JPEG")
+    cache._remember("a", png); cache._remember("b", jpeg)
+    a, b = cache.data_url("a"), cache.data_url("b")
+    assert a.startswith("data:image/png;base64,") and base64.b64decode(a.split(",", 1)[1]) == png
+    assert b.startswith("data:image/jpeg;base64,") and base64.b64decode(b.split(",", 1)[1]) == jpeg
+    cache._failed["c"] = float("inf")  # 받지 못한 이미지는 None (앱은 원본 URL로 대체)
+    assert cache.data_url("c") is None
@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+
+from conftest import ROOT, small_deck
+from deck_store import compact_deck
+from local_deck import load_local_deck, local_sheet_names, local_version
+
+
+def mapped_from(array, path):
+    # array의 데이터가 path를 memory-map한 영역 안에 있는지 (/proc/self/maps)
+    addr = array.__array_interface__['data'][0]
+    with open("/proc/self/maps") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 6 and os.path.realpath(parts[5]) == os.path.realpath(path):
+                start, end = (int(x, 16) for x in parts[0].split("-"))
+                if start <= addr < end: return True
+    return False
+
+
+def test_local_deck_is_converted_once_and_mapped(tmp_path):
+    src = tmp_path / "deck.csv"
+    small_deck(5).to_csv(src, index=False)
+    calls = []
+
+    def prepare(df):
+        calls.append(len(df)); return compact_deck(df)
+    cache_dir = str(tmp_path / "local")
+    first = load_local_deck(str(src), prepare, cache_dir=cache_dir)
+    again = load_local_deck(str(src), prepare, cache_dir=cache_dir)
+    assert calls == [5] and again['질문'].tolist() == first['질문'].tolist()
+    [cached] = os.listdir(cache_dir)
+    counters = again['정답횟수'].to_numpy()
+    assert counters.dtype == np.int32
+    if os.path.exists("/proc/self/maps"):  # 복사본이 아니라 캐시 파일을 매핑한 영역을 그대로 씀
+        assert mapped_from(counters, os.path.join(cache_dir, cached))
+
+
+def test_changed_source_replaces_old_cache(tmp_path):
+    src = tmp_path / "deck.csv"
+    small_deck(2).to_csv(src, index=False)
+    cache_dir = str(tmp_path / "local")
+    version = local_version(str(src))
+    load_local_deck(str(src), compact_deck, cache_dir=cache_dir)
+    small_deck(3).to_csv(src, index=False)
+    os.utime(src, ns=(0, os.stat(src).st_mtime_ns + 1))
+    assert local_version(str(src)) != version
+    assert len(load_local_deck(str(src), compact_deck, cache_dir=cache_dir)) == 3
+    assert len(os.listdir(cache_dir)) == 1  # 이전 버전은 정리
+
+
+def test_sheet_names_and_missing_rows(tmp_path):
+    assert local_sheet_names(os.path.join(ROOT, "study_list.xlsx")) == ["Sheet1"]
+    assert local_sheet_names(str(tmp_path / "민법.parquet")) == ["민법"]
+    src = tmp_path / "deck.csv"
+    small_deck(2).to_csv(src, index=False)
+    assert load_local_deck(str(src), lambda df: None, cache_dir=str(tmp_path / "local")) is None
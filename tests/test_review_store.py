@@ -0,0 +1,35 @@
+import sqlite3
+
+from review_store import ReviewStore
+
+
+def test_log_count_tracks_graded_records(tmp_path):
+    store = ReviewStore(str(tmp_path / "r.sqlite3"))
+    assert store.log_count("d") == 0
+    store.record("d", "a", 1, 0, 5, 1, grade=1)
+    store.record("d", "b", 0, 1, 6, 2, grade=0)
+    store.record("d", "b", 0, 1, 6, 2)  # 채점 없는 상태 갱신은 기록하지 않음
+    store.record("e", "a", 1, 0, 5, 1, grade=2)
+    assert store.log_count("d") == 2 and store.log_count("e") == 1
+    store.clear("d")  # 복습 상태만 초기화, 기록은 남음
+    assert store.load("d") == (0, {})
+    store.record("d", "a", 1, 0, 5, 1, grade=1)
+    assert store.log_count("d") == 3 == sum(len(rows) for rows in store.iter_log("d"))
+
+
+def test_existing_log_is_counted_once_on_upgrade(tmp_path):
+    path = str(tmp_path / "r.sqlite3")
+    db = sqlite3.connect(path)
+    db.executescript("""
+        CREATE TABLE deck_meta (deck TEXT PRIMARY KEY, solve_count INTEGER NOT NULL DEFAULT 0);
+        CREATE TABLE review_log (id INTEGER PRIMARY KEY, deck TEXT NOT NULL, card TEXT NOT NULL, ts REAL NOT NULL,
+                                 grade INTEGER NOT NULL, level INTEGER, wrong_level INTEGER, due_at REAL);
+        INSERT INTO deck_meta VALUES ('d', 7);
+    """)
+    db.executemany("INSERT INTO review_log (deck, card, ts, grade) VALUES (?, ?, ?, ?)", [("d", "a", 1.0, 1)] * 3 + [("old", "a", 1.0, 0)] * 2)
+    db.commit(); db.close()
+    store = ReviewStore(path)
+    assert store.log_count("d") == 3 and store.log_count("old") == 2
+    assert store.load("d")[0] == 7
+    store.record("d", "a", 1, 0, 5, 8, grade=1)
+    assert ReviewStore(path).log_count("d") == 4  # 다시 열어도 다시 세지 않음
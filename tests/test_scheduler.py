@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from scheduler import FIBO_GAP, FOCUS_DONE, GRADUATED, HARD_GAP, MASTERED_COUNT, STRATEGIES, FiboScheduler, SM2Scheduler
+
+
+class MinChoiceRng:
+    # 두 구현에 같은 난수열을 주고 choice는 가장 작은 행을 고름 (신규 풀의 내부 순서 차이를 없앰)
+    def __init__(self, seed):
+        self._r = random.Random(seed)
+
+    def random(self):
+        return self._r.random()
+
+    def choice(self, seq):
+        return min(seq)
+
+
+class BaselineFibo:
+    # 기존 앱의 전체 스캔 구현 (schedules: {슬롯: [행, ...]}, 응답마다 모든 행을 훑음)
+    def __init__(self, correct_counts, serve_future, rng):
+        self.correct = list(correct_counts)
+        self.serve_future, self.rng = serve_future, rng
+        self.schedules, self.levels, self.wrong_levels, self.solve_count = {}, {}, {}, 0
+
+    def next(self):
+        curr = self.solve_count
+        all_scheduled = [i for sub in self.schedules.values() for i in sub]
+        available_new = [i for i in range(len(self.correct)) if self.correct[i] < MASTERED_COUNT and i not in all_scheduled]
+        pending = sorted(k for k, v in self.schedules.items() if k <= curr and v)
+        if available_new and pending:
+            return self.rng.choice(available_new) if self.rng.random() < 0.5 else self.schedules[pending[0]].pop(0)
+        if available_new: return self.rng.choice(available_new)
+        if pending: return self.schedules[pending[0]].pop(0)
+        future = sorted(k for k, v in self.schedules.items() if k > curr and v)
+        if future and self.serve_future: return self.schedules[future[0]].pop(0)
+        return GRADUATED
+
+    def answer(self, idx, grade):
+        if grade == 0:
+            self.wrong_levels[idx] = self.wrong_levels.get(idx, 0) + 1
+            self.levels[idx] = 1
+            self.schedules.setdefault(self.solve_count + HARD_GAP, []).append(idx)
+        elif grade == 1:
+            new_lv = self.levels.get(idx, 0) + 1
+            if new_lv > 7: self.correct[idx] = MASTERED_COUNT; del self.levels[idx]
+            else: self.levels[idx] = new_lv; self.schedules.setdefault(self.solve_count + FIBO_GAP[new_lv], []).append(idx)
+        else:
+            self.correct[idx] = MASTERED_COUNT; self.levels.pop(idx, None)
+        self.solve_count += 1
+
+
+def answer(sched, idx, grade):
+    if grade == 0: sched.answer_hard(idx)
+    elif grade == 1: sched.answer_normal(idx)
+    else: sched.answer_easy(idx)
+
+
+@pytest.mark.parametrize("serve_future", [True, False])  # civil(예약 카드 앞당김) / study(앞당기지 않음)
+@pytest.mark.parametrize("seed", range(5))
+def test_heap_scheduler_matches_full_scan(serve_future, seed):
+    grades = random.Random(seed)
+    correct = [MASTERED_COUNT if grades.random() < 0.2 else 0 for _ in range(40)]
+    old = BaselineFibo(correct, serve_future, MinChoiceRng(seed))
+    new = FiboScheduler(correct, serve_future=serve_future, rng=MinChoiceRng(seed))
+    for step in range(600):
+        a, b = old.next(), new.next()
+        assert a == b, f"step {step}"
+        if a == GRADUATED: break
+        grade = grades.choices([0, 1, 2], [0.25, 0.65, 0.1])[0]
+        old.answer(a, grade); answer(new, a, grade)
+    assert new.levels == old.levels and new.wrong_levels == old.wrong_levels
+    assert [new.is_mastered(i) for i in range(len(correct))] == [c >= MASTERED_COUNT for c in old.correct]
+
+
+@pytest.mark.parametrize("strategy", list(STRATEGIES))
+def test_focus_exhausted_is_not_graduation(strategy):
+    sched = STRATEGIES[strategy]([0] * 10, serve_future=True)
+    sched.focus([2, 5])
+    for _ in range(2): sched.answer_easy(sched.next())
+    assert sched.next() == FOCUS_DONE  # 필터 밖 카드 8장은 남아 있음
+    sched.focus(None)
+    assert sched.next() not in (FOCUS_DONE, GRADUATED)
+    for i in range(10):
+        if not sched.is_mastered(i): sched.answer_easy(i)
+    assert sched.next() == GRADUATED
+
+
+def test_sm2_remap_moves_due_times():
+    clock = [1000.0]
+    sched = SM2Scheduler([0] * 4, serve_future=False, clock=lambda: clock[0])
+    sched.answer_normal(1); sched.answer_hard(3)
+    due = dict(sched.due_at)
+    sched.remap([2, 0, 3, 1], [0] * 4)  # 행 순서가 바뀐 시트로 동기화
+    assert sched.due_at == {0: due[1], 1: due[3]}
+    assert sched.due_index.count_until(max(due.values())) == 2
+    sched.remap([0, -1, 1, 2], [0] * 3)  # 예정이 있던 카드 삭제
+    assert sched.due_at == {0: due[1]}
+
+
+@pytest.mark.parametrize("strategy", list(STRATEGIES))
+def test_upcoming_uses_scheduler_rng(strategy):
+    picks = [STRATEGIES[strategy]([0] * 50, serve_future=True, rng=random.Random(7)).upcoming(5) for _ in range(2)]
+    assert picks[0] == picks[1]  # 같은 시드면 미리 받을 카드도 같음
@@ -0,0 +1,51 @@
+import random
+
+import pandas as pd
+
+from card_identity import card_ids, diff_decks
+from search_index import SearchIndex, frame_texts
+
+WORDS = ["임대차", "전세권", "저당권", "유치권", "소멸", "존속기간", "실행", "성립", "인플레이션", "탄력성", "수요", "공급"]
+QUERIES = ["임대", "권 소멸", "저당권 실행", "존속 기간", "탄", "수요공급", "없는말"]
+
+
+def deck(rng, n):
+    return pd.DataFrame({'질문': [" ".join(rng.sample(WORDS, 2)) for _ in range(n)], '정답': [rng.choice(WORDS) + str(rng.randrange(50)) for _ in range(n)]})
+
+
+def edit(rng, df):
+    # 수정 + 삭제 + 추가 + 순서 바꿈을 섞어 새 시트를 만듦
+    df = df.copy()
+    for i in rng.sample(range(len(df)), 3): df.loc[i, '정답'] = rng.choice(WORDS) + "!"
+    df = df.drop(rng.sample(list(df.index), 2))
+    df = pd.concat([df, deck(rng, 3)], ignore_index=True)
+    if rng.random() < 0.5: df = df.sample(frac=1, random_state=rng.randrange(100)).reset_index(drop=True)
+    return df
+
+
+def same_results(index, df):
+    fresh = SearchIndex.from_frame(df)
+    for q in QUERIES:
+        assert index.search(q).tolist() == fresh.search(q).tolist(), q
+        assert sorted(index.search(q, fuzzy=True).tolist()) == sorted(fresh.search(q, fuzzy=True).tolist()), q
+
+
+def test_updated_matches_a_rebuilt_index():
+    rng = random.Random(11)
+    df = deck(rng, 40)
+    index = SearchIndex.from_frame(df)
+    for _ in range(8):
+        new = edit(rng, df)
+        diff = diff_decks(df, card_ids(df), new, card_ids(new))
+        index, df = index.updated(diff, frame_texts(new)), new
+        same_results(index, df)
+
+
+def test_updated_leaves_the_shared_index_alone():
+    rng = random.Random(2)
+    df = deck(rng, 20)
+    index = SearchIndex.from_frame(df)
+    before = {q: index.search(q).tolist() for q in QUERIES}
+    new = df.copy(); new.loc[0, '질문'] = "완전히 새로운 임대차"
+    index.updated(diff_decks(df, card_ids(df), new, card_ids(new)), frame_texts(new))
+    assert {q: index.search(q).tolist() for q in QUERIES} == before
@@ -0,0 +1,71 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+import sheet_source
+from conftest import ROOT
+from sheet_source import WorkbookCache, parse_workbook_xml, scan_for_workbook_xml, workbook_sheet_names
+
+
+def study_list():
+    with open(os.path.join(ROOT, "study_list.xlsx"), "rb") as f: return f.read()
+
+
+def rezip(data, unseekable=False, method=zipfile.ZIP_DEFLATED):
+    # 같은 항목으로 다시 묶음 (unseekable: 크기를 데이터 디스크립터에 둔 스트리밍 zip)
+    class Sink(io.RawIOBase):
+        def __init__(self): self.out = io.BytesIO()
+        def writable(self): return True
+        def write(self, b): return self.out.write(b)
+    sink = Sink() if unseekable else io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as src, zipfile.ZipFile(sink, "w", method) as dst:
+        for info in src.infolist(): dst.writestr(info.filename, src.read(info.filename))
+    return sink.out.getvalue() if unseekable else sink.getvalue()
+
+
+class FakeResponse:
+    # requests 스트리밍 응답 흉내: 끝까지 읽은 뒤 iter_content를 다시 부르면 StreamConsumedError
+    def __init__(self, data, chunk):
+        self._parts = iter([data[i:i + chunk] for i in range(0, len(data), chunk)])
+        self.consumed, self.read = False, 0
+
+    def raise_for_status(self): pass
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+    def iter_content(self, size):
+        if self.consumed: raise sheet_source.requests.exceptions.StreamConsumedError()
+        for part in self._parts: self.read += len(part); yield part
+        self.consumed = True
+
+
+@pytest.mark.parametrize("method", [zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED])
+def test_scan_finds_workbook_in_prefix(method):
+    data = rezip(study_list(), method=method)
+    names = workbook_sheet_names(data)
+    assert parse_workbook_xml(scan_for_workbook_xml(data)) == names
+    with zipfile.ZipFile(io.BytesIO(data)) as zf: end = zf.getinfo("xl/workbook.xml").header_offset
+    assert scan_for_workbook_xml(data[:end + 40]) is None  # workbook.xml을 다 받기 전에는 더 필요
+
+
+def test_scan_gives_up_on_data_descriptors_and_other_files():
+    assert scan_for_workbook_xml(rezip(study_list(), unseekable=True)) is False
+    assert scan_for_workbook_xml(b"<html>not a zip</html>" * 3) is False
+
+
+def test_sheet_names_stops_at_workbook_or_reads_the_rest(monkeypatch):
+    responses = []
+
+    def fake_get(url, timeout=None, stream=False):
+        responses.append(FakeResponse(payload, 1024)); return responses[-1]
+    monkeypatch.setattr(sheet_source.requests, "get", fake_get)
+    payload = rezip(study_list()) + b"\0" * 20000  # workbook.xml 뒤에 남은 바이트는 받지 않음
+    assert WorkbookCache().sheet_names("a") == workbook_sheet_names(rezip(study_list()))
+    assert responses[-1].read < len(payload)
+    payload = rezip(study_list(), unseekable=True)  # 스캔 불가: 같은 응답에서 나머지를 받아 전체로 읽음
+    assert WorkbookCache().sheet_names("b") == workbook_sheet_names(payload)
+    assert len(responses) == 2 and responses[-1].read == len(payload)
+    payload = rezip(study_list())[:2000]  # 끊긴 응답: 스캔이 None으로 끝나도 다 읽은 스트림을 다시 읽지 않음
+    with pytest.raises(zipfile.BadZipFile): WorkbookCache().sheet_names("c")
@@ -0,0 +1,105 @@
+import os
+
+import pandas as pd
+
+from conftest import COUNTERS, ROOT, click
+
+
+def tab(questions):
+    return pd.DataFrame({'질문': questions, '정답': [f"{q} 답" for q in questions], **{c: 0 for c in COUNTERS}})
+
+
+def test_merged_deck_writes_back_to_source_tabs(fake_sheet_app):
+    from streamlit.testing.v1 import AppTest
+    FakeSheets, _ = fake_sheet_app
+    # 같은 문항이 두 탭에 모두 있으면 병합 덱의 카드 ID(#n)와 탭 안의 카드 ID가 다름
+    FakeSheets.seed("M", {"탭A": tab(["가", "나", "다", "라"]), "탭B": tab(["가", "마", "바"])})
+    at = AppTest.from_file(os.path.join(ROOT, "study_web_app.py"), default_timeout=60)
+    at.secrets["gsheets_url"] = "https://docs.google.com/spreadsheets/d/M/edit"
+    at.secrets["client_flip"] = False; at.secrets["write_back"] = True
+    at.run()
+    at.multiselect[0].set_value(["탭A", "탭B"]); at.run()
+    assert click(at, "선택한 시트 불러오기")
+    df = at.session_state.df
+    assert set(df.frame()['시트']) == {"탭A", "탭B"}
+    assert click(at, "훈련 시작")
+    for i in range(12):
+        if not click(at, "정답 확인"): break
+        click(at, ["어려움", "정상", "쉬움"][i % 3])
+    assert click(at, "동기화")  # 대기 중인 증감분을 원래 탭에 반영
+    frame = df.frame()
+    assert frame[COUNTERS].to_numpy().sum() > 0
+    for name, part in frame.groupby('시트', sort=False):
+        sheet = FakeSheets.decks["M"][name]
+        assert list(sheet.columns[:7]) == ['질문', '정답'] + COUNTERS
+        for col in ['오답횟수', '정상횟수', '쉬움횟수']:
+            assert sheet[col].tolist() == part[col].tolist(), (name, col)
+
+
+def test_search_exhausted_offers_clear_not_reset(fake_sheet_app):
+    from streamlit.testing.v1 import AppTest
+    FakeSheets, _ = fake_sheet_app
+    FakeSheets.seed("F", {"시트1": tab(["임대차 존속기간", "전세권 소멸", "저당권 실행", "유치권 성립"])})
+    at = AppTest.from_file(os.path.join(ROOT, "study_web_app.py"), default_timeout=60)
+    at.secrets["gsheets_url"] = "https://docs.google.com/spreadsheets/d/F/edit"; at.secrets["client_flip"] = False
+    at.run()
+    at.text_input(key="search_query").set_value("임대차"); at.run()
+    assert click(at, "훈련 시작")
+    assert click(at, "정답 확인") and click(at, "쉬움")
+    assert not any("다시 시작" in str(b.label) for b in at.button)  # 덱 초기화 버튼은 보이지 않음
+    assert at.session_state.stats.mastered == 1
+    assert click(at, "검색 해제")
+    assert isinstance(at.session_state.current_index, int) and at.session_state.state == "QUESTION"
+    assert at.session_state.stats.mastered == 1
+
+
+def test_mastery_survives_refresh_without_write_back(fake_sheet_app):
+    from streamlit.testing.v1 import AppTest
+    FakeSheets, _ = fake_sheet_app
+    FakeSheets.seed("R", {"시트1": tab(["가", "나", "다", "라", "마"])})
+
+    def session():
+        at = AppTest.from_file(os.path.join(ROOT, "study_web_app.py"), default_timeout=60)
+        at.secrets["gsheets_url"] = "https://docs.google.com/spreadsheets/d/R/edit"; at.secrets["client_flip"] = False
+        at.run()
+        return at
+
+    at = session()
+    assert click(at, "훈련 시작")
+    for _ in range(2): assert click(at, "정답 확인") and click(at, "쉬움")
+    assert FakeSheets.decks["R"]["시트1"]['정답횟수'].sum() == 0  # write_back 꺼짐: 시트는 그대로
+    refreshed = session()
+    sched = refreshed.session_state.scheduler
+    assert sum(sched.is_mastered(i) for i in range(5)) == 2
+    assert refreshed.session_state.stats.mastered == 2
+
+
+def test_flip_start_does_not_pop_a_card(fake_sheet_app):
+    from streamlit.testing.v1 import AppTest
+    FakeSheets, _ = fake_sheet_app
+    FakeSheets.seed("P", {"시트1": tab(["가", "나", "다"])})
+    at = AppTest.from_file(os.path.join(ROOT, "study_web_app.py"), default_timeout=60)
+    at.secrets["gsheets_url"] = "https://docs.google.com/spreadsheets/d/P/edit"; at.secrets["client_flip"] = True
+    at.run()
+    sched = at.session_state.scheduler
+    sched.schedule(1, sched.solve_count)  # 지금 복습할 카드: 시작 버튼이 미리 꺼내면 묶음 밖에서 예약 슬롯을 잃음
+    assert click(at, "훈련 시작")
+    assert at.session_state.current_index is None
+    assert sorted(at.session_state["flip_deck_batch"]["cards"]) == [0, 1, 2]
+
+
+def test_sync_keeps_mastery_without_write_back(fake_sheet_app):
+    from streamlit.testing.v1 import AppTest
+    FakeSheets, _ = fake_sheet_app
+    FakeSheets.seed("Y", {"시트1": tab(["가", "나", "다", "라", "마"])})
+    at = AppTest.from_file(os.path.join(ROOT, "study_web_app.py"), default_timeout=60)
+    at.secrets["gsheets_url"] = "https://docs.google.com/spreadsheets/d/Y/edit"; at.secrets["client_flip"] = False
+    at.run()
+    assert click(at, "훈련 시작")
+    for _ in range(2): assert click(at, "정답 확인") and click(at, "쉬움")
+    assert at.session_state.stats.mastered == 2
+    assert click(at, "동기화")  # 시트에는 세션 증감분이 없음
+    sched = at.session_state.scheduler
+    assert at.session_state.stats.mastered == 2
+    assert sum(sched.is_mastered(i) for i in range(5)) == 2
+    assert "수정 0" in at.session_state.last_msg
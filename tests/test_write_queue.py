@@ -0,0 +1,107 @@
+import json
+import threading
+import time
+
+import pandas as pd
+
+from card_identity import card_ids
+from write_queue import SheetWriter, WriteBehindQueue
+
+
+class FakeWriter:
+    # 반영 요청을 기록, fail 횟수만큼은 예외
+    def __init__(self, fail=0):
+        self.batches, self.fail = [], fail
+        self.called = threading.Event()
+
+    def __call__(self, batch):
+        self.called.set()
+        if self.fail:
+            self.fail -= 1; self.batches.append(None)
+            raise IOError("sheet unavailable")
+        self.batches.append({k: dict(v) for k, v in batch.items()})
+
+
+class FakeConn:
+    # GSheetsConnection의 read/update만 흉내
+    def __init__(self, df):
+        self.df, self.updates = df, 0
+
+    def read(self, spreadsheet=None, worksheet=None, ttl=None):
+        return self.df.copy()
+
+    def update(self, spreadsheet=None, worksheet=None, data=None):
+        self.df, self.updates = data.copy(), self.updates + 1
+
+
+def journal_lines(path):
+    with open(path, encoding="utf-8") as f: return [json.loads(line) for line in f]
+
+
+def test_records_are_merged_into_one_batch(tmp_path):
+    writer = FakeWriter()
+    q = WriteBehindQueue(writer, str(tmp_path / "j.jsonl"), start=False)
+    q.record(3, {'정답횟수': 1}); q.record(3, {'정답횟수': 1, '정상횟수': 1}); q.record("card-a", {'오답횟수': 1})
+    q.record(4, {'정답횟수': 0})  # 변화 없음은 기록하지 않음
+    assert q.pending_count == 2
+    assert q.flush()
+    assert writer.batches == [{3: {'정답횟수': 2, '정상횟수': 1}, "card-a": {'오답횟수': 1}}]
+    assert q.pending_count == 0 and journal_lines(str(tmp_path / "j.jsonl")) == []
+    assert q.flush() and len(writer.batches) == 1  # 대기 중인 변경이 없으면 호출하지 않음
+
+
+def test_failed_flush_merges_back_and_keeps_journal(tmp_path):
+    writer = FakeWriter(fail=1)
+    path = str(tmp_path / "j.jsonl")
+    q = WriteBehindQueue(writer, path, start=False)
+    q.record(1, {'정답횟수': 1})
+    assert not q.flush() and isinstance(q.last_error, IOError)
+    q.record(1, {'정답횟수': 1}); q.record(2, {'오답횟수': 1})  # 실패 뒤에 쌓인 증감분과 합쳐짐
+    assert len(journal_lines(path)) == 3
+    assert q.flush() and q.last_error is None
+    assert writer.batches[-1] == {1: {'정답횟수': 2}, 2: {'오답횟수': 1}}
+    assert journal_lines(path) == []
+
+
+def test_background_flush_backs_off_after_failure(tmp_path):
+    writer = FakeWriter(fail=1)
+    q = WriteBehindQueue(writer, str(tmp_path / "j.jsonl"), batch_size=1, interval=30.0)
+    try:
+        q.record(1, {'정답횟수': 1})
+        assert writer.called.wait(2.0)  # batch_size를 채우면 interval을 기다리지 않음
+        time.sleep(0.1)
+        q.record(2, {'정답횟수': 1})  # 백오프(1초) 중에는 batch_size를 채워도 바로 재시도하지 않음
+        time.sleep(0.5)
+        assert writer.batches == [None]
+        deadline = time.monotonic() + 3.0
+        while len(writer.batches) < 2 and time.monotonic() < deadline: time.sleep(0.05)
+        assert writer.batches[1] == {1: {'정답횟수': 1}, 2: {'정답횟수': 1}}
+    finally:
+        q.close()
+
+
+def test_journal_is_replayed_after_restart(tmp_path):
+    path = str(tmp_path / "j.jsonl")
+    q = WriteBehindQueue(FakeWriter(), path, start=False)
+    q.record(5, {'정답횟수': 1}); q.record("card-b", {'쉬움횟수': 1}); q.record(5, {'오답횟수': 1})
+    with open(path, "a", encoding="utf-8") as f: f.write('[6, {"정답')  # 기록 도중 끊긴 마지막 줄
+    writer = FakeWriter()
+    restarted = WriteBehindQueue(writer, path, start=False)
+    assert restarted.pending_count == 2
+    assert restarted.flush()
+    assert writer.batches == [{5: {'정답횟수': 1, '오답횟수': 1}, "card-b": {'쉬움횟수': 1}}]
+
+
+def test_sheet_writer_adds_deltas_by_card_id(tmp_path):
+    sheet = pd.DataFrame({'질문': ['q0', None, 'q1', 'q2'], '정답': ['a0', None, 'a1', 'a2'],
+                          '정답횟수': [0, None, 1, 2], '오답횟수': [0, None, 0, 0], '이미지': ['x', None, 'y', 'z']})
+    conn = FakeConn(sheet)
+    ids = card_ids(sheet.dropna(subset=['질문']))
+    q = WriteBehindQueue(SheetWriter(conn, "url", worksheet="탭", by_header=True), str(tmp_path / "j.jsonl"), start=False)
+    q.record(ids[1], {'정답횟수': 2}); q.record(ids[2], {'오답횟수': 1}); q.record("deleted-card", {'정답횟수': 1})
+    # 기록 뒤 시트 맨 앞에 행이 끼어들어도 카드 ID로 맞는 행을 찾음
+    conn.df = pd.concat([pd.DataFrame({'질문': ['new'], '정답': ['n'], '정답횟수': [0], '오답횟수': [0], '이미지': ['w']}), conn.df], ignore_index=True)
+    assert q.flush() and conn.updates == 1
+    out = conn.df.set_index('질문')
+    assert out.at['q1', '정답횟수'] == 3 and out.at['q2', '오답횟수'] == 1 and out.at['new', '정답횟수'] == 0
+    assert out.at['q2', '이미지'] == 'z'  # 카운터가 아닌 열은 그대로
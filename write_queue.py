@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+from card_identity import card_ids
+from perf_trace import count, span
+
+DECK_COLUMNS = ['질문', '정답', '정답횟수', '오답횟수', '어려움횟수', '정상횟수', '쉬움횟수']
+COUNTER_COLUMNS = ['정답횟수', '오답횟수', '어려움횟수', '정상횟수', '쉬움횟수']
+
+
+def _resolve_rows(deck, deltas):
+    # 카드 ID(문자열) 키를 현재 시트의 행 번호로 변환 (오프라인 덱은 시트와 행 순서가 다를 수 있음)
+    # 시트에서 삭제된 카드의 증감분은 버림
+    if not any(isinstance(k, str) for k in deltas): return deltas
+    pos = {c: i for i, c in enumerate(card_ids(deck))}
+    out = {}
+    for key, changes in deltas.items():
+        row = pos.get(key, -1) if isinstance(key, str) else key
+        if row < 0: continue
+        cur = out.setdefault(row, {})
+        for col, d in changes.items(): cur[col] = cur.get(col, 0) + d
+    return out
+
+
+class SheetWriter:
+    # 시트를 새로 읽어 변경된 행에 증감분만 더한 뒤 한 번에 업로드 (다른 세션의 증가분 보존)
+    # by_header=True: 머리글 이름으로 열을 찾고 나머지 열(이미지 등)은 그대로 둠
+    # deltas의 키: 덱 행 번호 또는 카드 ID
+    def __init__(self, conn, spreadsheet, worksheet=0, by_header=False):
+        self.conn = conn
+        self.spreadsheet = spreadsheet
+        self.worksheet = worksheet
+        self.by_header = by_header
+
+    def __call__(self, deltas):
+        with span("sheet.read"): raw = self.conn.read(spreadsheet=self.spreadsheet, worksheet=self.worksheet, ttl=0)
+        if self.by_header: return self._update_by_header(raw, deltas)
+        df = raw.iloc[:, :len(DECK_COLUMNS)].copy()
+        df.columns = DECK_COLUMNS
+        df = df.dropna(subset=['질문']).reset_index(drop=True)
+        for col in COUNTER_COLUMNS:
+            df[col] = pd.to_numeric(df[col]).fillna(0).astype(int)
+        for row, changes in _resolve_rows(df, deltas).items():
+            if row >= len(df): continue
+            for col, d in changes.items(): df.at[row, col] += d
+        with span("sheet.update"): self.conn.update(spreadsheet=self.spreadsheet, worksheet=self.worksheet, data=df)
+
+    def _update_by_header(self, raw, deltas):
+        raw = raw.rename(columns=lambda c: str(c).strip())
+        rows = raw.index[raw['질문'].notna()]  # 덱의 행 번호 -> 시트 원본 행
+        for row, changes in _resolve_rows(raw.loc[rows], deltas).items():
+            if row >= len(rows): continue
+            for col, d in changes.items():
+                if col not in raw.columns: continue
+                cur = pd.to_numeric(raw.at[rows[row], col], errors='coerce')
+                raw.at[rows[row], col] = (0 if pd.isna(cur) else int(cur)) + d
+        with span("sheet.update"): self.conn.update(spreadsheet=self.spreadsheet, worksheet=self.worksheet, data=raw)
+
+
+class WriteBehindQueue:
+    # 응답별 카운터 증감분을 모아 백그라운드 스레드에서 일괄 반영
+    # - batch_size개 응답이 쌓이거나 interval초가 지나면 flush
+    # - 실패 시 지수 백오프로 재시도, 대기 중인 증감분은 journal 파일에 기록되어 재시작 후에도 복구
+    # - on_flush(batch): 반영에 성공한 증감분을 받음 (덱 캐시 갱신용)
+    def __init__(self, writer, journal_path, batch_size=10, interval=5.0, max_backoff=60.0, start=True, on_flush=None):
+        self.writer = writer
+        self.on_flush = on_flush
+        self.journal_path = journal_path
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.last_error = None
+        self._pending = {}
+        self._since_flush = 0
+        self._backoff = 0.0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        self._replay_journal()
+        self._thread = None
+        if start:
+            self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+            self._thread.start()
+
+    @property
+    def pending_count(self):
+        with self._lock: return len(self._pending)
+
+    # --- journal ---
+    def _replay_journal(self):
+        if not os.path.exists(self.journal_path): return
+        with open(self.journal_path, encoding='utf-8') as f:
+            for line in f:
+                try: row, changes = json.loads(line)
+                except ValueError: continue  # 중단된 마지막 줄 무시
+                self._merge(self._pending, row, changes)
+        self._since_flush = len(self._pending)
+
+    def _append_journal(self, row, changes):
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps([row, changes], ensure_ascii=False) + "\n")
+
+    def _rewrite_journal(self):
+        # flush 성공 후: 그 사이 새로 쌓인 증감분만 남기도록 journal 압축
+        tmp = self.journal_path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for row, changes in self._pending.items():
+                f.write(json.dumps([row, changes], ensure_ascii=False) + "\n")
+        os.replace(tmp, self.journal_path)
+
+    @staticmethod
+    def _merge(target, row, changes):
+        cur = target.setdefault(row, {})
+        for col, d in changes.items(): cur[col] = cur.get(col, 0) + d
+
+    # --- 기록 / 반영 ---
+    def record(self, row, changes):
+        # row: 덱 행 번호 또는 카드 ID (오프라인 모드)
+        changes = {col: int(d) for col, d in changes.items() if d}
+        if not changes: return
+        row = row if isinstance(row, str) else int(row)
+        with self._lock:
+            self._merge(self._pending, row, changes)
+            self._append_journal(row, changes)
+            self._since_flush += 1
+            if self._since_flush >= self.batch_size: self._wake.notify()
+
+    def flush(self):
+        # 반환값: 반영 성공 여부 (대기 중인 변경이 없으면 True)
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._since_flush = 0
+            if not batch: return True
+            count("write_queue.flush")
+            try:
+                self.writer(batch)
+            except Exception as e:
+                with self._lock:
+                    for row, changes in batch.items(): self._merge(self._pending, row, changes)
+                    self._since_flush += len(batch)
+                self.last_error = e
+                count("write_queue.flush_error")
+                return False
+            with self._lock:
+                self._rewrite_journal()
+            self.last_error = None
+            if self.on_flush is not None:
+                try: self.on_flush(batch)
+                except Exception: pass  # 캐시 갱신은 best-effort (다음 동기화에서 시트 기준으로 맞춰짐)
+            return True
+
+    def _run(self):
+        while True:
+            with self._lock:
+                # 백오프 중에는 batch_size를 채워도 대기 시간을 지킴
+                deadline = time.monotonic() + (self._backoff or self.interval)
+                while not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0: break
+                    if not self._backoff and self._since_flush >= self.batch_size: break
+                    self._wake.wait(remaining)
+                if self._closed: return
+            if self.flush(): self._backoff = 0.0
+            else: self._backoff = min(self.max_backoff, max(1.0, self._backoff * 2))
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+        if self._thread is not None: self._thread.join()
+        return self.flush()